@@ -17,31 +17,56 @@
 
 import asyncio
 import logging
+import time
 
 from ..compat import map
+from ..connection import ChunkedBody
 from ..exceptions import TransportError
 from ..helpers.actions import (
+    _FLUSH,
+    _LEAN_FILTER_PATH,
+    _STREAM_BUFFER_SIZE,
     _ActionChunker,
+    _bulk_chunk_body,
+    _check_shards,
+    _needs_source,
     _process_bulk_chunk_error,
     _process_bulk_chunk_success,
+    _RetryScheduler,
+    _Serialized,
+    _split_actions,
+    _StreamedChunk,
     expand_action,
 )
-from ..helpers.errors import ScanError
+from ..helpers.adaptive import AdaptiveChunkSize, _is_rejection
+from ..helpers.errors import BulkIndexError
+from ..helpers.frames import _require_pandas, hits_to_dataframe
 from .client import AsyncElasticsearch  # noqa
+from .compat import get_running_loop
 
 logger = logging.getLogger("elasticsearch.helpers")
 
 
-async def _chunk_actions(actions, chunk_size, max_chunk_bytes, serializer):
+async def _chunk_actions(
+    actions, chunk_size, max_chunk_bytes, serializer, keep_source=True
+):
     """
-    Split actions into chunks by number or size, serialize them into strings in
-    the process.
+    Split actions into chunks by number or size, serialize them into a single
+    ``bytes`` body per chunk in the process.
     """
     chunker = _ActionChunker(
-        chunk_size=chunk_size, max_chunk_bytes=max_chunk_bytes, serializer=serializer
+        chunk_size=chunk_size,
+        max_chunk_bytes=max_chunk_bytes,
+        serializer=serializer,
+        keep_source=keep_source,
     )
-    async for action, data in actions:
-        ret = chunker.feed(action, data)
+    async for action in actions:
+        if action is _FLUSH:
+            ret = chunker.flush()
+        elif isinstance(action, _Serialized):
+            ret = chunker.feed_serialized(*action)
+        else:
+            ret = chunker.feed(*action)
         if ret:
             yield ret
     ret = chunker.flush()
@@ -49,6 +74,66 @@ async def _chunk_actions(actions, chunk_size, max_chunk_bytes, serializer):
         yield ret
 
 
+class _AsyncStreamedChunk(_StreamedChunk):
+    """``_StreamedChunk`` pulling actions from an async iterator."""
+
+    async def _next_action(self):
+        if self.pending is not None:
+            action, self.pending = self.pending, None
+            return action
+        try:
+            return await self.actions.__anext__()
+        except StopAsyncIteration:
+            return None
+
+    def __iter__(self):
+        raise TypeError("Streamed chunks of async helpers are async iterables")
+
+    async def __aiter__(self):
+        buffer = bytearray()
+        for line in self._replay():
+            buffer += line
+            if len(buffer) >= _STREAM_BUFFER_SIZE:
+                yield bytes(buffer)
+                buffer = bytearray()
+
+        while not self._full():
+            action = await self._next_action()
+            if action is None or action is _FLUSH:
+                break
+            line = self._accept(*action)
+            if line is None:
+                break
+            buffer += line
+            if len(buffer) >= _STREAM_BUFFER_SIZE:
+                yield bytes(buffer)
+                buffer = bytearray()
+
+        if buffer:
+            yield bytes(buffer)
+
+
+async def _stream_chunks(actions, chunk_size, max_chunk_bytes, serializer):
+    """
+    Split actions into chunks by number or size like ``_chunk_actions`` but
+    yield ``_AsyncStreamedChunk`` instances serializing the actions as they're
+    being sent. A chunk has to be sent before the next one is started.
+    """
+    actions = aiter(actions)
+    pending = None
+    while True:
+        while pending is None or pending is _FLUSH:
+            try:
+                pending = await actions.__anext__()
+            except StopAsyncIteration:
+                return
+        chunk = _AsyncStreamedChunk(
+            actions, pending, chunk_size, max_chunk_bytes, serializer
+        )
+        yield chunk
+        pending = chunk.pending
+
+
 async def _process_bulk_chunk(
     client,
     bulk_actions,
@@ -60,14 +145,18 @@ async def _process_bulk_chunk(
     **kwargs
 ):
     """
-    Send a bulk request to elasticsearch and process the output.
+    Send a bulk request to elasticsearch and process the output. Successful
+    items may be left out when ``yield_ok=False`` is passed in ``kwargs``,
+    failed ones include their action and document with ``with_data=True``.
     """
+    yield_ok = kwargs.pop("yield_ok", True)
+    with_data = kwargs.pop("with_data", False)
     if not isinstance(ignore_status, (list, tuple)):
         ignore_status = (ignore_status,)
 
     try:
         # send the actual request
-        resp = await client.bulk("\n".join(bulk_actions) + "\n", *args, **kwargs)
+        resp = await client.bulk(_bulk_chunk_body(bulk_actions), *args, **kwargs)
     except TransportError as e:
         gen = _process_bulk_chunk_error(
             error=e,
@@ -82,11 +171,119 @@ async def _process_bulk_chunk(
             bulk_data=bulk_data,
             ignore_status=ignore_status,
             raise_on_error=raise_on_error,
+            yield_ok=yield_ok,
+            with_data=with_data,
         )
     for item in gen:
         yield item
 
 
+async def _track_chunk_size(chunk_size, results):
+    """Async version of ``AdaptiveChunkSize.track()``."""
+    start = time.time()
+    latency = None
+    rejected = False
+    try:
+        async for ok, item in results:
+            if latency is None:
+                latency = time.time() - start
+            if not ok and _is_rejection(item):
+                rejected = True
+            yield ok, item
+    except TransportError as e:
+        rejected = e.status_code == 429
+        raise
+    except BulkIndexError as e:
+        rejected = rejected or any(map(_is_rejection, e.errors))
+        raise
+    finally:
+        if latency is None:
+            latency = time.time() - start
+        chunk_size.record(latency, rejected)
+
+
+async def _coalesce(coalescer, actions):
+    """Async version of ``ActionCoalescer.coalesce()``."""
+    async for action in actions:
+        for ready in coalescer._feed(action):
+            yield ready
+    for ready in coalescer._drain():
+        yield ready
+
+
+async def _merge_retries(retries, actions, wakeup=None):
+    """
+    Async version of ``_RetryScheduler.merge()``. With several chunks in
+    flight ``wakeup`` has to be set every time one of them was processed,
+    without it nothing is in flight anymore once ``actions`` is exhausted.
+    """
+    async for action in actions:
+        for retry in retries._due():
+            yield retry
+        retries._hand_out(0)
+        yield action
+
+    while True:
+        yield _FLUSH
+        while True:
+            delay = retries._next_delay()
+            if delay == 0:
+                break
+            if retries._closed or (delay is None and not retries._in_flight):
+                return
+            if wakeup is None:
+                await asyncio.sleep(delay)
+                continue
+            wakeup.clear()
+            try:
+                await asyncio.wait_for(wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+        for retry in retries._due():
+            yield retry
+
+
+async def _retry_rejected(retries, results, bulk_data, bulk_actions, error=None):
+    """Async version of ``helpers.actions._retry_rejected()``."""
+    attempts = lines = None
+    try:
+        if error is not None:
+            raise error
+
+        # bulk_data of a streamed chunk is only filled in once the request is
+        # sent, it has to come second
+        i = -1
+        async for (ok, info), data in azip(results, bulk_data):
+            i += 1
+            if attempts is None:
+                attempts = retries.taken(bulk_data)
+
+            if not ok:
+                action, info = info.popitem()
+                if info["status"] == 429:
+                    if lines is None:
+                        lines = _split_actions(bulk_data, bulk_actions)
+                    if retries.schedule(data, attempts[i], lines[i]):
+                        continue
+                info = {action: info}
+            yield ok, info
+
+    except TransportError as e:
+        if attempts is None:
+            attempts = retries.taken(bulk_data)
+        # retry the whole chunk when the request itself was rejected
+        if e.status_code != 429 or max(attempts) >= retries.max_retries:
+            raise
+        lines = _split_actions(bulk_data, bulk_actions)
+        for data, attempt, line in zip(bulk_data, attempts, lines):
+            retries.schedule(data, attempt, line)
+
+    finally:
+        if attempts is None:
+            attempts = retries.taken(bulk_data)
+        retries.done(len(attempts))
+
+
 def aiter(x):
     """Turns an async iterable or iterable into an async iterator"""
     if hasattr(x, "__anext__"):
@@ -126,6 +323,10 @@ async def async_streaming_bulk(
     max_backoff=600,
     yield_ok=True,
     ignore_status=(),
+    stream_body=False,
+    lean=False,
+    coalesce=None,
+    error_sink=None,
     *args,
     **kwargs
 ):
@@ -138,14 +339,19 @@ async def async_streaming_bulk(
     entire input is consumed and sent.
 
     If you specify ``max_retries`` it will also retry any documents that were
-    rejected with a ``429`` status code. To do this it will wait (**by calling
-    asyncio.sleep**) for ``initial_backoff`` seconds and then,
-    every subsequent rejection for the same chunk, for double the time every
-    time up to ``max_backoff`` seconds.
+    rejected with a ``429`` status code. Rejected documents are put aside for
+    ``initial_backoff`` seconds and then, every subsequent rejection for the
+    same document, for double the time every time up to ``max_backoff``
+    seconds, while the following chunks keep being sent. Once their backoff
+    has expired they're sent again as part of the next chunk. Only when there
+    are no other documents left to send it will wait (**by calling
+    asyncio.sleep**) for the retries.
 
     :arg client: instance of :class:`~elasticsearch.AsyncElasticsearch` to use
     :arg actions: iterable or async iterable containing the actions to be executed
-    :arg chunk_size: number of docs in one chunk sent to es (default: 500)
+    :arg chunk_size: number of docs in one chunk sent to es (default: 500), or
+        an :class:`~elasticsearch.helpers.AdaptiveChunkSize` adjusting it to
+        the load of the cluster
     :arg max_chunk_bytes: the maximum size of the request in bytes (default: 100MB)
     :arg raise_on_error: raise ``BulkIndexError`` containing errors (as `.errors`)
         from the execution of the last chunk when some occur. By default we raise.
@@ -162,67 +368,77 @@ async def async_streaming_bulk(
     :arg max_backoff: maximum number of seconds a retry will wait
     :arg yield_ok: if set to False will skip successful documents in the output
     :arg ignore_status: list of HTTP status code that you want to ignore
+    :arg stream_body: serialize the actions of a chunk while it's being sent
+        with chunked transfer encoding instead of up front, so that memory
+        use doesn't grow with ``max_chunk_bytes``
+    :arg lean: only have elasticsearch return the ``status``, ``_id`` and
+        ``error`` of the items, together with ``yield_ok=False`` the items of
+        the responses without errors aren't even looked at
+    :arg coalesce: an :class:`~elasticsearch.helpers.ActionCoalescer`
+        collapsing the repeated actions on the same document before they're
+        sent
+    :arg error_sink: callable every failed item which isn't raised is passed
+        to, including the metadata of its action and the original document
+        as ``data``, for example an :class:`~elasticsearch.helpers.ErrorSample`
+        or a :class:`~elasticsearch.helpers.DeadLetterFile`
     """
+    if lean:
+        kwargs.setdefault("filter_path", _LEAN_FILTER_PATH)
 
     async def map_actions():
         async for item in aiter(actions):
             yield expand_action_callback(item)
 
-    async for bulk_data, bulk_actions in _chunk_actions(
-        map_actions(), chunk_size, max_chunk_bytes, client.transport.serializer
-    ):
-
-        for attempt in range(max_retries + 1):
-            to_retry, to_retry_data = [], []
-            if attempt:
-                await asyncio.sleep(
-                    min(max_backoff, initial_backoff * 2 ** (attempt - 1))
-                )
+    expanded = map_actions()
+    if coalesce is not None:
+        expanded = _coalesce(coalesce, expanded)
+    retries = None
+    if max_retries:
+        retries = _RetryScheduler(max_retries, initial_backoff, max_backoff)
+        expanded = _merge_retries(retries, expanded)
+
+    async def streamed_chunks():
+        async for chunk in _stream_chunks(
+            expanded, chunk_size, max_chunk_bytes, client.transport.serializer
+        ):
+            yield chunk.bulk_data, ChunkedBody(chunk)
+
+    if stream_body:
+        chunks = streamed_chunks()
+    else:
+        chunks = _chunk_actions(
+            expanded,
+            chunk_size,
+            max_chunk_bytes,
+            client.transport.serializer,
+            keep_source=error_sink is not None
+            or _needs_source(raise_on_error, raise_on_exception, ignore_status),
+        )
 
-            try:
-                async for data, (ok, info) in azip(
-                    bulk_data,
-                    _process_bulk_chunk(
-                        client,
-                        bulk_actions,
-                        bulk_data,
-                        raise_on_exception,
-                        raise_on_error,
-                        ignore_status,
-                        *args,
-                        **kwargs
-                    ),
-                ):
-
-                    if not ok:
-                        action, info = info.popitem()
-                        # retry if retries enabled, we get 429, and we are not
-                        # in the last attempt
-                        if (
-                            max_retries
-                            and info["status"] == 429
-                            and (attempt + 1) <= max_retries
-                        ):
-                            # _process_bulk_chunk expects strings so we need to
-                            # re-serialize the data
-                            to_retry.extend(
-                                map(client.transport.serializer.dumps, data)
-                            )
-                            to_retry_data.append(data)
-                        else:
-                            yield ok, {action: info}
-                    elif yield_ok:
-                        yield ok, info
+    async for bulk_data, bulk_actions in chunks:
+        results = _process_bulk_chunk(
+            client,
+            bulk_actions,
+            bulk_data,
+            raise_on_exception,
+            raise_on_error,
+            ignore_status,
+            yield_ok=yield_ok,
+            with_data=error_sink is not None,
+            *args,
+            **kwargs
+        )
+        if isinstance(chunk_size, AdaptiveChunkSize):
+            results = _track_chunk_size(chunk_size, results)
+        if retries is not None:
+            results = _retry_rejected(retries, results, bulk_data, bulk_actions)
 
-            except TransportError as e:
-                # suppress 429 errors since we will retry them
-                if attempt == max_retries or e.status_code != 429:
-                    raise
-            else:
-                if not to_retry:
-                    break
-                # retry only subset of documents that didn't succeed
-                bulk_actions, bulk_data = to_retry, to_retry_data
+        async for ok, info in results:
+            if not ok and error_sink is not None:
+                error_sink(info)
+            if ok and not yield_ok:
+                continue
+            yield ok, info
 
 
 async def async_bulk(
@@ -241,7 +457,10 @@ async def async_bulk(
     When errors are being collected original document data is included in the
     error dictionary which can lead to an extra high memory usage. If you need
     to process a lot of data and want to ignore/collect errors please consider
-    using the :func:`~elasticsearch.helpers.async_streaming_bulk` helper which will
+    passing an ``error_sink`` (see
+    :func:`~elasticsearch.helpers.async_streaming_bulk`) the errors are handed
+    to instead, the number of errors is returned then, or using the
+    :func:`~elasticsearch.helpers.async_streaming_bulk` helper which will
     just return the errors and not store them in memory.
 
 
@@ -258,23 +477,210 @@ async def async_bulk(
     """
     success, failed = 0, 0
 
-    # list of errors to be collected is not stats_only
+    # list of errors to be collected is not stats_only nor handed to a sink
     errors = []
+    collect = not stats_only and kwargs.get("error_sink") is None
+
+    # successful results of a lean bulk aren't yielded, they are all the
+    # actions not reported as failed
+    lean = kwargs.get("lean", False)
+    total = 0
+
+    async def count(actions):
+        nonlocal total
+        async for action in aiter(actions):
+            total += 1
+            yield action
+
+    if lean:
+        actions = count(actions)
 
     # make streaming_bulk yield successful results so we can count them
-    kwargs["yield_ok"] = True
+    kwargs["yield_ok"] = not lean
     async for ok, item in async_streaming_bulk(
         client, actions, ignore_status=ignore_status, *args, **kwargs
     ):
         # go through request-response pairs and detect failures
         if not ok:
-            if not stats_only:
+            if collect:
                 errors.append(item)
             failed += 1
         else:
             success += 1
 
-    return success, failed if stats_only else errors
+    if lean:
+        success = total - failed
+    return success, errors if collect else failed
+
+
+async def async_parallel_bulk(
+    client,
+    actions,
+    concurrency=4,
+    chunk_size=500,
+    max_chunk_bytes=100 * 1024 * 1024,
+    queue_size=4,
+    raise_on_error=True,
+    expand_action_callback=expand_action,
+    raise_on_exception=True,
+    max_retries=0,
+    initial_backoff=2,
+    max_backoff=600,
+    yield_ok=True,
+    ignore_status=(),
+    lean=False,
+    coalesce=None,
+    *args,
+    **kwargs
+):
+    """
+    Concurrent version of :func:`~elasticsearch.helpers.async_streaming_bulk`
+    keeping up to ``concurrency`` bulk requests in flight at once on the same
+    event loop. Results are yielded in the order of the chunks, like with
+    :func:`~elasticsearch.helpers.parallel_bulk` the results of a chunk are
+    only yielded once all of them were received.
+
+    Every request in flight needs a connection of its own, ``concurrency``
+    shouldn't be larger than the ``maxsize`` of the connections.
+
+    :arg client: instance of :class:`~elasticsearch.AsyncElasticsearch` to use
+    :arg actions: iterable or async iterable containing the actions to be executed
+    :arg concurrency: number of bulk requests to keep in flight
+    :arg chunk_size: number of docs in one chunk sent to es (default: 500), or
+        an :class:`~elasticsearch.helpers.AdaptiveChunkSize` adjusting it to
+        the load of the cluster
+    :arg max_chunk_bytes: the maximum size of the request in bytes (default: 100MB)
+    :arg queue_size: number of chunks waiting to be sent or to have their
+        results consumed, a slow consumer holds back the requests when it's
+        reached
+    :arg raise_on_error: raise ``BulkIndexError`` containing errors (as `.errors`)
+        from the execution of the last chunk when some occur. By default we raise.
+    :arg expand_action_callback: callback executed on each action passed in,
+        should return a tuple containing the action line and the data line
+        (`None` if data line should be omitted).
+    :arg raise_on_exception: if ``False`` then don't propagate exceptions from
+        call to ``bulk`` and just report the items that failed as failed.
+    :arg max_retries: maximum number of times a document will be retried when
+        ``429`` is received, set to 0 (default) for no retries on ``429``
+    :arg initial_backoff: number of seconds we should wait before the first
+        retry. Any subsequent retries will be powers of ``initial_backoff *
+        2**retry_number``
+    :arg max_backoff: maximum number of seconds a retry will wait
+    :arg yield_ok: if set to False will skip successful documents in the output
+    :arg ignore_status: list of HTTP status code that you want to ignore
+    :arg lean: only have elasticsearch return the ``status``, ``_id`` and
+        ``error`` of the items, together with ``yield_ok=False`` the items of
+        the responses without errors aren't even looked at
+    :arg coalesce: an :class:`~elasticsearch.helpers.ActionCoalescer`
+        collapsing the repeated actions on the same document before they're
+        sent
+    """
+    if lean:
+        kwargs.setdefault("filter_path", _LEAN_FILTER_PATH)
+
+    async def map_actions():
+        async for item in aiter(actions):
+            yield expand_action_callback(item)
+
+    expanded = map_actions()
+    if coalesce is not None:
+        expanded = _coalesce(coalesce, expanded)
+    # set every time a chunk was processed, retries may have been scheduled
+    processed = asyncio.Event()
+    retries = None
+    if max_retries:
+        retries = _RetryScheduler(max_retries, initial_backoff, max_backoff)
+        expanded = _merge_retries(retries, expanded, processed)
+
+    # chunks to send, and the futures of their results in the order of the chunks
+    to_send = asyncio.Queue(queue_size)
+    sent = asyncio.Queue(queue_size)
+
+    async def produce():
+        try:
+            async for bulk_data, bulk_actions in _chunk_actions(
+                expanded,
+                chunk_size,
+                max_chunk_bytes,
+                client.transport.serializer,
+                keep_source=_needs_source(
+                    raise_on_error, raise_on_exception, ignore_status
+                ),
+            ):
+                future = get_running_loop().create_future()
+                await sent.put((bulk_data, bulk_actions, future))
+                await to_send.put((bulk_data, bulk_actions, future))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            future = get_running_loop().create_future()
+            future.set_exception(e)
+            await sent.put((None, None, future))
+        else:
+            await sent.put(None)
+
+    # the senders don't stop by themselves, they're cancelled once all the
+    # results were consumed or the consumer went away
+    async def send():
+        while True:
+            bulk_data, bulk_actions, future = await to_send.get()
+            results = _process_bulk_chunk(
+                client,
+                bulk_actions,
+                bulk_data,
+                raise_on_exception,
+                raise_on_error,
+                ignore_status,
+                yield_ok=yield_ok,
+                *args,
+                **kwargs
+            )
+            if isinstance(chunk_size, AdaptiveChunkSize):
+                results = _track_chunk_size(chunk_size, results)
+            try:
+                future.set_result(([item async for item in results], None))
+            except TransportError as e:
+                # a rejected request is retried when its results are consumed
+                if retries is not None and e.status_code == 429:
+                    future.set_result(([], e))
+                else:
+                    future.set_exception(e)
+            except Exception as e:
+                future.set_exception(e)
+
+    tasks = [asyncio.ensure_future(produce())]
+    tasks.extend(asyncio.ensure_future(send()) for _ in range(concurrency))
+    try:
+        while True:
+            chunk = await sent.get()
+            if chunk is None:
+                break
+            bulk_data, bulk_actions, future = chunk
+            results, error = await future
+            if retries is not None:
+                results = _retry_rejected(
+                    retries, results, bulk_data, bulk_actions, error
+                )
+            async for ok, info in aiter(results):
+                if ok and not yield_ok:
+                    continue
+                yield ok, info
+            processed.set()
+
+    finally:
+        if retries is not None:
+            retries.close()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        # chunks whose results won't be consumed anymore
+        while not sent.empty():
+            chunk = sent.get_nowait()
+            if chunk is None:
+                continue
+            future = chunk[2]
+            if not future.cancel() and not future.cancelled():
+                future.exception()
 
 
 async def async_scan(
@@ -287,6 +693,11 @@ async def async_scan(
     request_timeout=None,
     clear_scroll=True,
     scroll_kwargs=None,
+    as_frames=False,
+    frame_columns=None,
+    frame_mapping=None,
+    hit_class=None,
+    prefetch=0,
     **kwargs
 ):
     """
@@ -317,6 +728,19 @@ async def async_scan(
         to true.
     :arg scroll_kwargs: additional kwargs to be passed to
         :meth:`~elasticsearch.AsyncElasticsearch.scroll`
+    :arg as_frames: instead of individual hits yield one
+        :class:`pandas.DataFrame` per scroll page, built by
+        :func:`~elasticsearch.helpers.hits_to_dataframe`
+    :arg frame_columns: columns to extract when ``as_frames`` is set, see
+        :func:`~elasticsearch.helpers.hits_to_columns`
+    :arg frame_mapping: mapping used to type the columns when ``as_frames``
+        is set
+    :arg hit_class: optional callable wrapping every hit before it's
+        yielded, use :class:`~elasticsearch.helpers.CompactHit` to keep large
+        result sets in memory
+    :arg prefetch: number of pages fetched ahead from a background task
+        while the hits of the current page are being consumed, set to 0
+        (default) to only fetch a page once the previous one was consumed
 
     Any additional keyword arguments will be passed to the initial
     :meth:`~elasticsearch.AsyncElasticsearch.search` call::
@@ -330,10 +754,54 @@ async def async_scan(
     """
     scroll_kwargs = scroll_kwargs or {}
 
+    if as_frames:
+        _require_pandas()
+
     if not preserve_order:
         query = query.copy() if query else {}
         query["sort"] = "_doc"
 
+    pages = _scroll_pages(
+        client,
+        query,
+        scroll,
+        raise_on_error,
+        size,
+        request_timeout,
+        clear_scroll,
+        scroll_kwargs,
+        **kwargs
+    )
+    if prefetch:
+        # the pages are scrolled from a task of its own, like one slice of
+        # async_parallel_scan
+        pages = _pages_in_tasks([pages], prefetch)
+    try:
+        async for hits in pages:
+            if as_frames:
+                yield hits_to_dataframe(
+                    hits, columns=frame_columns, mapping=frame_mapping
+                )
+            else:
+                for hit in hits:
+                    yield hit if hit_class is None else hit_class(hit)
+    finally:
+        # clear the scroll right away when the iteration is abandoned
+        await pages.aclose()
+
+
+async def _scroll_pages(
+    client,
+    query,
+    scroll,
+    raise_on_error,
+    size,
+    request_timeout,
+    clear_scroll,
+    scroll_kwargs,
+    **kwargs
+):
+    """Async version of ``_scroll_pages()`` of the scan helper."""
     # initial search
     resp = await client.search(
         body=query, scroll=scroll, size=size, request_timeout=request_timeout, **kwargs
@@ -342,33 +810,9 @@ async def async_scan(
 
     try:
         while scroll_id and resp["hits"]["hits"]:
-            for hit in resp["hits"]["hits"]:
-                yield hit
-
-            # Default to 0 if the value isn't included in the response
-            shards_successful = resp["_shards"].get("successful", 0)
-            shards_skipped = resp["_shards"].get("skipped", 0)
-            shards_total = resp["_shards"].get("total", 0)
-
-            # check if we have any errors
-            if (shards_successful + shards_skipped) < shards_total:
-                shards_message = "Scroll request has only succeeded on %d (+%d skipped) shards out of %d."
-                logger.warning(
-                    shards_message,
-                    shards_successful,
-                    shards_skipped,
-                    shards_total,
-                )
-                if raise_on_error:
-                    raise ScanError(
-                        scroll_id,
-                        shards_message
-                        % (
-                            shards_successful,
-                            shards_skipped,
-                            shards_total,
-                        ),
-                    )
+            yield resp["hits"]["hits"]
+
+            _check_shards(resp, scroll_id, raise_on_error)
             resp = await client.scroll(
                 body={"scroll_id": scroll_id, "scroll": scroll}, **scroll_kwargs
             )
@@ -376,11 +820,139 @@ async def async_scan(
 
     finally:
         if scroll_id and clear_scroll:
-            await client.clear_scroll(
-                body={"scroll_id": [scroll_id]},
-                ignore=(404,),
-                params={"__elastic_client_meta": (("h", "s"),)},
+            # the scroll is still cleared when the task gets cancelled
+            await asyncio.shield(
+                client.clear_scroll(
+                    body={"scroll_id": [scroll_id]},
+                    ignore=(404,),
+                    params={"__elastic_client_meta": (("h", "s"),)},
+                )
+            )
+
+
+async def _scroll_slice(pages, results):
+    """
+    Put the pages of hits of a slice into ``results`` followed by ``None``,
+    an exception is put as ``(None, error)`` and stops the slice.
+    """
+    try:
+        try:
+            async for hits in pages:
+                await results.put((hits, None))
+        finally:
+            await pages.aclose()
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        await results.put((None, e))
+    await results.put(None)
+
+
+async def async_parallel_scan(
+    client,
+    query=None,
+    slices=4,
+    queue_size=4,
+    scroll="5m",
+    raise_on_error=True,
+    size=1000,
+    request_timeout=None,
+    clear_scroll=True,
+    scroll_kwargs=None,
+    hit_class=None,
+    **kwargs
+):
+    """
+    Async version of :func:`~elasticsearch.helpers.parallel_scan`, every one
+    of the ``slices`` slices of the scroll is read by a task of its own. The
+    hits are yielded in no particular order, the slices wait for room in a
+    queue of ``queue_size`` pages while the consumer is busy. Once the
+    iteration is cancelled or abandoned (with ``aclose()``) the tasks are
+    cancelled and their scrolls cleared::
+
+        async for hit in async_parallel_scan(es, index="orders-*", slices=8):
+            await export(hit)
+
+    :arg client: instance of :class:`~elasticsearch.AsyncElasticsearch` to use
+    :arg query: body for the :meth:`~elasticsearch.AsyncElasticsearch.search` api
+    :arg slices: number of slices to split the scroll into (default: 4), a
+        multiple of the number of shards works best
+    :arg queue_size: number of pages of hits read ahead of the consumer
+        (default: 4)
+    :arg scroll: Specify how long a consistent view of the index should be
+        maintained for scrolled search
+    :arg raise_on_error: raises an exception (``ScanError``) if an error is
+        encountered (some shards fail to execute). By default we raise.
+    :arg size: size (per shard) of the batch send at each iteration.
+    :arg request_timeout: explicit timeout for each call to ``scan``
+    :arg clear_scroll: explicitly calls delete on the scroll id of every
+        slice via the clear scroll API on completion or error, defaults to
+        true.
+    :arg scroll_kwargs: additional kwargs to be passed to
+        :meth:`~elasticsearch.AsyncElasticsearch.scroll`
+    :arg hit_class: optional callable wrapping every hit before it's yielded
+
+    Any additional keyword arguments will be passed to the initial
+    :meth:`~elasticsearch.AsyncElasticsearch.search` call of every slice.
+    """
+    scroll_kwargs = scroll_kwargs or {}
+    query = query.copy() if query else {}
+    query["sort"] = "_doc"
+
+    scrolls = []
+    for slice_id in range(slices):
+        body = query
+        # a single slice is a plain scroll
+        if slices > 1:
+            body = dict(query, slice={"id": slice_id, "max": slices})
+        scrolls.append(
+            _scroll_pages(
+                client,
+                body,
+                scroll,
+                raise_on_error,
+                size,
+                request_timeout,
+                clear_scroll,
+                scroll_kwargs,
+                **kwargs
             )
+        )
+
+    pages = _pages_in_tasks(scrolls, queue_size)
+    try:
+        async for hits in pages:
+            for hit in hits:
+                yield hit if hit_class is None else hit_class(hit)
+    finally:
+        await pages.aclose()
+
+
+async def _pages_in_tasks(scrolls, queue_size):
+    """
+    Read the pages of hits of the ``scrolls`` from tasks of their own and
+    yield them as they come, at most ``queue_size`` pages are buffered.
+    """
+    results = asyncio.Queue(queue_size)
+    tasks = [asyncio.ensure_future(_scroll_slice(pages, results)) for pages in scrolls]
+
+    finished = 0
+    try:
+        while finished < len(tasks):
+            page = await results.get()
+            if page is None:
+                finished += 1
+                continue
+            hits, error = page
+            if error is not None:
+                raise error
+            yield hits
+
+    finally:
+        # cancelling a slice clears its scroll
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
 
 async def async_reindex(
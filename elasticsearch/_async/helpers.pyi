@@ -32,6 +32,8 @@ from typing import (
     Union,
 )
 
+from ..helpers.adaptive import AdaptiveChunkSize
+from ..helpers.coalesce import ActionCoalescer
 from ..serializer import Serializer
 from .client import AsyncElasticsearch
 
@@ -40,7 +42,11 @@ logger: logging.Logger
 T = TypeVar("T")
 
 def _chunk_actions(
-    actions: Any, chunk_size: int, max_chunk_bytes: int, serializer: Serializer
+    actions: Any,
+    chunk_size: int,
+    max_chunk_bytes: int,
+    serializer: Serializer,
+    keep_source: bool = ...,
 ) -> AsyncGenerator[Any, None]: ...
 def _process_bulk_chunk(
     client: AsyncElasticsearch,
@@ -59,7 +65,7 @@ def azip(
 def async_streaming_bulk(
     client: AsyncElasticsearch,
     actions: Union[Iterable[Any], AsyncIterable[Any]],
-    chunk_size: int = ...,
+    chunk_size: Union[int, AdaptiveChunkSize] = ...,
     max_chunk_bytes: int = ...,
     raise_on_error: bool = ...,
     expand_action_callback: Callable[[Any], Tuple[Dict[str, Any], Optional[Any]]] = ...,
@@ -69,6 +75,30 @@ def async_streaming_bulk(
     max_backoff: Union[float, int] = ...,
     yield_ok: bool = ...,
     ignore_status: Optional[Union[int, Collection[int]]] = ...,
+    stream_body: bool = ...,
+    lean: bool = ...,
+    coalesce: Optional[ActionCoalescer] = ...,
+    error_sink: Optional[Callable[[Dict[str, Any]], Any]] = ...,
+    *args: Any,
+    **kwargs: Any
+) -> AsyncGenerator[Tuple[bool, Any], None]: ...
+def async_parallel_bulk(
+    client: AsyncElasticsearch,
+    actions: Union[Iterable[Any], AsyncIterable[Any]],
+    concurrency: int = ...,
+    chunk_size: Union[int, AdaptiveChunkSize] = ...,
+    max_chunk_bytes: int = ...,
+    queue_size: int = ...,
+    raise_on_error: bool = ...,
+    expand_action_callback: Callable[[Any], Tuple[Dict[str, Any], Optional[Any]]] = ...,
+    raise_on_exception: bool = ...,
+    max_retries: int = ...,
+    initial_backoff: Union[float, int] = ...,
+    max_backoff: Union[float, int] = ...,
+    yield_ok: bool = ...,
+    ignore_status: Optional[Union[int, Collection[int]]] = ...,
+    lean: bool = ...,
+    coalesce: Optional[ActionCoalescer] = ...,
     *args: Any,
     **kwargs: Any
 ) -> AsyncGenerator[Tuple[bool, Any], None]: ...
@@ -90,8 +120,27 @@ def async_scan(
     request_timeout: Optional[Union[float, int]] = ...,
     clear_scroll: bool = ...,
     scroll_kwargs: Optional[Mapping[str, Any]] = ...,
+    as_frames: bool = ...,
+    frame_columns: Optional[Collection[str]] = ...,
+    frame_mapping: Optional[Mapping[str, Any]] = ...,
+    hit_class: Optional[Callable[[Any], Any]] = ...,
+    prefetch: int = ...,
     **kwargs: Any
 ) -> AsyncGenerator[int, None]: ...
+def async_parallel_scan(
+    client: AsyncElasticsearch,
+    query: Optional[Any] = ...,
+    slices: int = ...,
+    queue_size: int = ...,
+    scroll: str = ...,
+    raise_on_error: bool = ...,
+    size: int = ...,
+    request_timeout: Optional[Union[float, int]] = ...,
+    clear_scroll: bool = ...,
+    scroll_kwargs: Optional[Mapping[str, Any]] = ...,
+    hit_class: Optional[Callable[[Any], Any]] = ...,
+    **kwargs: Any
+) -> AsyncGenerator[Any, None]: ...
 async def async_reindex(
     client: AsyncElasticsearch,
     source_index: Union[str, Collection[str]],
@@ -18,12 +18,15 @@
 import asyncio
 import os
 import ssl
+import time
 import warnings
 
 import urllib3  # type: ignore
 
 from ..compat import urlencode
 from ..connection.base import Connection
+from ..connection.chunked import ChunkedBody
+from ..connection.compression import gzip_compress
 from ..exceptions import (
     ConnectionError,
     ConnectionTimeout,
@@ -50,6 +53,39 @@ except ImportError:
     pass
 
 
+async def _aiter_chunks(body, policy=None):
+    """Turn a ``ChunkedBody`` into the async iterable aiohttp streams with
+    chunked transfer encoding, gzip-compressing it if given a policy.
+    """
+    chunks = body._chunks()
+    if not hasattr(chunks, "__aiter__"):
+        chunks = _aiter(chunks)
+    if policy is None:
+        async for chunk in chunks:
+            yield chunk
+        return
+
+    compressor = policy.compressobj()
+    bytes_in = bytes_out = 0
+    duration = 0.0
+    async for chunk in chunks:
+        start = time.time()
+        data = compressor.compress(chunk)
+        duration += time.time() - start
+        bytes_in += len(chunk)
+        if data:
+            bytes_out += len(data)
+            yield data
+    data = compressor.flush()
+    policy.record(bytes_in, bytes_out + len(data), duration)
+    yield data
+
+
+async def _aiter(iterable):
+    for item in iterable:
+        yield item
+
+
 class AsyncConnection(Connection):
     """Base class for Async HTTP connection implementations"""
 
@@ -94,6 +130,7 @@ class AIOHttpConnection(AsyncConnection):
         api_key=None,
         opaque_id=None,
         loop=None,
+        offloader=None,
         **kwargs,
     ):
         """
@@ -124,13 +161,17 @@ class AIOHttpConnection(AsyncConnection):
             host. See https://urllib3.readthedocs.io/en/1.4/pools.html#api for more
             information.
         :arg headers: any custom http headers to be add to requests
-        :arg http_compress: Use gzip compression
+        :arg http_compress: Use gzip compression, either ``True`` or a
+            :class:`~elasticsearch.connection.CompressionPolicy`
         :arg cloud_id: The Cloud ID from ElasticCloud. Convenient way to connect to cloud instances.
             Other host connection params will be ignored.
         :arg api_key: optional API Key authentication as either base64 encoded string or a tuple.
         :arg opaque_id: Send this value in the 'X-Opaque-Id' HTTP header
             For tracing all requests made by this transport.
         :arg loop: asyncio Event Loop to use with aiohttp. This is set by default to the currently running loop.
+        :arg offloader: :class:`~elasticsearch._async.offload.Offloader` used
+            to compress large request bodies outside of the event loop, set by
+            :class:`~elasticsearch.AsyncTransport`
         """
 
         self.headers = {}
@@ -217,6 +258,7 @@ class AIOHttpConnection(AsyncConnection):
 
         self.headers.setdefault("connection", "keep-alive")
         self.loop = loop
+        self.offloader = offloader
         self.session = None
 
         # Parameters for creating an aiohttp.ClientSession later.
@@ -279,9 +321,7 @@ class AIOHttpConnection(AsyncConnection):
         if headers:
             req_headers.update(headers)
 
-        if self.http_compress and body:
-            body = self._gzip_compress(body)
-            req_headers["content-encoding"] = "gzip"
+        body = await self._compress_request_body_async(url_path, body, req_headers)
 
         start = self.loop.time()
         try:
@@ -344,6 +384,36 @@ class AIOHttpConnection(AsyncConnection):
 
         return response.status, response.headers, raw_data
 
+    async def _compress_request_body_async(self, url, body, headers):
+        """Like ``_compress_request_body()`` but large bodies are compressed
+        by the offloader's executor instead of on the event loop and chunked
+        bodies are returned as async iterables for aiohttp to stream.
+        """
+        if isinstance(body, ChunkedBody):
+            policy = self.compression_policy
+            if self.http_compress and policy.should_compress(url, body):
+                headers["content-encoding"] = "gzip"
+                return _aiter_chunks(body, policy)
+            return _aiter_chunks(body)
+
+        if (
+            self.offloader is None
+            or not body
+            or not self.offloader.should_offload(len(body))
+        ):
+            return self._compress_request_body(url, body, headers)
+
+        policy = self.compression_policy
+        if self.http_compress and policy.should_compress(url, body):
+            headers["content-encoding"] = "gzip"
+            start = time.time()
+            data = await self.offloader.run(
+                len(body), gzip_compress, body, policy.level
+            )
+            policy.record(len(body), len(data), time.time() - start)
+            return data
+        return body
+
     async def close(self):
         """
         Explicitly closes connection
@@ -18,7 +18,9 @@
 from typing import Any, Collection, Mapping, MutableMapping, Optional, Tuple, Union
 
 from ..connection import Connection
+from ..connection.compression import CompressionPolicy
 from ._extra_imports import aiohttp  # type: ignore
+from .offload import Offloader
 
 class AsyncConnection(Connection):
     async def perform_request(  # type: ignore
@@ -36,6 +38,7 @@ class AsyncConnection(Connection):
 class AIOHttpConnection(AsyncConnection):
     session: Optional[aiohttp.ClientSession]
     ssl_assert_fingerprint: Optional[str]
+    offloader: Optional[Offloader]
     def __init__(
         self,
         host: str = ...,
@@ -52,11 +55,12 @@ class AIOHttpConnection(AsyncConnection):
         maxsize: int = ...,
         headers: Optional[Mapping[str, str]] = ...,
         ssl_context: Optional[Any] = ...,
-        http_compress: Optional[bool] = ...,
+        http_compress: Optional[Union[bool, CompressionPolicy]] = ...,
         cloud_id: Optional[str] = ...,
         api_key: Optional[Any] = ...,
         opaque_id: Optional[str] = ...,
         meta_header: bool = ...,
         loop: Any = ...,
+        offloader: Optional[Offloader] = ...,
         **kwargs: Any,
     ) -> None: ...
@@ -0,0 +1,271 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import asyncio
+import logging
+import time
+
+from ..helpers.actions import expand_action
+from ..helpers.adaptive import AdaptiveChunkSize
+from ..helpers.indexer import _BaseBulkIndexer
+from .compat import get_running_loop
+from .helpers import _process_bulk_chunk, _track_chunk_size
+
+logger = logging.getLogger("elasticsearch.helpers")
+
+
+class AsyncBulkIndexer(_BaseBulkIndexer):
+    """
+    Asyncio version of :class:`~elasticsearch.helpers.BulkIndexer` for
+    actions coming one at a time from any number of tasks. Actions passed to
+    :meth:`add` are buffered into a chunk which is sent by one of
+    ``concurrency`` tasks once it reaches ``chunk_size`` actions or
+    ``flush_bytes`` bytes, or once its first action has been waiting for
+    ``flush_interval`` seconds::
+
+        async with AsyncBulkIndexer(es, concurrency=4) as indexer:
+            async for message in consumer:
+                await indexer.add({"_index": "logs", "_source": message})
+
+    :meth:`add` only suspends when ``queue_size`` chunks are already waiting
+    to be sent. It returns a future resolving to the ``(ok, item)`` result of
+    the action once its bulk request completed (including retries), the
+    ``on_success`` and ``on_error`` callbacks are called as well.
+
+    :arg client: instance of :class:`~elasticsearch.AsyncElasticsearch` to use
+    :arg chunk_size: number of actions in one bulk request (default: 500), or
+        an :class:`~elasticsearch.helpers.AdaptiveChunkSize`
+    :arg flush_bytes: the maximum size of a bulk request in bytes
+        (default: 5MB)
+    :arg flush_interval: number of seconds after which actions are sent even
+        if their chunk isn't full (default: 1)
+    :arg concurrency: number of bulk requests in flight at once (default: 2)
+    :arg queue_size: number of full chunks waiting to be sent before
+        :meth:`add` suspends (default: 4)
+    :arg expand_action_callback: callback executed on each action passed in,
+        should return a tuple containing the action line and the data line
+        (`None` if data line should be omitted).
+    :arg on_success: called with the response item of every successful action
+    :arg on_error: called with the response item of every failed action
+    :arg max_retries: maximum number of times a document will be retried when
+        ``429`` is received, set to 0 (default) for no retries on ``429``
+    :arg initial_backoff: number of seconds we should wait before the first
+        retry. Any subsequent retries will be powers of ``initial_backoff *
+        2**retry_number``
+    :arg max_backoff: maximum number of seconds a retry will wait
+    :arg ignore_status: list of HTTP status code that you want to ignore
+
+    Any additional keyword arguments will be passed to
+    :meth:`~elasticsearch.AsyncElasticsearch.bulk`.
+    """
+
+    def __init__(
+        self,
+        client,
+        chunk_size=500,
+        flush_bytes=5 * 1024 * 1024,
+        flush_interval=1.0,
+        concurrency=2,
+        queue_size=4,
+        expand_action_callback=expand_action,
+        on_success=None,
+        on_error=None,
+        max_retries=0,
+        initial_backoff=2,
+        max_backoff=600,
+        ignore_status=(),
+        **kwargs
+    ):
+        super().__init__(
+            client,
+            chunk_size,
+            flush_bytes,
+            flush_interval,
+            expand_action_callback,
+            on_success,
+            on_error,
+            max_retries,
+            initial_backoff,
+            max_backoff,
+            ignore_status,
+            kwargs,
+        )
+        self.concurrency = concurrency
+        self.queue_size = queue_size
+
+        # the queue, lock and tasks need a running event loop, they are
+        # created by the first call to add()
+        self._queue = None
+        self._retry_lock = None
+        self._tasks = []
+        # sequence numbers of the chunks queued and not processed yet, for
+        # flush() to only wait for the chunks queued before it was called
+        self._submitted = 0
+        self._unfinished = set()
+        self._finished = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *_):
+        await self.aclose()
+
+    async def _async_init(self):
+        self._queue = asyncio.Queue(self.queue_size)
+        self._retry_lock = asyncio.Lock()
+        self._finished = asyncio.Condition()
+        self._tasks = [
+            asyncio.ensure_future(self._work()) for _ in range(self.concurrency)
+        ]
+        self._tasks.append(asyncio.ensure_future(self._flush_periodically()))
+
+    async def add(self, action):
+        """
+        Add an action to be sent, suspending while ``queue_size`` chunks are
+        waiting to be sent. Return a future resolving to the ``(ok, item)``
+        result of the action.
+        """
+        data, line = self._serialize(action)
+        if self._queue is None:
+            await self._async_init()
+        future = get_running_loop().create_future()
+        await self._put(self._buffer(data, line, (0, future)))
+        return future
+
+    async def flush(self):
+        """
+        Send the actions added so far, wait until they were processed
+        (including retries) and their results were delivered.
+        """
+        if self._queue is None:
+            return
+        while True:
+            await self._wait_for(await self._put(self._take_buffer()))
+            async with self._retry_lock:
+                delay = self._retries._next_delay() if self._retries else None
+                # actions added meanwhile are left for the next chunks, only
+                # the retries (which were attempted before) are waited for
+                if delay is None and not self._retries_buffered():
+                    return
+            if delay:
+                await asyncio.sleep(delay)
+            await self._requeue_retries()
+
+    async def aclose(self):
+        """
+        Flush the actions added so far and stop the tasks, no actions can be
+        added anymore.
+        """
+        if self._closed.is_set():
+            return
+        await self.flush()
+        self._closed.set()
+        if not self._tasks:
+            return
+        self._tasks[-1].cancel()
+        for _ in range(len(self._tasks) - 1):
+            await self._queue.put(None)
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _queued(self):
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def _put(self, chunk):
+        """
+        Queue a chunk to be sent, return the sequence number of the last
+        chunk queued.
+        """
+        if chunk is None:
+            return self._submitted
+        self._submitted += 1
+        seq = self._submitted
+        self._unfinished.add(seq)
+        await self._queue.put((seq, chunk))
+        return seq
+
+    async def _wait_for(self, seq):
+        """Wait until the chunks up to the ``seq`` one were processed."""
+        async with self._finished:
+            await self._finished.wait_for(
+                lambda: not self._unfinished or min(self._unfinished) > seq
+            )
+
+    async def _requeue_retries(self):
+        if self._retries is None:
+            return
+        async with self._retry_lock:
+            for attempts, (data, future), line in self._retries._pop_due():
+                await self._put(self._buffer(data, line, (attempts, future)))
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval / 2.0)
+            await self._requeue_retries()
+            await self._put(self._take_buffer(time.time() - self.flush_interval))
+
+    async def _work(self):
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            seq, chunk = item
+            try:
+                await self._send(*chunk)
+            except Exception as e:
+                logger.exception("Failed to process a bulk chunk")
+                self._handle_failure(e, chunk[0], chunk[2])
+            finally:
+                async with self._finished:
+                    self._unfinished.discard(seq)
+                    self._finished.notify_all()
+
+    async def _send(self, bulk_data, bulk_actions, pending):
+        self._sending()
+        try:
+            results = _process_bulk_chunk(
+                self.client,
+                bulk_actions,
+                bulk_data,
+                False,
+                False,
+                self.ignore_status,
+                **self.kwargs
+            )
+            if isinstance(self.chunk_size, AdaptiveChunkSize):
+                results = _track_chunk_size(self.chunk_size, results)
+            results = [result async for result in results]
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            raise
+        finally:
+            self._sent(bulk_actions)
+        self._handle_results(results, bulk_data, bulk_actions, pending)
+
+    def _attempts(self, pending):
+        return pending[0]
+
+    def _schedule_retry(self, data, line, pending):
+        attempts, future = pending
+        return self._retries.schedule((data, future), attempts, line)
+
+    def _deliver(self, ok, item, pending):
+        future = pending[1]
+        if not future.done():
+            future.set_result((ok, item))
+        super()._deliver(ok, item, pending)
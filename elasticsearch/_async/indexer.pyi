@@ -0,0 +1,64 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import asyncio
+import logging
+from typing import Any, Callable, Collection, Dict, List, Optional, Tuple, Union
+
+from ..helpers.adaptive import AdaptiveChunkSize
+from ..helpers.indexer import _BaseBulkIndexer
+from .client import AsyncElasticsearch
+
+logger: logging.Logger
+
+class AsyncBulkIndexer(_BaseBulkIndexer):
+    client: AsyncElasticsearch
+    concurrency: int
+    queue_size: int
+    def __init__(
+        self,
+        client: AsyncElasticsearch,
+        chunk_size: Union[int, AdaptiveChunkSize] = ...,
+        flush_bytes: int = ...,
+        flush_interval: float = ...,
+        concurrency: int = ...,
+        queue_size: int = ...,
+        expand_action_callback: Callable[
+            [Any], Tuple[Dict[str, Any], Optional[Any]]
+        ] = ...,
+        on_success: Optional[Callable[[Dict[str, Any]], Any]] = ...,
+        on_error: Optional[Callable[[Dict[str, Any]], Any]] = ...,
+        max_retries: int = ...,
+        initial_backoff: Union[float, int] = ...,
+        max_backoff: Union[float, int] = ...,
+        ignore_status: Optional[Union[int, Collection[int]]] = ...,
+        **kwargs: Any
+    ) -> None: ...
+    async def __aenter__(self) -> "AsyncBulkIndexer": ...
+    async def __aexit__(self, *_: Any) -> None: ...
+    async def add(self, action: Any) -> "asyncio.Future[Tuple[bool, Any]]": ...
+    async def flush(self) -> None: ...
+    async def aclose(self) -> None: ...
+    async def _work(self) -> None: ...
+    def _attempts(self, pending: Any) -> int: ...
+    async def _flush_periodically(self) -> None: ...
+    async def _send(
+        self,
+        bulk_data: List[Any],
+        bulk_actions: bytes,
+        pending: List[Tuple[int, "asyncio.Future[Tuple[bool, Any]]"]],
+    ) -> None: ...
@@ -0,0 +1,128 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import threading
+import time
+
+from ..compat import Mapping, string_types
+from .compat import get_running_loop
+
+# payloads of at least this many bytes (or characters) are sent to the executor
+DEFAULT_OFFLOAD_THRESHOLD = 256 * 1024
+
+
+class Offloader(object):
+    """
+    Runs CPU-heavy work (serializing request bodies, compressing them and
+    parsing responses) either inline on the event loop or in an executor,
+    depending on the size of the payload. Without an executor everything runs
+    inline, the time spent there is recorded either way so :meth:`stats` shows
+    how long the event loop was blocked.
+
+    :arg executor: :class:`concurrent.futures.Executor` to offload the work
+        to, a process pool requires the serializers to be picklable
+    :arg threshold: minimal size of a payload, in bytes or characters, to be
+        offloaded. The size of bodies which still need to be serialized is
+        estimated with :meth:`estimate_size`.
+    """
+
+    def __init__(self, executor=None, threshold=DEFAULT_OFFLOAD_THRESHOLD):
+        self.executor = executor
+        self.threshold = threshold
+
+        self._lock = threading.Lock()
+        self._inline = 0
+        self._inline_duration = 0.0
+        self._max_inline_duration = 0.0
+        self._offloaded = 0
+        self._offloaded_duration = 0.0
+
+    def should_offload(self, size=None):
+        """
+        Whether a payload of ``size`` would be offloaded, ``None`` meaning the
+        size isn't known.
+        """
+        if self.executor is None:
+            return False
+        return size is None or size >= self.threshold
+
+    def estimate_size(self, body):
+        """
+        Rough size of ``body`` once serialized, its values are only counted
+        until the threshold is reached so that large bodies aren't walked in
+        full. Always 0 without an executor, nothing gets offloaded anyway.
+        """
+        if self.executor is None:
+            return 0
+        size = 0
+        values = [body]
+        while values and size < self.threshold:
+            value = values.pop()
+            if isinstance(value, Mapping):
+                size += 2
+                for key, item in value.items():
+                    size += len(str(key)) + 4
+                    values.append(item)
+            elif isinstance(value, (list, tuple)):
+                size += 2 + len(value)
+                values.extend(value)
+            elif isinstance(value, string_types):
+                size += len(value) + 2
+            else:
+                # numbers, booleans, dates...
+                size += 8
+        return size
+
+    async def run(self, size, func, *args):
+        """
+        Call ``func(*args)`` and return its result, in the executor if
+        :meth:`should_offload` says so for ``size`` or inline otherwise.
+        """
+        start = time.perf_counter()
+        if self.should_offload(size):
+            result = await get_running_loop().run_in_executor(
+                self.executor, func, *args
+            )
+            duration = time.perf_counter() - start
+            with self._lock:
+                self._offloaded += 1
+                self._offloaded_duration += duration
+        else:
+            result = func(*args)
+            duration = time.perf_counter() - start
+            with self._lock:
+                self._inline += 1
+                self._inline_duration += duration
+                self._max_inline_duration = max(self._max_inline_duration, duration)
+        return result
+
+    def stats(self):
+        """
+        Return a snapshot of the statistics: the number of calls which ran
+        ``inline`` on the event loop and their ``inline_duration`` (the time
+        the loop was blocked) and ``max_inline_duration`` in seconds, along
+        with the number of ``offloaded`` calls and the ``offloaded_duration``
+        the callers waited for them.
+        """
+        with self._lock:
+            return {
+                "inline": self._inline,
+                "inline_duration": self._inline_duration,
+                "max_inline_duration": self._max_inline_duration,
+                "offloaded": self._offloaded,
+                "offloaded_duration": self._offloaded_duration,
+            }
@@ -0,0 +1,36 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Optional, TypeVar, Union
+
+T = TypeVar("T")
+
+DEFAULT_OFFLOAD_THRESHOLD: int
+
+class Offloader(object):
+    executor: Optional[Executor]
+    threshold: int
+    def __init__(
+        self, executor: Optional[Executor] = ..., threshold: int = ...
+    ) -> None: ...
+    def should_offload(self, size: Optional[int] = ...) -> bool: ...
+    def estimate_size(self, body: Any) -> int: ...
+    async def run(
+        self, size: Optional[int], func: Callable[..., T], *args: Any
+    ) -> T: ...
+    def stats(self) -> Dict[str, Union[int, float]]: ...
@@ -0,0 +1,152 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import asyncio
+import time
+
+from ..helpers.pipeline import _BaseReindexPipeline
+from .helpers import async_streaming_bulk
+
+
+class AsyncReindexPipeline(_BaseReindexPipeline):
+    """
+    Asyncio version of :class:`~elasticsearch.helpers.ReindexPipeline`, the
+    slices are read by a task each and ``write_workers`` tasks send the bulk
+    requests::
+
+        pipeline = AsyncReindexPipeline(es, "logs-v1", "logs-v2", checkpoint="ckpt")
+        stats = await pipeline.run()
+
+    It accepts the same arguments, ``client`` and ``target_client`` being
+    instances of :class:`~elasticsearch.AsyncElasticsearch`. The progress is
+    saved as well when the run gets cancelled.
+    """
+
+    def __init__(self, client, source_index, target_index, **kwargs):
+        super().__init__(client, source_index, target_index, **kwargs)
+        self._pages = None
+
+    async def run(self):
+        """
+        Reindex all the documents left and return the
+        :meth:`~elasticsearch.helpers.ReindexPipeline.stats`. The progress is
+        saved before an error is raised.
+        """
+        if self._load_checkpoint():
+            if self.pit_id is not None:
+                # the checkpoint's point in time is replaced, don't leave it open
+                await self.client.close_point_in_time(
+                    body={"id": self.pit_id}, ignore=(404,)
+                )
+            resp = await self.client.open_point_in_time(
+                index=self.source_index, keep_alive=self.keep_alive
+            )
+            self.pit_id = resp["id"]
+
+        self._pages = asyncio.Queue(self.queue_size)
+        slice_ids = self._pending_slices()
+        self._readers = len(slice_ids)
+        tasks = [asyncio.ensure_future(self._read(i)) for i in slice_ids]
+        if slice_ids:
+            tasks.extend(
+                asyncio.ensure_future(self._write()) for _ in range(self.write_workers)
+            )
+        checkpoints = asyncio.ensure_future(self._save_periodically())
+
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks + [checkpoints]:
+                task.cancel()
+            await asyncio.gather(*tasks, checkpoints, return_exceptions=True)
+            self._save_checkpoint()
+
+        # the point in time is left open for the run to be resumed
+        if self._error is None or self.checkpoint is None:
+            await self.client.close_point_in_time(
+                body={"id": self.pit_id}, ignore=(404,)
+            )
+        if self._error is not None:
+            raise self._error
+        self._remove_checkpoint()
+        return self.stats()
+
+    def _queued(self):
+        return self._pages.qsize() if self._pages is not None else 0
+
+    async def _save_periodically(self):
+        while True:
+            await asyncio.sleep(self.checkpoint_interval)
+            self._save_checkpoint()
+
+    async def _read(self, slice_id):
+        scan = self._slice_scan(slice_id)
+        try:
+            while not self._stop.is_set():
+                started = time.time()
+                hits = scan._hits(
+                    await self.client.search(
+                        body=scan._search_body(),
+                        request_timeout=scan.request_timeout,
+                        **scan.kwargs
+                    )
+                )
+                self._record("read", len(hits), started)
+                page = self._page_read(slice_id, scan, hits)
+                if not hits:
+                    self._page_written(slice_id, page)
+                    break
+
+                started = time.time()
+                actions = self._prepare(hits)
+                self._record("transform", len(hits), started)
+                await self._pages.put((slice_id, page, actions))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._fail(e)
+        finally:
+            self._readers -= 1
+        if not self._readers:
+            for _ in range(self.write_workers):
+                await self._pages.put(None)
+
+    async def _write(self):
+        while True:
+            item = await self._pages.get()
+            if item is None:
+                return
+            if self._stop.is_set():
+                continue
+
+            slice_id, page, actions = item
+            try:
+                started = time.time()
+                failed = 0
+                async for ok, _ in async_streaming_bulk(
+                    self.target_client,
+                    actions,
+                    chunk_size=self.chunk_size,
+                    **self.bulk_kwargs
+                ):
+                    failed += not ok
+                self._record("write", len(actions) - failed, started, failed)
+                self._page_written(slice_id, page)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._fail(e)
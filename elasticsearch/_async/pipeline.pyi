@@ -0,0 +1,51 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import asyncio
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from ..helpers.pipeline import _BaseReindexPipeline
+from .client import AsyncElasticsearch
+
+class AsyncReindexPipeline(_BaseReindexPipeline):
+    client: AsyncElasticsearch
+    target_client: AsyncElasticsearch
+    _pages: Optional[asyncio.Queue[Any]]
+    def __init__(
+        self,
+        client: AsyncElasticsearch,
+        source_index: Any,
+        target_index: str,
+        query: Optional[Mapping[str, Any]] = ...,
+        target_client: Optional[AsyncElasticsearch] = ...,
+        transform: Optional[Callable[[Dict[str, Any]], Optional[Any]]] = ...,
+        slices: int = ...,
+        write_workers: int = ...,
+        queue_size: int = ...,
+        page_size: int = ...,
+        keep_alive: str = ...,
+        sort: Optional[Any] = ...,
+        checkpoint: Optional[str] = ...,
+        checkpoint_interval: float = ...,
+        chunk_size: int = ...,
+        search_kwargs: Optional[Mapping[str, Any]] = ...,
+        bulk_kwargs: Optional[Mapping[str, Any]] = ...,
+    ) -> None: ...
+    async def run(self) -> Dict[str, Any]: ...
+    async def _save_periodically(self) -> None: ...
+    async def _read(self, slice_id: int) -> None: ...
+    async def _write(self) -> None: ...
@@ -0,0 +1,73 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+from ..helpers.pit import _BasePitScan
+
+
+class AsyncPitScan(_BasePitScan):
+    """
+    Asyncio version of :class:`~elasticsearch.helpers.PitScan`, iterated
+    with ``async for``::
+
+        hits = async_pit_scan(es, index="orders-*")
+        async for hit in hits:
+            await process(hit)
+            await save_position(hits.cursor)
+
+    It accepts the same arguments, ``client`` being an instance of
+    :class:`~elasticsearch.AsyncElasticsearch`.
+    """
+
+    async def __aiter__(self):
+        if self.pit_id is None:
+            if self._closed():
+                return
+            resp = await self.client.open_point_in_time(**self._open_params())
+            self.pit_id = resp["id"]
+
+        while True:
+            hits = self._hits(
+                await self.client.search(
+                    body=self._search_body(),
+                    request_timeout=self.request_timeout,
+                    **self.kwargs
+                )
+            )
+            if not hits:
+                break
+            for hit in hits:
+                yield hit if self.hit_class is None else self.hit_class(hit)
+                self.search_after = hit["sort"]
+
+        await self.close()
+
+    async def close(self):
+        """Close the point in time, the iteration can't be resumed anymore."""
+        if self.pit_id is not None:
+            await self.client.close_point_in_time(
+                body={"id": self.pit_id}, ignore=(404,)
+            )
+            self.pit_id = None
+
+
+def async_pit_scan(client, index=None, query=None, **kwargs):
+    """
+    Iterate over all the hits matching ``query`` through a point in time,
+    returns an :class:`~elasticsearch.helpers.AsyncPitScan` which accepts the
+    same arguments.
+    """
+    return AsyncPitScan(client, index, query, **kwargs)
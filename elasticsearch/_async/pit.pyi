@@ -0,0 +1,33 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+from typing import Any, AsyncGenerator, Mapping, Optional
+
+from ..helpers.pit import _BasePitScan
+from .client import AsyncElasticsearch
+
+class AsyncPitScan(_BasePitScan):
+    client: AsyncElasticsearch
+    def __aiter__(self) -> AsyncGenerator[Any, None]: ...
+    async def close(self) -> None: ...
+
+def async_pit_scan(
+    client: AsyncElasticsearch,
+    index: Optional[Any] = ...,
+    query: Optional[Mapping[str, Any]] = ...,
+    **kwargs: Any
+) -> AsyncPitScan: ...
@@ -20,6 +20,7 @@ import logging
 import sys
 from itertools import chain
 
+from ..connection import ChunkedBody
 from ..exceptions import (
     ConnectionError,
     ConnectionTimeout,
@@ -27,12 +28,25 @@ from ..exceptions import (
     TransportError,
 )
 from ..transport import Transport
-from .compat import get_running_loop
+from .compat import get_running_loop, string_types
 from .http_aiohttp import AIOHttpConnection
+from .offload import DEFAULT_OFFLOAD_THRESHOLD, Offloader
 
 logger = logging.getLogger("elasticsearch")
 
 
+def _serialize_body(serializer, body, encode):
+    # module level so it can be sent to a process pool
+    body = serializer.dumps(body)
+    if not encode:
+        return body
+    try:
+        return body.encode("utf-8", "surrogatepass")
+    except (UnicodeDecodeError, AttributeError):
+        # bytes/str - no need to re-encode
+        return body
+
+
 class AsyncTransport(Transport):
     """
     Encapsulation of transport-related to logic. Handles instantiation of the
@@ -43,7 +57,15 @@ class AsyncTransport(Transport):
 
     DEFAULT_CONNECTION_CLASS = AIOHttpConnection
 
-    def __init__(self, hosts, *args, sniff_on_start=False, **kwargs):
+    def __init__(
+        self,
+        hosts,
+        *args,
+        sniff_on_start=False,
+        offload_executor=None,
+        offload_threshold=DEFAULT_OFFLOAD_THRESHOLD,
+        **kwargs,
+    ):
         """
         :arg hosts: list of dictionaries, each containing keyword arguments to
             create a `connection_class` instance
@@ -76,6 +98,13 @@ class AsyncTransport(Transport):
             don't support passing bodies with GET requests. If you set this to
             'POST' a POST method will be used instead, if to 'source' then the body
             will be serialized and passed as a query parameter `source`.
+        :arg offload_executor: optional :class:`concurrent.futures.Executor`
+            used to serialize and compress request bodies and to parse
+            responses of at least ``offload_threshold`` bytes without blocking
+            the event loop
+        :arg offload_threshold: minimal size in bytes of a payload to be sent
+            to ``offload_executor``, smaller payloads are processed inline
+            (default: 256KB)
 
         Any extra keyword arguments will be passed to the `connection_class`
         when creating and instance unless overridden by that connection's
@@ -84,10 +113,14 @@ class AsyncTransport(Transport):
         self.sniffing_task = None
         self.loop = None
         self._async_init_called = False
+        self.offloader = Offloader(offload_executor, offload_threshold)
 
         super(AsyncTransport, self).__init__(
             *args, hosts=[], sniff_on_start=False, **kwargs
         )
+        # connections compress request bodies through the same offloader
+        if offload_executor is not None:
+            self.kwargs["offloader"] = self.offloader
 
         # Don't enable sniffing on Cloud instances.
         if kwargs.get("cloud_id", False):
@@ -285,6 +318,20 @@ class AsyncTransport(Transport):
         """
         await self._async_call()
 
+        if body is not None and not isinstance(body, ChunkedBody):
+            if isinstance(body, string_types):
+                size = len(body)
+            else:
+                size = self.offloader.estimate_size(body)
+            body = await self.offloader.run(
+                size,
+                _serialize_body,
+                self.serializer,
+                body,
+                # bodies sent as the 'source' parameter stay strings
+                method not in ("HEAD", "GET") or self.send_get_body_as != "source",
+            )
+
         method, headers, params, body, ignore, timeout = self._resolve_request_args(
             method, headers, params, body
         )
@@ -336,7 +383,12 @@ class AsyncTransport(Transport):
                     return 200 <= status < 300
 
                 if data:
-                    data = self.deserializer.loads(data, headers.get("content-type"))
+                    data = await self.offloader.run(
+                        len(data),
+                        self.deserializer.loads,
+                        data,
+                        headers.get("content-type"),
+                    )
                 return data
 
     async def close(self):
@@ -15,16 +15,19 @@
 #  specific language governing permissions and limitations
 #  under the License.
 
+from concurrent.futures import Executor
 from typing import Any, Callable, Collection, Dict, List, Mapping, Optional, Type, Union
 
 from ..connection import Connection
 from ..connection_pool import ConnectionPool
 from ..serializer import Deserializer, Serializer
+from .offload import Offloader
 
 class AsyncTransport(object):
     DEFAULT_CONNECTION_CLASS: Type[Connection]
     connection_pool: ConnectionPool
     deserializer: Deserializer
+    offloader: Offloader
 
     max_retries: int
     retry_on_timeout: bool
@@ -63,6 +66,8 @@ class AsyncTransport(object):
         retry_on_status: Collection[int] = ...,
         retry_on_timeout: bool = ...,
         send_get_body_as: str = ...,
+        offload_executor: Optional[Executor] = ...,
+        offload_threshold: int = ...,
         **kwargs: Any
     ) -> None: ...
     def add_connection(self, host: Any) -> None: ...
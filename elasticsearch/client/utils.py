@@ -23,10 +23,16 @@ from datetime import date, datetime
 from functools import wraps
 
 from ..compat import PY2, quote, string_types, to_bytes, to_str, unquote, urlparse
+from ..connection import ChunkedBody
+from ..utils import _LRUCache
 
 # parts of URL to be omitted
 SKIP_IN_PATH = (None, "", b"", [], ())
 
+# URL paths made only of string parts (index names, endpoints...) repeat a lot
+# so they're kept around instead of being escaped again for every request.
+_PATH_CACHE = _LRUCache(1024)
+
 
 def _normalize_hosts(hosts):
     """
@@ -110,14 +116,24 @@ def _make_path(*parts):
     Create a URL string from parts, omit all `None` values and empty strings.
     Convert lists and tuples to comma separated values.
     """
+    cacheable = all(p is None or isinstance(p, string_types) for p in parts)
+    if cacheable:
+        path = _PATH_CACHE.get(parts)
+        if path is not None:
+            return path
+
     # TODO: maybe only allow some parts to be lists/tuples ?
-    return "/" + "/".join(
+    path = "/" + "/".join(
         # preserve ',' and '*' in url for nicer URLs in logs
         quote(_escape(p), b",*")
         for p in parts
         if p not in SKIP_IN_PATH
     )
 
+    if cacheable:
+        _PATH_CACHE.set(parts, path)
+    return path
+
 
 # parameters that apply to all methods
 GLOBAL_PARAMS = ("pretty", "human", "error_trace", "format", "filter_path")
@@ -173,6 +189,10 @@ def query_params(*es_query_params):
 
 
 def _bulk_body(serializer, body):
+    # streamed bodies are already serialized, line by line
+    if isinstance(body, ChunkedBody):
+        return body
+
     # if not passed in a string, serialize items and join by newline
     if not isinstance(body, string_types):
         body = "\n".join(map(serializer.dumps, body))
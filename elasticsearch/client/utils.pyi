@@ -32,9 +32,11 @@ from typing import (
 from ..client import Elasticsearch
 from ..serializer import Serializer
 from ..transport import Transport
+from ..utils import _LRUCache
 
 T = TypeVar("T")
 SKIP_IN_PATH: Collection[Any]
+_PATH_CACHE: _LRUCache[str]
 
 def _normalize_hosts(
     hosts: Optional[Union[str, Collection[Union[str, Dict[str, Any]]]]]
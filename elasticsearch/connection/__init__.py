@@ -16,11 +16,15 @@
 #  under the License.
 
 from .base import Connection
+from .chunked import ChunkedBody
+from .compression import CompressionPolicy
 from .http_requests import RequestsHttpConnection
 from .http_urllib3 import Urllib3HttpConnection, create_ssl_context
 
 __all__ = [
     "Connection",
+    "ChunkedBody",
+    "CompressionPolicy",
     "RequestsHttpConnection",
     "Urllib3HttpConnection",
     "create_ssl_context",
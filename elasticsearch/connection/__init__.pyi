@@ -16,6 +16,8 @@
 #  under the License.
 
 from .base import Connection as Connection
+from .chunked import ChunkedBody as ChunkedBody
+from .compression import CompressionPolicy as CompressionPolicy
 from .http_requests import RequestsHttpConnection as RequestsHttpConnection
 from .http_urllib3 import Urllib3HttpConnection as Urllib3HttpConnection
 from .http_urllib3 import create_ssl_context as create_ssl_context
@@ -16,8 +16,7 @@
 #  under the License.
 
 import binascii
-import gzip
-import io
+import functools
 import logging
 import os
 import re
@@ -36,6 +35,8 @@ from ..exceptions import (
     ImproperlyConfigured,
     TransportError,
 )
+from .chunked import ChunkedBody
+from .compression import CompressionPolicy
 
 logger = logging.getLogger("elasticsearch")
 
@@ -62,7 +63,9 @@ class Connection(object):
     :arg use_ssl: use ssl for the connection if `True`
     :arg url_prefix: optional url prefix for elasticsearch
     :arg timeout: default timeout in seconds (float, default: 10)
-    :arg http_compress: Use gzip compression
+    :arg http_compress: Use gzip compression, either ``True`` or a
+        :class:`~elasticsearch.connection.CompressionPolicy` deciding which
+        request bodies are compressed and how
     :arg cloud_id: The Cloud ID from ElasticCloud. Convenient way to connect to cloud instances.
     :arg opaque_id: Send this value in the 'X-Opaque-Id' HTTP header
         For tracing all requests made by this transport.
@@ -143,7 +146,11 @@ class Connection(object):
             scheme = "https"
             use_ssl = True
         self.use_ssl = use_ssl
-        self.http_compress = http_compress or False
+        self.http_compress = bool(http_compress)
+        if isinstance(http_compress, CompressionPolicy):
+            self.compression_policy = http_compress
+        else:
+            self.compression_policy = CompressionPolicy()
 
         self.scheme = scheme
         self.hostname = host
@@ -175,10 +182,24 @@ class Connection(object):
         return id(self)
 
     def _gzip_compress(self, body):
-        buf = io.BytesIO()
-        with gzip.GzipFile(fileobj=buf, mode="wb") as f:
-            f.write(body)
-        return buf.getvalue()
+        return self.compression_policy.compress(body)
+
+    def _compress_request_body(self, url, body, headers):
+        """Compress the body according to ``http_compress`` and the
+        compression policy, setting the 'content-encoding' header if it was.
+        """
+        if (
+            self.http_compress
+            and body
+            and self.compression_policy.should_compress(url, body)
+        ):
+            headers["content-encoding"] = "gzip"
+            if isinstance(body, ChunkedBody):
+                return ChunkedBody(
+                    functools.partial(self.compression_policy.compress_iter, body)
+                )
+            return self.compression_policy.compress(body)
+        return body
 
     def _raise_warnings(self, warning_headers):
         """If 'headers' contains a 'Warning' header raise
@@ -30,6 +30,9 @@ from typing import (
     Union,
 )
 
+from .chunked import ChunkedBody
+from .compression import CompressionPolicy
+
 logger: logging.Logger
 tracer: logging.Logger
 
@@ -37,6 +40,7 @@ class Connection(object):
     headers: Dict[str, str]
     use_ssl: bool
     http_compress: bool
+    compression_policy: CompressionPolicy
     scheme: str
     hostname: str
     port: Optional[int]
@@ -52,7 +56,7 @@ class Connection(object):
         url_prefix: str = ...,
         timeout: Optional[Union[float, int]] = ...,
         headers: Optional[Mapping[str, str]] = ...,
-        http_compress: Optional[bool] = ...,
+        http_compress: Optional[Union[bool, CompressionPolicy]] = ...,
         cloud_id: Optional[str] = ...,
         api_key: Optional[Union[Tuple[str, str], List[str], str]] = ...,
         opaque_id: Optional[str] = ...,
@@ -63,6 +67,12 @@ class Connection(object):
     def __eq__(self, other: object) -> bool: ...
     def __hash__(self) -> int: ...
     def _gzip_compress(self, body: bytes) -> bytes: ...
+    def _compress_request_body(
+        self,
+        url: str,
+        body: Optional[Union[bytes, ChunkedBody]],
+        headers: MutableMapping[str, str],
+    ) -> Optional[Union[bytes, ChunkedBody]]: ...
     def _raise_warnings(self, warning_headers: Sequence[str]) -> None: ...
     def _pretty_json(self, data: Any) -> str: ...
     def _log_trace(
@@ -0,0 +1,48 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+
+class ChunkedBody(object):
+    """
+    Request body sent with ``Transfer-Encoding: chunked`` instead of being
+    held in memory as a whole. The chunks are ``bytes`` and are produced by
+    iterating over ``chunks``, or over what it returns if it's a callable::
+
+        def lines():
+            for doc in docs:
+                yield json.dumps(doc).encode("utf-8") + b"\\n"
+
+        es.transport.perform_request("POST", "/_bulk", body=ChunkedBody(lines))
+
+    The body is iterated once per attempt at sending it, pass a callable or a
+    re-iterable object for retries on other nodes to work. Bodies are passed
+    to the connection as they are, without going through the serializer.
+
+    :arg chunks: iterable of ``bytes`` or a callable returning one
+    """
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def __iter__(self):
+        return iter(self._chunks())
+
+    def _chunks(self):
+        return self.chunks() if callable(self.chunks) else self.chunks
+
+    def __repr__(self):
+        return "<ChunkedBody>"
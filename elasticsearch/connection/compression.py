@@ -0,0 +1,141 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import threading
+import time
+import zlib
+
+# 'wbits' value making zlib write a gzip header and trailer
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def gzip_compress(body, level=9):
+    """Return ``body`` gzip-compressed at the given ``level``."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+    return compressor.compress(body) + compressor.flush()
+
+
+class CompressionPolicy(object):
+    """
+    Decides which request bodies are gzip-compressed when ``http_compress`` is
+    enabled and keeps statistics about the compression. Pass an instance as
+    ``http_compress`` to use it, the default policy compresses every request
+    body at level 9::
+
+        # only compress bulk bodies of at least 10KB
+        policy = CompressionPolicy(min_size=10240, level=3, paths=("_bulk",))
+        es = Elasticsearch(hosts, http_compress=policy)
+        ...
+        print(policy.stats())
+
+    :arg min_size: bodies smaller than this number of bytes are sent
+        uncompressed (default: 0)
+    :arg level: compression level from 1 (fastest) to 9 (smallest) (default: 9)
+    :arg paths: optional collection of endpoints (eg. ``("_bulk",)``), only
+        requests to a URL containing one of them as a path segment are
+        compressed. All requests are eligible by default.
+    """
+
+    def __init__(self, min_size=0, level=9, paths=None):
+        if not 1 <= level <= 9:
+            raise ValueError("Compression level must be between 1 and 9.")
+
+        self.min_size = min_size
+        self.level = level
+        self.paths = frozenset(paths) if paths else None
+
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._skipped = 0
+        self._bytes_in = 0
+        self._bytes_out = 0
+        self._duration = 0.0
+
+    def should_compress(self, url, body):
+        """
+        Whether the body of a request to ``url`` should be compressed, bodies
+        of unknown size (streamed ones) only depend on ``paths``.
+        """
+        compress = not hasattr(body, "__len__") or len(body) >= self.min_size
+        if compress and self.paths is not None:
+            path = url.partition("?")[0]
+            compress = not self.paths.isdisjoint(path.split("/"))
+
+        if not compress:
+            with self._lock:
+                self._skipped += 1
+        return compress
+
+    def compressobj(self):
+        """Return a zlib compression object writing gzip data at ``level``."""
+        return zlib.compressobj(self.level, zlib.DEFLATED, GZIP_WBITS)
+
+    def record(self, bytes_in, bytes_out, duration):
+        """Account for a body compressed outside of the policy."""
+        with self._lock:
+            self._requests += 1
+            self._bytes_in += bytes_in
+            self._bytes_out += bytes_out
+            self._duration += duration
+
+    def compress(self, body):
+        """Return ``body`` gzip-compressed."""
+        start = time.time()
+        data = gzip_compress(body, self.level)
+        self.record(len(body), len(data), time.time() - start)
+        return data
+
+    def compress_iter(self, chunks):
+        """
+        Compress an iterable of ``bytes`` chunks, yielding the compressed data
+        as it becomes available. Nothing but the compressor state is buffered.
+        """
+        compressor = self.compressobj()
+        bytes_in = bytes_out = 0
+        duration = 0.0
+        for chunk in chunks:
+            start = time.time()
+            data = compressor.compress(chunk)
+            duration += time.time() - start
+            bytes_in += len(chunk)
+            if data:
+                bytes_out += len(data)
+                yield data
+
+        data = compressor.flush()
+        bytes_out += len(data)
+        self.record(bytes_in, bytes_out, duration)
+        yield data
+
+    def stats(self):
+        """
+        Return a snapshot of the compression statistics: number of compressed
+        (``requests``) and uncompressed (``skipped``) bodies, ``bytes_in`` and
+        ``bytes_out`` of the compressed bodies, their ``ratio`` and the
+        ``duration`` spent compressing in seconds.
+        """
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "skipped": self._skipped,
+                "bytes_in": self._bytes_in,
+                "bytes_out": self._bytes_out,
+                "ratio": (
+                    float(self._bytes_out) / self._bytes_in if self._bytes_in else None
+                ),
+                "duration": self._duration,
+            }
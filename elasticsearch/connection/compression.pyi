@@ -0,0 +1,41 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+from typing import Any, Collection, Dict, FrozenSet, Iterable, Iterator, Optional, Union
+
+GZIP_WBITS: int
+
+def gzip_compress(body: bytes, level: int = ...) -> bytes: ...
+
+class CompressionPolicy(object):
+    min_size: int
+    level: int
+    paths: Optional[FrozenSet[str]]
+    def __init__(
+        self,
+        min_size: int = ...,
+        level: int = ...,
+        paths: Optional[Collection[str]] = ...,
+    ) -> None: ...
+    def should_compress(
+        self, url: str, body: Union[bytes, Iterable[bytes]]
+    ) -> bool: ...
+    def compressobj(self) -> Any: ...
+    def record(self, bytes_in: int, bytes_out: int, duration: float) -> None: ...
+    def compress(self, body: bytes) -> bytes: ...
+    def compress_iter(self, chunks: Iterable[bytes]) -> Iterator[bytes]: ...
+    def stats(self) -> Dict[str, Any]: ...
@@ -54,7 +54,8 @@ class RequestsHttpConnection(Connection):
     :arg client_key: path to the file containing the private key if using
         separate cert and key files (client_cert will contain only the cert)
     :arg headers: any custom http headers to be add to requests
-    :arg http_compress: Use gzip compression
+    :arg http_compress: Use gzip compression, either ``True`` or a
+        :class:`~elasticsearch.connection.CompressionPolicy`
     :arg cloud_id: The Cloud ID from ElasticCloud. Convenient way to connect to cloud instances.
         Other host connection params will be ignored.
     :arg api_key: optional API Key authentication as either base64 encoded string or a tuple.
@@ -150,9 +151,7 @@ class RequestsHttpConnection(Connection):
             url = "%s?%s" % (url, urlencode(params))
 
         orig_body = body
-        if self.http_compress and body:
-            body = self._gzip_compress(body)
-            headers["content-encoding"] = "gzip"
+        body = self._compress_request_body(url, body, headers)
 
         start = time.time()
         request = requests.Request(method=method, headers=headers, url=url, data=body)
@@ -15,11 +15,12 @@
 #  specific language governing permissions and limitations
 #  under the License.
 
-from typing import Any, Mapping, Optional
+from typing import Any, Mapping, Optional, Union
 
 import requests
 
 from .base import Connection
+from .compression import CompressionPolicy
 
 class RequestsHttpConnection(Connection):
     session: requests.Session
@@ -35,7 +36,7 @@ class RequestsHttpConnection(Connection):
         client_cert: Optional[Any] = ...,
         client_key: Optional[Any] = ...,
         headers: Optional[Mapping[str, str]] = ...,
-        http_compress: Optional[bool] = ...,
+        http_compress: Optional[Union[bool, CompressionPolicy]] = ...,
         cloud_id: Optional[str] = ...,
         api_key: Optional[Any] = ...,
         opaque_id: Optional[str] = ...,
@@ -33,6 +33,7 @@ from ..exceptions import (
 )
 from ..utils import _client_meta_version
 from .base import Connection
+from .chunked import ChunkedBody
 
 # sentinel value for `verify_certs` and `ssl_show_warn`.
 # This is used to detect if a user is passing in a value
@@ -91,7 +92,8 @@ class Urllib3HttpConnection(Connection):
         host. See https://urllib3.readthedocs.io/en/1.4/pools.html#api for more
         information.
     :arg headers: any custom http headers to be add to requests
-    :arg http_compress: Use gzip compression
+    :arg http_compress: Use gzip compression, either ``True`` or a
+        :class:`~elasticsearch.connection.CompressionPolicy`
     :arg cloud_id: The Cloud ID from ElasticCloud. Convenient way to connect to cloud instances.
         Other host connection params will be ignored.
     :arg api_key: optional API Key authentication as either base64 encoded string or a tuple.
@@ -244,9 +246,9 @@ class Urllib3HttpConnection(Connection):
             request_headers = self.headers.copy()
             request_headers.update(headers or ())
 
-            if self.http_compress and body:
-                body = self._gzip_compress(body)
-                request_headers["content-encoding"] = "gzip"
+            body = self._compress_request_body(url, body, request_headers)
+            if isinstance(body, ChunkedBody):
+                kw["chunked"] = True
 
             response = self.pool.urlopen(
                 method, url, body, retries=Retry(False), headers=request_headers, **kw
@@ -21,6 +21,7 @@ from typing import Any, Mapping, Optional, Union
 import urllib3  # type: ignore
 
 from .base import Connection
+from .compression import CompressionPolicy
 
 def create_ssl_context(
     cafile: Any = ...,
@@ -49,7 +50,7 @@ class Urllib3HttpConnection(Connection):
         maxsize: int = ...,
         headers: Optional[Mapping[str, str]] = ...,
         ssl_context: Optional[Any] = ...,
-        http_compress: Optional[bool] = ...,
+        http_compress: Optional[Union[bool, CompressionPolicy]] = ...,
         cloud_id: Optional[str] = ...,
         api_key: Optional[Any] = ...,
         opaque_id: Optional[str] = ...,
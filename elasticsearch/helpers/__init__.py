@@ -23,21 +23,47 @@ from .actions import (
     bulk,
     expand_action,
     parallel_bulk,
+    parallel_scan,
     reindex,
     scan,
     streaming_bulk,
 )
+from .adaptive import AdaptiveChunkSize
+from .coalesce import ActionCoalescer
 from .errors import BulkIndexError, ScanError
+from .files import bulk_from_file
+from .frames import hits_to_columns, hits_to_dataframe
+from .hits import CompactHit
+from .indexer import BulkIndexer
+from .pipeline import ReindexPipeline
+from .pit import PitScan, pit_scan
+from .sinks import DeadLetterFile, ErrorSample, read_dead_letters
+from .spool import BulkSpool
 
 __all__ = [
     "BulkIndexError",
     "ScanError",
+    "CompactHit",
+    "AdaptiveChunkSize",
+    "ActionCoalescer",
+    "BulkIndexer",
+    "BulkSpool",
+    "PitScan",
+    "ReindexPipeline",
+    "ErrorSample",
+    "DeadLetterFile",
     "expand_action",
     "streaming_bulk",
     "bulk",
     "parallel_bulk",
+    "bulk_from_file",
+    "read_dead_letters",
     "scan",
+    "parallel_scan",
+    "pit_scan",
     "reindex",
+    "hits_to_columns",
+    "hits_to_dataframe",
     "_chunk_actions",
     "_process_bulk_chunk",
 ]
@@ -50,11 +76,27 @@ try:
 
     from .._async.helpers import (
         async_bulk,
+        async_parallel_bulk,
+        async_parallel_scan,
         async_reindex,
         async_scan,
         async_streaming_bulk,
     )
+    from .._async.indexer import AsyncBulkIndexer
+    from .._async.pipeline import AsyncReindexPipeline
+    from .._async.pit import AsyncPitScan, async_pit_scan
 
-    __all__ += ["async_scan", "async_bulk", "async_reindex", "async_streaming_bulk"]
+    __all__ += [
+        "async_scan",
+        "async_bulk",
+        "async_parallel_bulk",
+        "async_parallel_scan",
+        "async_reindex",
+        "async_streaming_bulk",
+        "AsyncBulkIndexer",
+        "AsyncPitScan",
+        "async_pit_scan",
+        "AsyncReindexPipeline",
+    ]
 except (ImportError, SyntaxError):
     pass
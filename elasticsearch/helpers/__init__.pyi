@@ -22,11 +22,26 @@ from .actions import _process_bulk_chunk as _process_bulk_chunk
 from .actions import bulk as bulk
 from .actions import expand_action as expand_action
 from .actions import parallel_bulk as parallel_bulk
+from .actions import parallel_scan as parallel_scan
 from .actions import reindex as reindex
 from .actions import scan as scan
 from .actions import streaming_bulk as streaming_bulk
+from .adaptive import AdaptiveChunkSize as AdaptiveChunkSize
+from .coalesce import ActionCoalescer as ActionCoalescer
 from .errors import BulkIndexError as BulkIndexError
 from .errors import ScanError as ScanError
+from .files import bulk_from_file as bulk_from_file
+from .frames import hits_to_columns as hits_to_columns
+from .frames import hits_to_dataframe as hits_to_dataframe
+from .hits import CompactHit as CompactHit
+from .indexer import BulkIndexer as BulkIndexer
+from .pipeline import ReindexPipeline as ReindexPipeline
+from .pit import PitScan as PitScan
+from .pit import pit_scan as pit_scan
+from .sinks import DeadLetterFile as DeadLetterFile
+from .sinks import ErrorSample as ErrorSample
+from .sinks import read_dead_letters as read_dead_letters
+from .spool import BulkSpool as BulkSpool
 
 try:
     # Asyncio only supported on Python 3.6+
@@ -34,8 +49,14 @@ try:
         raise ImportError
 
     from .._async.helpers import async_bulk as async_bulk
+    from .._async.helpers import async_parallel_bulk as async_parallel_bulk
+    from .._async.helpers import async_parallel_scan as async_parallel_scan
     from .._async.helpers import async_reindex as async_reindex
     from .._async.helpers import async_scan as async_scan
     from .._async.helpers import async_streaming_bulk as async_streaming_bulk
+    from .._async.indexer import AsyncBulkIndexer as AsyncBulkIndexer
+    from .._async.pipeline import AsyncReindexPipeline as AsyncReindexPipeline
+    from .._async.pit import AsyncPitScan as AsyncPitScan
+    from .._async.pit import async_pit_scan as async_pit_scan
 except (ImportError, SyntaxError):
     pass
@@ -15,13 +15,21 @@
 #  specific language governing permissions and limitations
 #  under the License.
 
+import functools
+import heapq
+import itertools
 import logging
+import threading
 import time
+from collections import deque, namedtuple
 from operator import methodcaller
 
-from ..compat import Mapping, Queue, map, string_types
+from ..compat import Mapping, Queue, map, string_types, to_bytes
+from ..connection import ChunkedBody
 from ..exceptions import TransportError
+from .adaptive import AdaptiveChunkSize, _current_chunk_size
 from .errors import BulkIndexError, ScanError
+from .frames import _require_pandas, hits_to_dataframe
 
 logger = logging.getLogger("elasticsearch.helpers")
 
@@ -94,66 +102,101 @@ def expand_action(data):
     return action, data.get("_source", data)
 
 
+# marks the end of the actions available for now, the chunk being built is
+# sent without waiting for it to fill up
+_FLUSH = object()
+
+
+# a rejected action handed back to the chunker with its serialized lines,
+# ``data`` being its entry from ``bulk_data``
+_Serialized = namedtuple("_Serialized", ["data", "line"])
+
+
 class _ActionChunker:
-    def __init__(self, chunk_size, max_chunk_bytes, serializer):
+    def __init__(self, chunk_size, max_chunk_bytes, serializer, keep_source=True):
         self.chunk_size = chunk_size
         self.max_chunk_bytes = max_chunk_bytes
         self.serializer = serializer
+        # without it only the action and the serialized lines are kept, the
+        # document source isn't needed to report errors when not raising them
+        self.keep_source = keep_source
 
-        self.size = 0
         self.action_count = 0
-        self.bulk_actions = []
+        # the serialized and utf-8 encoded chunk, every line ends with a newline
+        self.bulk_actions = bytearray()
         self.bulk_data = []
 
+    def _make_room(self, size):
+        # full chunk, send it and start a new one
+        if self.bulk_actions and (
+            len(self.bulk_actions) + size > self.max_chunk_bytes
+            or self.action_count >= _current_chunk_size(self.chunk_size)
+        ):
+            return self.flush()
+        return None
+
     def feed(self, action, data):
-        ret = None
         raw_data, raw_action = data, action
-        action = self.serializer.dumps(action)
+        action = to_bytes(self.serializer.dumps(action), "utf-8")
         # +1 to account for the trailing new line character
-        cur_size = len(action.encode("utf-8")) + 1
+        cur_size = len(action) + 1
 
         if data is not None:
-            data = self.serializer.dumps(data)
-            cur_size += len(data.encode("utf-8")) + 1
+            data = to_bytes(self.serializer.dumps(data), "utf-8")
+            cur_size += len(data) + 1
 
-        # full chunk, send it and start a new one
-        if self.bulk_actions and (
-            self.size + cur_size > self.max_chunk_bytes
-            or self.action_count == self.chunk_size
-        ):
-            ret = (self.bulk_data, self.bulk_actions)
-            self.bulk_actions, self.bulk_data = [], []
-            self.size, self.action_count = 0, 0
+        ret = self._make_room(cur_size)
 
-        self.bulk_actions.append(action)
+        self.bulk_actions += action
+        self.bulk_actions += b"\n"
         if data is not None:
-            self.bulk_actions.append(data)
-            self.bulk_data.append((raw_action, raw_data))
+            self.bulk_actions += data
+            self.bulk_actions += b"\n"
+            self.bulk_data.append((raw_action, raw_data if self.keep_source else None))
         else:
             self.bulk_data.append((raw_action,))
 
-        self.size += cur_size
+        self.action_count += 1
+        return ret
+
+    def feed_serialized(self, data, line):
+        """
+        Add an action serialized before, ``data`` being its entry from
+        ``bulk_data`` and ``line`` its lines as sent.
+        """
+        ret = self._make_room(len(line))
+        self.bulk_actions += line
+        self.bulk_data.append(data)
         self.action_count += 1
         return ret
 
     def flush(self):
         ret = None
         if self.bulk_actions:
-            ret = (self.bulk_data, self.bulk_actions)
-            self.bulk_actions, self.bulk_data = [], []
+            ret = (self.bulk_data, bytes(self.bulk_actions))
+            self.bulk_actions, self.bulk_data = bytearray(), []
+            self.action_count = 0
         return ret
 
 
-def _chunk_actions(actions, chunk_size, max_chunk_bytes, serializer):
+def _chunk_actions(actions, chunk_size, max_chunk_bytes, serializer, keep_source=True):
     """
-    Split actions into chunks by number or size, serialize them into strings in
-    the process.
+    Split actions into chunks by number or size, serialize them into a single
+    ``bytes`` body per chunk in the process.
     """
     chunker = _ActionChunker(
-        chunk_size=chunk_size, max_chunk_bytes=max_chunk_bytes, serializer=serializer
+        chunk_size=chunk_size,
+        max_chunk_bytes=max_chunk_bytes,
+        serializer=serializer,
+        keep_source=keep_source,
     )
-    for action, data in actions:
-        ret = chunker.feed(action, data)
+    for action in actions:
+        if action is _FLUSH:
+            ret = chunker.flush()
+        elif isinstance(action, _Serialized):
+            ret = chunker.feed_serialized(*action)
+        else:
+            ret = chunker.feed(*action)
         if ret:
             yield ret
     ret = chunker.flush()
@@ -161,7 +204,325 @@ def _chunk_actions(actions, chunk_size, max_chunk_bytes, serializer):
         yield ret
 
 
-def _process_bulk_chunk_success(resp, bulk_data, ignore_status, raise_on_error=True):
+def _serialize_actions(batch, expand_action_callback, serializer, keep_source):
+    """
+    Expand and serialize a batch of actions into ``_Serialized`` items, run in
+    the worker processes of ``parallel_bulk``.
+    """
+    serialized = []
+    for action, data in map(expand_action_callback, batch):
+        line = to_bytes(serializer.dumps(action), "utf-8") + b"\n"
+        if data is None:
+            serialized.append(_Serialized((action,), line))
+            continue
+        line += to_bytes(serializer.dumps(data), "utf-8") + b"\n"
+        serialized.append(_Serialized((action, data if keep_source else None), line))
+    return serialized
+
+
+def _serialize_in_processes(actions, processes, batch_size, queue_size, serialize):
+    """
+    Yield the ``_Serialized`` actions produced by ``serialize`` from batches
+    of ``actions`` in a pool of ``processes``, with at most ``queue_size``
+    batches waiting to be serialized or consumed.
+    """
+    # Avoid importing multiprocessing unless it's needed, like parallel_bulk
+    from multiprocessing import Pool
+
+    slots = threading.Semaphore(queue_size)
+
+    def batches():
+        actions_iter = iter(actions)
+        while True:
+            batch = list(itertools.islice(actions_iter, batch_size))
+            if not batch:
+                return
+            slots.acquire()
+            yield batch
+
+    pool = Pool(processes)
+    try:
+        for serialized in pool.imap(serialize, batches()):
+            slots.release()
+            for item in serialized:
+                yield item
+    finally:
+        # unblock the batches waiting for a slot so the pool can shut down
+        for _ in range(queue_size):
+            slots.release()
+        pool.terminate()
+        pool.join()
+
+
+def _split_actions(bulk_data, bulk_actions):
+    """
+    Split the serialized body of a chunk into the lines of every action, they
+    are ``None`` for a streamed chunk which isn't kept serialized.
+    """
+    if not isinstance(bulk_actions, (bytes, bytearray)):
+        return [None] * len(bulk_data)
+    lines = iter(bulk_actions.split(b"\n"))
+    return [
+        b"\n".join(itertools.islice(lines, len(data))) + b"\n" for data in bulk_data
+    ]
+
+
+# filter_path of the lean bulk requests, only what's needed to report errors
+_LEAN_FILTER_PATH = "errors,items.*.error,items.*.status,items.*._id"
+
+# streamed chunks are sent in pieces of at least this many bytes
+_STREAM_BUFFER_SIZE = 64 * 1024
+
+
+class _StreamedChunk(object):
+    """
+    Chunk of actions serialized while it's being sent instead of up front,
+    iterating over it pulls actions from the shared ``actions`` iterator until
+    the chunk is full and yields them serialized. ``bulk_data`` is filled in
+    along the way, an action not fitting anymore is left in ``pending`` for
+    the next chunk. Iterating again (to retry the request) serializes the
+    actions already in ``bulk_data`` once more before pulling new ones.
+    """
+
+    def __init__(self, actions, first, chunk_size, max_chunk_bytes, serializer):
+        self.actions = actions
+        self.pending = first
+        self.chunk_size = chunk_size
+        self.max_chunk_bytes = max_chunk_bytes
+        self.serializer = serializer
+
+        self.size = 0
+        self.bulk_data = []
+
+    def _encode(self, action, data):
+        line = to_bytes(self.serializer.dumps(action), "utf-8") + b"\n"
+        if data is not None:
+            line += to_bytes(self.serializer.dumps(data), "utf-8") + b"\n"
+        return line
+
+    def _replay(self):
+        self.size = 0
+        for data in self.bulk_data:
+            line = self._encode(data[0], data[1] if len(data) > 1 else None)
+            self.size += len(line)
+            yield line
+
+    def _full(self):
+        return len(self.bulk_data) >= _current_chunk_size(self.chunk_size)
+
+    def _accept(self, action, data):
+        """
+        Add an action to the chunk and return its serialized lines or, when
+        it would make the chunk too big, keep it pending and return ``None``.
+        """
+        line = self._encode(action, data)
+        if self.bulk_data and self.size + len(line) > self.max_chunk_bytes:
+            self.pending = (action, data)
+            return None
+
+        self.size += len(line)
+        self.bulk_data.append((action, data) if data is not None else (action,))
+        return line
+
+    def _next_action(self):
+        if self.pending is not None:
+            action, self.pending = self.pending, None
+            return action
+        return next(self.actions, None)
+
+    def __iter__(self):
+        buffer = bytearray()
+        for line in self._replay():
+            buffer += line
+            if len(buffer) >= _STREAM_BUFFER_SIZE:
+                yield bytes(buffer)
+                buffer = bytearray()
+
+        while not self._full():
+            action = self._next_action()
+            if action is None or action is _FLUSH:
+                break
+            line = self._accept(*action)
+            if line is None:
+                break
+            buffer += line
+            if len(buffer) >= _STREAM_BUFFER_SIZE:
+                yield bytes(buffer)
+                buffer = bytearray()
+
+        if buffer:
+            yield bytes(buffer)
+
+
+def _stream_chunks(actions, chunk_size, max_chunk_bytes, serializer):
+    """
+    Split actions into chunks by number or size like ``_chunk_actions`` but
+    yield ``_StreamedChunk`` instances serializing the actions as they're
+    being sent. A chunk has to be sent before the next one is started.
+    """
+    actions = iter(actions)
+    pending = None
+    while True:
+        while pending is None or pending is _FLUSH:
+            pending = next(actions, None)
+            if pending is None:
+                return
+        chunk = _StreamedChunk(
+            actions, pending, chunk_size, max_chunk_bytes, serializer
+        )
+        yield chunk
+        pending = chunk.pending
+
+
+class _RetryScheduler(object):
+    """
+    Delay queue for the actions rejected with a ``429``. Instead of sleeping
+    on a rejected chunk the bulk helpers schedule its rejected actions here
+    and keep sending the following chunks, ``merge`` puts them back among the
+    actions being chunked once their backoff has expired.
+
+    ``merge`` hands out every action in order and remembers how many times it
+    was already retried, the helpers have to collect these with ``taken``
+    for every chunk they process, in the same order, and call ``done`` when
+    they're finished with it.
+    """
+
+    def __init__(self, max_retries, initial_backoff, max_backoff):
+        self.max_retries = max_retries
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+
+        self._cond = threading.Condition()
+        # heap of (due time, sequence number, attempts, bulk data, lines)
+        self._queue = []
+        self._sequence = itertools.count()
+        # attempts of the actions handed out and not yet taken
+        self._attempts = deque()
+        self._in_flight = 0
+        self._closed = False
+
+    def _hand_out(self, attempts):
+        self._attempts.append(attempts)
+        with self._cond:
+            self._in_flight += 1
+
+    def _pop_due(self):
+        """
+        Remove the retries that are due and return them as ``(attempts,
+        data, line)``.
+        """
+        now = time.time()
+        with self._cond:
+            due = []
+            while self._queue and self._queue[0][0] <= now:
+                due.append(heapq.heappop(self._queue)[2:])
+        return due
+
+    def _due(self):
+        for attempts, data, line in self._pop_due():
+            self._hand_out(attempts)
+            if line is not None:
+                yield _Serialized(data, line)
+            else:
+                yield data[0], data[1] if len(data) > 1 else None
+
+    def _next_delay(self):
+        """
+        Seconds until the next retry is due, ``None`` when none is scheduled.
+        """
+        with self._cond:
+            if not self._queue:
+                return None
+            return max(0, self._queue[0][0] - time.time())
+
+    def _wait(self):
+        """
+        Block until a retry is due and return ``True``, or return ``False``
+        when there won't be any since no action is in flight anymore.
+        """
+        with self._cond:
+            while not self._closed:
+                delay = self._next_delay()
+                if delay is None and not self._in_flight:
+                    break
+                if delay == 0:
+                    return True
+                self._cond.wait(delay)
+        return False
+
+    def merge(self, actions):
+        """
+        Yield the expanded ``actions`` with the retries that are due merged
+        in. Once ``actions`` is exhausted ``_FLUSH`` is yielded and the
+        retries are waited for as long as there are actions in flight.
+        """
+        for action in actions:
+            for retry in self._due():
+                yield retry
+            self._hand_out(0)
+            yield action
+
+        while True:
+            yield _FLUSH
+            if not self._wait():
+                return
+            for retry in self._due():
+                yield retry
+
+    def taken(self, bulk_data):
+        """
+        Return how many times each action of ``bulk_data`` was retried.
+        """
+        return [self._attempts.popleft() for _ in bulk_data]
+
+    def schedule(self, data, attempts, line=None):
+        """
+        Schedule an action for another attempt, return ``False`` when it has
+        no retries left. ``line`` are its serialized lines to send again, if
+        they were kept.
+        """
+        if attempts >= self.max_retries:
+            return False
+        attempts += 1
+        backoff = min(self.max_backoff, self.initial_backoff * 2 ** (attempts - 1))
+        with self._cond:
+            heapq.heappush(
+                self._queue,
+                (time.time() + backoff, next(self._sequence), attempts, data, line),
+            )
+            self._cond.notify_all()
+        return True
+
+    def done(self, count):
+        with self._cond:
+            self._in_flight -= count
+            self._cond.notify_all()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+def _describe_failure(item, data):
+    """
+    Add the metadata of the action and the original document to the response
+    ``item`` of a failed action, like for the actions of a failed request.
+    """
+    if isinstance(data[0], Mapping):
+        for key, value in next(iter(data[0].values())).items():
+            item.setdefault(key, value)
+    if len(data) > 1:
+        item["data"] = data[1]
+
+
+def _process_bulk_chunk_success(
+    resp, bulk_data, ignore_status, raise_on_error=True, yield_ok=True, with_data=False
+):
+    # nothing failed, no need to go through the items if they aren't wanted
+    if not yield_ok and resp.get("errors") is False:
+        return
+
     # if raise on error is set, we need to collect errors per chunk before raising them
     errors = []
 
@@ -172,6 +533,8 @@ def _process_bulk_chunk_success(resp, bulk_data, ignore_status, raise_on_error=T
         status_code = item.get("status", 500)
 
         ok = 200 <= status_code < 300
+        if not ok and with_data:
+            _describe_failure(item, data)
         if not ok and raise_on_error and status_code not in ignore_status:
             # include original document source
             if len(data) > 1:
@@ -217,6 +580,17 @@ def _process_bulk_chunk_error(
             yield False, err
 
 
+def _bulk_chunk_body(bulk_actions):
+    """
+    Return the body of a bulk request, ``bulk_actions`` being either the
+    ``bytes`` produced by the chunker, a ``ChunkedBody`` streaming a chunk or
+    a list of serialized lines.
+    """
+    if isinstance(bulk_actions, (bytes, bytearray, ChunkedBody)):
+        return bulk_actions
+    return "\n".join(bulk_actions) + "\n"
+
+
 def _process_bulk_chunk(
     client,
     bulk_actions,
@@ -228,16 +602,20 @@ def _process_bulk_chunk(
     **kwargs
 ):
     """
-    Send a bulk request to elasticsearch and process the output.
+    Send a bulk request to elasticsearch and process the output. Successful
+    items may be left out when ``yield_ok=False`` is passed in ``kwargs``,
+    failed ones include their action and document with ``with_data=True``.
     """
     kwargs = _add_helper_meta_to_kwargs(kwargs, "bp")
+    yield_ok = kwargs.pop("yield_ok", True)
+    with_data = kwargs.pop("with_data", False)
 
     if not isinstance(ignore_status, (list, tuple)):
         ignore_status = (ignore_status,)
 
     try:
         # send the actual request
-        resp = client.bulk("\n".join(bulk_actions) + "\n", *args, **kwargs)
+        resp = client.bulk(_bulk_chunk_body(bulk_actions), *args, **kwargs)
     except TransportError as e:
         gen = _process_bulk_chunk_error(
             error=e,
@@ -252,6 +630,8 @@ def _process_bulk_chunk(
             bulk_data=bulk_data,
             ignore_status=ignore_status,
             raise_on_error=raise_on_error,
+            yield_ok=yield_ok,
+            with_data=with_data,
         )
     for item in gen:
         yield item
@@ -277,6 +657,10 @@ def streaming_bulk(
     max_backoff=600,
     yield_ok=True,
     ignore_status=(),
+    stream_body=False,
+    lean=False,
+    coalesce=None,
+    error_sink=None,
     *args,
     **kwargs
 ):
@@ -289,14 +673,19 @@ def streaming_bulk(
     entire input is consumed and sent.
 
     If you specify ``max_retries`` it will also retry any documents that were
-    rejected with a ``429`` status code. To do this it will wait (**by calling
-    time.sleep which will block**) for ``initial_backoff`` seconds and then,
-    every subsequent rejection for the same chunk, for double the time every
-    time up to ``max_backoff`` seconds.
+    rejected with a ``429`` status code. Rejected documents are put aside for
+    ``initial_backoff`` seconds and then, every subsequent rejection for the
+    same document, for double the time every time up to ``max_backoff``
+    seconds, while the following chunks keep being sent. Once their backoff
+    has expired they're sent again as part of the next chunk. Only when there
+    are no other documents left to send it will block waiting for the
+    retries.
 
     :arg client: instance of :class:`~elasticsearch.Elasticsearch` to use
     :arg actions: iterable containing the actions to be executed
-    :arg chunk_size: number of docs in one chunk sent to es (default: 500)
+    :arg chunk_size: number of docs in one chunk sent to es (default: 500), or
+        an :class:`~elasticsearch.helpers.AdaptiveChunkSize` adjusting it to
+        the load of the cluster
     :arg max_chunk_bytes: the maximum size of the request in bytes (default: 100MB)
     :arg raise_on_error: raise ``BulkIndexError`` containing errors (as `.errors`)
         from the execution of the last chunk when some occur. By default we raise.
@@ -313,62 +702,125 @@ def streaming_bulk(
     :arg max_backoff: maximum number of seconds a retry will wait
     :arg yield_ok: if set to False will skip successful documents in the output
     :arg ignore_status: list of HTTP status code that you want to ignore
+    :arg stream_body: serialize the actions of a chunk while it's being sent
+        with chunked transfer encoding instead of up front, so that memory
+        use doesn't grow with ``max_chunk_bytes``
+    :arg lean: only have elasticsearch return the ``status``, ``_id`` and
+        ``error`` of the items, together with ``yield_ok=False`` the items of
+        the responses without errors aren't even looked at
+    :arg coalesce: an :class:`~elasticsearch.helpers.ActionCoalescer`
+        collapsing the repeated actions on the same document before they're
+        sent
+    :arg error_sink: callable every failed item which isn't raised is passed
+        to, including the metadata of its action and the original document
+        as ``data``, for example an :class:`~elasticsearch.helpers.ErrorSample`
+        or a :class:`~elasticsearch.helpers.DeadLetterFile`
     """
     actions = map(expand_action_callback, actions)
+    if coalesce is not None:
+        actions = coalesce.coalesce(actions)
+    if lean:
+        kwargs.setdefault("filter_path", _LEAN_FILTER_PATH)
+    retries = None
+    if max_retries:
+        retries = _RetryScheduler(max_retries, initial_backoff, max_backoff)
+        actions = retries.merge(actions)
+
+    if stream_body:
+        chunks = (
+            (chunk.bulk_data, ChunkedBody(chunk))
+            for chunk in _stream_chunks(
+                actions, chunk_size, max_chunk_bytes, client.transport.serializer
+            )
+        )
+    else:
+        chunks = _chunk_actions(
+            actions,
+            chunk_size,
+            max_chunk_bytes,
+            client.transport.serializer,
+            keep_source=error_sink is not None
+            or _needs_source(raise_on_error, raise_on_exception, ignore_status),
+        )
 
-    for bulk_data, bulk_actions in _chunk_actions(
-        actions, chunk_size, max_chunk_bytes, client.transport.serializer
-    ):
+    for bulk_data, bulk_actions in chunks:
+        results = _process_bulk_chunk(
+            client,
+            bulk_actions,
+            bulk_data,
+            raise_on_exception,
+            raise_on_error,
+            ignore_status,
+            yield_ok=yield_ok,
+            with_data=error_sink is not None,
+            *args,
+            **kwargs
+        )
+        if isinstance(chunk_size, AdaptiveChunkSize):
+            results = chunk_size.track(results)
+        if retries is not None:
+            results = _retry_rejected(retries, results, bulk_data, bulk_actions)
 
-        for attempt in range(max_retries + 1):
-            to_retry, to_retry_data = [], []
-            if attempt:
-                time.sleep(min(max_backoff, initial_backoff * 2 ** (attempt - 1)))
+        for ok, info in results:
+            if not ok and error_sink is not None:
+                error_sink(info)
+            if ok and not yield_ok:
+                continue
+            yield ok, info
 
-            try:
-                for data, (ok, info) in zip(
-                    bulk_data,
-                    _process_bulk_chunk(
-                        client,
-                        bulk_actions,
-                        bulk_data,
-                        raise_on_exception,
-                        raise_on_error,
-                        ignore_status,
-                        *args,
-                        **kwargs
-                    ),
-                ):
-
-                    if not ok:
-                        action, info = info.popitem()
-                        # retry if retries enabled, we get 429, and we are not
-                        # in the last attempt
-                        if (
-                            max_retries
-                            and info["status"] == 429
-                            and (attempt + 1) <= max_retries
-                        ):
-                            # _process_bulk_chunk expects strings so we need to
-                            # re-serialize the data
-                            to_retry.extend(
-                                map(client.transport.serializer.dumps, data)
-                            )
-                            to_retry_data.append(data)
-                        else:
-                            yield ok, {action: info}
-                    elif yield_ok:
-                        yield ok, info
-
-            except TransportError as e:
-                # suppress 429 errors since we will retry them
-                if attempt == max_retries or e.status_code != 429:
-                    raise
-            else:
-                if not to_retry:
-                    break
-                # retry only subset of documents that didn't succeed
-                bulk_actions, bulk_data = to_retry, to_retry_data
+
+def _needs_source(raise_on_error, raise_on_exception, ignore_status):
+    """
+    Whether the source of the documents has to be kept for the errors, it's
+    only reported with the errors raised or with the failed requests.
+    """
+    return raise_on_error or not raise_on_exception or bool(ignore_status)
+
+
+def _retry_rejected(retries, results, bulk_data, bulk_actions, error=None):
+    """
+    Yield the results of a chunk, scheduling the actions rejected with a
+    ``429`` for a retry as long as they have retries left. ``error`` is the
+    ``TransportError`` the request failed with, if it was already caught.
+
+    The lines of the rejected actions are reused as they were sent instead of
+    serializing the actions again.
+    """
+    attempts = lines = None
+    try:
+        if error is not None:
+            raise error
+
+        # bulk_data of a streamed chunk is only filled in once the request is
+        # sent, it has to come second
+        for i, ((ok, info), data) in enumerate(zip(results, bulk_data)):
+            if attempts is None:
+                attempts = retries.taken(bulk_data)
+
+            if not ok:
+                action, info = info.popitem()
+                if info["status"] == 429:
+                    if lines is None:
+                        lines = _split_actions(bulk_data, bulk_actions)
+                    if retries.schedule(data, attempts[i], lines[i]):
+                        continue
+                info = {action: info}
+            yield ok, info
+
+    except TransportError as e:
+        if attempts is None:
+            attempts = retries.taken(bulk_data)
+        # retry the whole chunk when the request itself was rejected
+        if e.status_code != 429 or max(attempts) >= retries.max_retries:
+            raise
+        lines = _split_actions(bulk_data, bulk_actions)
+        for data, attempt, line in zip(bulk_data, attempts, lines):
+            retries.schedule(data, attempt, line)
+
+    finally:
+        if attempts is None:
+            attempts = retries.taken(bulk_data)
+        retries.done(len(attempts))
 
 
 def bulk(client, actions, stats_only=False, ignore_status=(), *args, **kwargs):
@@ -385,8 +837,11 @@ def bulk(client, actions, stats_only=False, ignore_status=(), *args, **kwargs):
     When errors are being collected original document data is included in the
     error dictionary which can lead to an extra high memory usage. If you need
     to process a lot of data and want to ignore/collect errors please consider
-    using the :func:`~elasticsearch.helpers.streaming_bulk` helper which will
-    just return the errors and not store them in memory.
+    passing an ``error_sink`` (see
+    :func:`~elasticsearch.helpers.streaming_bulk`) the errors are handed to
+    instead, the number of errors is returned then, or using the
+    :func:`~elasticsearch.helpers.streaming_bulk` helper which will just
+    return the errors and not store them in memory.
 
 
     :arg client: instance of :class:`~elasticsearch.Elasticsearch` to use
@@ -402,23 +857,186 @@ def bulk(client, actions, stats_only=False, ignore_status=(), *args, **kwargs):
     """
     success, failed = 0, 0
 
-    # list of errors to be collected is not stats_only
+    # list of errors to be collected is not stats_only nor handed to a sink
     errors = []
+    collect = not stats_only and kwargs.get("error_sink") is None
+
+    # successful results of a lean bulk aren't yielded, they are all the
+    # actions not reported as failed
+    lean = kwargs.get("lean", False)
+    total = [0]
+
+    def count(actions):
+        for action in actions:
+            total[0] += 1
+            yield action
+
+    if lean:
+        actions = count(actions)
 
     # make streaming_bulk yield successful results so we can count them
-    kwargs["yield_ok"] = True
+    kwargs["yield_ok"] = not lean
     for ok, item in streaming_bulk(
         client, actions, ignore_status=ignore_status, *args, **kwargs
     ):
         # go through request-response pairs and detect failures
         if not ok:
-            if not stats_only:
+            if collect:
                 errors.append(item)
             failed += 1
         else:
             success += 1
 
-    return success, failed if stats_only else errors
+    if lean:
+        success = total[0] - failed
+    return success, errors if collect else failed
+
+
+def _lane_key(action):
+    """
+    The ``_id`` of the document an expanded or serialized action applies to,
+    or its routing, ``None`` when it has neither.
+    """
+    data = action.data if isinstance(action, _Serialized) else action
+    # raw json action lines of string actions aren't looked into
+    if not isinstance(data[0], Mapping):
+        return None
+    params = next(iter(data[0].values()))
+    for key in ("_id", "routing", "_routing"):
+        if params.get(key) is not None:
+            return str(params[key])
+    return None
+
+
+class _BulkLane(object):
+    """
+    Actions of ``parallel_bulk(ordered=True)`` hashed onto the same lane, they
+    are chunked and ``send`` one chunk after the other from the lane's own
+    thread so that the actions on a document are applied in order. The
+    results of every chunk are put into ``results``, followed by ``None``
+    once the lane is closed. A lane stops sending after a failed chunk.
+    """
+
+    def __init__(self, name, send, results, chunker, queue_size):
+        self.send = send
+        self.results = results
+        self.chunker = chunker
+        self.chunks = Queue(queue_size)
+        self.failed = False
+
+        self.thread = threading.Thread(target=self._work, name=name)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def feed(self, action):
+        if isinstance(action, _Serialized):
+            ret = self.chunker.feed_serialized(*action)
+        else:
+            ret = self.chunker.feed(*action)
+        if ret:
+            self.chunks.put(ret)
+
+    def close(self, flush=True):
+        ret = self.chunker.flush()
+        if ret and flush:
+            self.chunks.put(ret)
+        self.chunks.put(None)
+        self.thread.join()
+
+    def _work(self):
+        while True:
+            chunk = self.chunks.get()
+            if chunk is None:
+                self.results.put(None)
+                return
+            if self.failed:
+                continue
+            try:
+                self.results.put((self.send(*chunk), None))
+            except Exception as e:
+                self.failed = True
+                self.results.put(([], e))
+
+
+def _bulk_in_lanes(actions, lanes):
+    """
+    Feed the actions to the ``lanes`` they hash to, the ones without an
+    ``_id`` or routing are spread over all of them, and yield the results of
+    the chunks as they come.
+    """
+    results = lanes[0].results
+    spread = itertools.cycle(lanes)
+
+    def collect(chunk_results, error):
+        if error is not None:
+            raise error
+        return chunk_results
+
+    closed = False
+    try:
+        for action in actions:
+            key = _lane_key(action)
+            lane = next(spread) if key is None else lanes[hash(key) % len(lanes)]
+            lane.feed(action)
+            while not results.empty():
+                for item in collect(*results.get()):
+                    yield item
+
+        closed = True
+        for lane in lanes:
+            lane.close()
+        finished = 0
+        while finished < len(lanes):
+            chunk = results.get()
+            if chunk is None:
+                finished += 1
+                continue
+            for item in collect(*chunk):
+                yield item
+
+    finally:
+        if not closed:
+            for lane in lanes:
+                lane.failed = True
+                lane.close(flush=False)
+
+
+def _send_in_order(send, bulk_data, bulk_actions, max_retries, backoff):
+    """
+    Send a chunk with ``send(bulk_data, bulk_actions)`` and return its
+    results, retrying the actions rejected with a ``429`` after their backoff
+    before returning so that no later chunk can overtake them.
+    """
+    results = [None] * len(bulk_data)
+    pending = list(range(len(bulk_data)))
+    lines = None
+    attempt = 0
+    while True:
+        rejected = []
+        try:
+            chunk_results = send([bulk_data[i] for i in pending], bulk_actions)
+        except TransportError as e:
+            if e.status_code != 429 or attempt >= max_retries:
+                raise
+            rejected = pending
+        else:
+            for i, (ok, info) in zip(pending, chunk_results):
+                if not ok and attempt < max_retries:
+                    if next(iter(info.values())).get("status") == 429:
+                        rejected.append(i)
+                        continue
+                results[i] = ok, info
+
+        if not rejected:
+            # results are left out of error-free responses with yield_ok=False
+            return [r for r in results if r is not None]
+
+        attempt += 1
+        time.sleep(backoff(attempt))
+        if lines is None:
+            lines = _split_actions(bulk_data, bulk_actions)
+        pending = rejected
+        bulk_actions = b"".join(lines[i] for i in pending)
 
 
 def parallel_bulk(
@@ -430,16 +1048,37 @@ def parallel_bulk(
     queue_size=4,
     expand_action_callback=expand_action,
     ignore_status=(),
+    max_retries=0,
+    initial_backoff=2,
+    max_backoff=600,
+    lean=False,
+    process_count=0,
+    ordered=False,
+    coalesce=None,
     *args,
     **kwargs
 ):
     """
     Parallel version of the bulk helper run in multiple threads at once.
 
+    Documents rejected with a ``429`` status code are retried like in
+    :func:`~elasticsearch.helpers.streaming_bulk`, as part of the chunks sent
+    once their backoff has expired, so that the threads never sleep on them.
+
+    The chunks are sent in no particular order, two actions on the same
+    document may be applied in a different order than they were passed in.
+    With ``ordered=True`` every action is assigned to one of ``thread_count``
+    lanes by hashing its ``_id`` (or routing), each lane sending its own
+    chunks one after the other. The actions on a document are then applied in
+    order while the lanes run in parallel, its rejected actions are retried by
+    a lane before sending its next chunk.
+
     :arg client: instance of :class:`~elasticsearch.Elasticsearch` to use
     :arg actions: iterator containing the actions
     :arg thread_count: size of the threadpool to use for the bulk requests
-    :arg chunk_size: number of docs in one chunk sent to es (default: 500)
+    :arg chunk_size: number of docs in one chunk sent to es (default: 500), or
+        an :class:`~elasticsearch.helpers.AdaptiveChunkSize` adjusting it to
+        the load of the cluster
     :arg max_chunk_bytes: the maximum size of the request in bytes (default: 100MB)
     :arg raise_on_error: raise ``BulkIndexError`` containing errors (as `.errors`)
         from the execution of the last chunk when some occur. By default we raise.
@@ -451,12 +1090,103 @@ def parallel_bulk(
     :arg queue_size: size of the task queue between the main thread (producing
         chunks to send) and the processing threads.
     :arg ignore_status: list of HTTP status code that you want to ignore
+    :arg max_retries: maximum number of times a document will be retried when
+        ``429`` is received, set to 0 (default) for no retries on ``429``
+    :arg initial_backoff: number of seconds we should wait before the first
+        retry. Any subsequent retries will be powers of ``initial_backoff *
+        2**retry_number``
+    :arg max_backoff: maximum number of seconds a retry will wait
+    :arg yield_ok: if set to False will skip successful documents in the output
+    :arg lean: only have elasticsearch return the ``status``, ``_id`` and
+        ``error`` of the items, together with ``yield_ok=False`` the items of
+        the responses without errors aren't even looked at
+    :arg process_count: number of processes expanding and serializing the
+        actions, by default it's done by the thread consuming the actions.
+        ``expand_action_callback`` and the serializer of the client have to
+        be picklable
+    :arg ordered: apply the actions on the same document in order, see above
+    :arg coalesce: an :class:`~elasticsearch.helpers.ActionCoalescer`
+        collapsing the repeated actions on the same document before they're
+        sent, can't be combined with ``process_count``
+    """
+    keep_source = _needs_source(
+        kwargs.get("raise_on_error", True),
+        kwargs.get("raise_on_exception", True),
+        ignore_status,
+    )
+    if process_count and coalesce is not None:
+        raise ValueError("'coalesce' can't be used with 'process_count'.")
+    if process_count:
+        actions = _serialize_in_processes(
+            actions,
+            process_count,
+            _current_chunk_size(chunk_size),
+            queue_size,
+            functools.partial(
+                _serialize_actions,
+                expand_action_callback=expand_action_callback,
+                serializer=client.transport.serializer,
+                keep_source=keep_source,
+            ),
+        )
+    else:
+        actions = map(expand_action_callback, actions)
+    if coalesce is not None:
+        actions = coalesce.coalesce(actions)
+
+    for item in _parallel_bulk(
+        client,
+        actions,
+        thread_count,
+        chunk_size,
+        max_chunk_bytes,
+        queue_size,
+        keep_source,
+        ignore_status,
+        max_retries,
+        initial_backoff,
+        max_backoff,
+        lean,
+        ordered,
+        *args,
+        **kwargs
+    ):
+        yield item
+
+
+def _parallel_bulk(
+    client,
+    actions,
+    thread_count,
+    chunk_size,
+    max_chunk_bytes,
+    queue_size,
+    keep_source,
+    ignore_status,
+    max_retries,
+    initial_backoff,
+    max_backoff,
+    lean,
+    ordered,
+    *args,
+    **kwargs
+):
+    """
+    Send the expanded, or ``_Serialized``, actions of ``parallel_bulk`` from
+    ``thread_count`` threads and yield their results.
     """
     # Avoid importing multiprocessing unless parallel_bulk is used
     # to avoid exceptions on restricted environments like App Engine
     from multiprocessing.pool import ThreadPool
 
-    actions = map(expand_action_callback, actions)
+    if lean:
+        kwargs.setdefault("filter_path", _LEAN_FILTER_PATH)
+    # only the responses without errors leave out the successful results
+    yield_ok = kwargs.get("yield_ok", True)
+    retries = None
+    if max_retries and not ordered:
+        retries = _RetryScheduler(max_retries, initial_backoff, max_backoff)
+        actions = retries.merge(actions)
 
     class BlockingPool(ThreadPool):
         def _setup_queues(self):
@@ -466,28 +1196,95 @@ def parallel_bulk(
             self._inqueue = Queue(max(queue_size, thread_count))
             self._quick_put = self._inqueue.put
 
+    def process_chunk(bulk_chunk):
+        results = _process_bulk_chunk(
+            client,
+            bulk_chunk[1],
+            bulk_chunk[0],
+            ignore_status=ignore_status,
+            *args,
+            **kwargs
+        )
+        if isinstance(chunk_size, AdaptiveChunkSize):
+            results = chunk_size.track(results)
+        try:
+            return bulk_chunk, list(results), None
+        except TransportError as e:
+            # a rejected request is retried from the main thread
+            if retries is None:
+                raise
+            return bulk_chunk, [], e
+
+    if ordered:
+
+        def send(bulk_data, bulk_actions):
+            results = _process_bulk_chunk(
+                client,
+                bulk_actions,
+                bulk_data,
+                ignore_status=ignore_status,
+                *args,
+                **kwargs
+            )
+            if isinstance(chunk_size, AdaptiveChunkSize):
+                results = chunk_size.track(results)
+            return list(results)
+
+        send_in_order = functools.partial(
+            _send_in_order,
+            send,
+            max_retries=max_retries,
+            backoff=lambda attempt: min(
+                max_backoff, initial_backoff * 2 ** (attempt - 1)
+            ),
+        )
+        results = Queue()
+        lanes = [
+            _BulkLane(
+                "parallel_bulk-lane-%d" % i,
+                send_in_order,
+                results,
+                _ActionChunker(
+                    chunk_size,
+                    max_chunk_bytes,
+                    client.transport.serializer,
+                    keep_source=keep_source,
+                ),
+                queue_size,
+            )
+            for i in range(thread_count)
+        ]
+        for ok, info in _bulk_in_lanes(actions, lanes):
+            if ok and not yield_ok:
+                continue
+            yield ok, info
+        return
+
     pool = BlockingPool(thread_count)
 
     try:
-        for result in pool.imap(
-            lambda bulk_chunk: list(
-                _process_bulk_chunk(
-                    client,
-                    bulk_chunk[1],
-                    bulk_chunk[0],
-                    ignore_status=ignore_status,
-                    *args,
-                    **kwargs
-                )
-            ),
+        for (bulk_data, bulk_actions), results, error in pool.imap(
+            process_chunk,
             _chunk_actions(
-                actions, chunk_size, max_chunk_bytes, client.transport.serializer
+                actions,
+                chunk_size,
+                max_chunk_bytes,
+                client.transport.serializer,
+                keep_source=keep_source,
             ),
         ):
-            for item in result:
-                yield item
+            if retries is not None:
+                results = _retry_rejected(
+                    retries, results, bulk_data, bulk_actions, error
+                )
+            for ok, info in results:
+                if ok and not yield_ok:
+                    continue
+                yield ok, info
 
     finally:
+        if retries is not None:
+            retries.close()
         pool.close()
         pool.join()
 
@@ -502,6 +1299,11 @@ def scan(
     request_timeout=None,
     clear_scroll=True,
     scroll_kwargs=None,
+    as_frames=False,
+    frame_columns=None,
+    frame_mapping=None,
+    hit_class=None,
+    prefetch=0,
     **kwargs
 ):
     """
@@ -532,6 +1334,19 @@ def scan(
         to true.
     :arg scroll_kwargs: additional kwargs to be passed to
         :meth:`~elasticsearch.Elasticsearch.scroll`
+    :arg as_frames: instead of individual hits yield one
+        :class:`pandas.DataFrame` per scroll page, built by
+        :func:`~elasticsearch.helpers.hits_to_dataframe`
+    :arg frame_columns: columns to extract when ``as_frames`` is set, see
+        :func:`~elasticsearch.helpers.hits_to_columns`
+    :arg frame_mapping: mapping used to type the columns when ``as_frames``
+        is set
+    :arg hit_class: optional callable wrapping every hit before it's
+        yielded, use :class:`~elasticsearch.helpers.CompactHit` to keep large
+        result sets in memory
+    :arg prefetch: number of pages fetched ahead from a background thread
+        while the hits of the current page are being consumed, set to 0
+        (default) to only fetch a page once the previous one was consumed
 
     Any additional keyword arguments will be passed to the initial
     :meth:`~elasticsearch.Elasticsearch.search` call::
@@ -546,10 +1361,92 @@ def scan(
     scroll_kwargs = scroll_kwargs or {}
     _add_helper_meta_to_kwargs(scroll_kwargs, "s")
 
+    if as_frames:
+        _require_pandas()
+
     if not preserve_order:
         query = query.copy() if query else {}
         query["sort"] = "_doc"
 
+    pages = _scroll_pages(
+        client,
+        query,
+        scroll,
+        raise_on_error,
+        size,
+        request_timeout,
+        clear_scroll,
+        scroll_kwargs,
+        **kwargs
+    )
+    if prefetch:
+        # the pages are scrolled from a thread of its own, like one slice of
+        # parallel_scan
+        scrolled = pages
+        pages = _pages_in_threads(lambda _: scrolled, deque([0]), 1, prefetch)
+    try:
+        for hits in pages:
+            if as_frames:
+                yield hits_to_dataframe(
+                    hits, columns=frame_columns, mapping=frame_mapping
+                )
+            else:
+                for hit in hits:
+                    yield hit if hit_class is None else hit_class(hit)
+    finally:
+        # clear the scroll right away when the iteration is abandoned
+        pages.close()
+
+
+def _check_shards(resp, search_id, raise_on_error, request="Scroll"):
+    """
+    Log a warning, or raise a ``ScanError`` with ``raise_on_error``, when
+    some shards failed to execute the search request ``resp`` answers.
+    """
+    # Default to 0 if the value isn't included in the response
+    shards_successful = resp["_shards"].get("successful", 0)
+    shards_skipped = resp["_shards"].get("skipped", 0)
+    shards_total = resp["_shards"].get("total", 0)
+
+    # check if we have any errors
+    if (shards_successful + shards_skipped) < shards_total:
+        shards_message = (
+            "%s request has only succeeded on %%d (+%%d skipped) shards out of %%d."
+            % request
+        )
+        logger.warning(
+            shards_message,
+            shards_successful,
+            shards_skipped,
+            shards_total,
+        )
+        if raise_on_error:
+            raise ScanError(
+                search_id,
+                shards_message
+                % (
+                    shards_successful,
+                    shards_skipped,
+                    shards_total,
+                ),
+            )
+
+
+def _scroll_pages(
+    client,
+    query,
+    scroll,
+    raise_on_error,
+    size,
+    request_timeout,
+    clear_scroll,
+    scroll_kwargs,
+    **kwargs
+):
+    """
+    Yield the hits of every page of a scroll, checking for shard failures
+    after every page and clearing the scroll once done, see ``scan``.
+    """
     # initial search
     resp = client.search(
         body=query, scroll=scroll, size=size, request_timeout=request_timeout, **kwargs
@@ -558,33 +1455,9 @@ def scan(
 
     try:
         while scroll_id and resp["hits"]["hits"]:
-            for hit in resp["hits"]["hits"]:
-                yield hit
-
-            # Default to 0 if the value isn't included in the response
-            shards_successful = resp["_shards"].get("successful", 0)
-            shards_skipped = resp["_shards"].get("skipped", 0)
-            shards_total = resp["_shards"].get("total", 0)
-
-            # check if we have any errors
-            if (shards_successful + shards_skipped) < shards_total:
-                shards_message = "Scroll request has only succeeded on %d (+%d skipped) shards out of %d."
-                logger.warning(
-                    shards_message,
-                    shards_successful,
-                    shards_skipped,
-                    shards_total,
-                )
-                if raise_on_error:
-                    raise ScanError(
-                        scroll_id,
-                        shards_message
-                        % (
-                            shards_successful,
-                            shards_skipped,
-                            shards_total,
-                        ),
-                    )
+            yield resp["hits"]["hits"]
+
+            _check_shards(resp, scroll_id, raise_on_error)
             resp = client.scroll(
                 body={"scroll_id": scroll_id, "scroll": scroll}, **scroll_kwargs
             )
@@ -599,6 +1472,177 @@ def scan(
             )
 
 
+def _scroll_slices(scroll_slice, slice_ids, results, stop):
+    """
+    Put the pages of hits of the slices taken from ``slice_ids`` into
+    ``results`` until there are none left or ``stop`` is set, followed by
+    ``None``. An exception is put as ``(None, error)`` and stops the slice.
+    """
+    try:
+        while not stop.is_set():
+            try:
+                slice_id = slice_ids.popleft()
+            except IndexError:
+                break
+            pages = scroll_slice(slice_id)
+            try:
+                for hits in pages:
+                    results.put((hits, None))
+                    if stop.is_set():
+                        break
+            finally:
+                pages.close()
+    except Exception as e:
+        results.put((None, e))
+    results.put(None)
+
+
+def _scan_in_threads(scroll_slice, slice_ids, thread_count, queue_size, hit_class):
+    """
+    Scroll the slices from ``thread_count`` threads and yield their hits as
+    they come, at most ``queue_size`` pages are buffered.
+    """
+    for hits in _pages_in_threads(scroll_slice, slice_ids, thread_count, queue_size):
+        for hit in hits:
+            yield hit if hit_class is None else hit_class(hit)
+
+
+def _pages_in_threads(scroll_slice, slice_ids, thread_count, queue_size):
+    """
+    Scroll the slices from ``thread_count`` threads and yield their pages of
+    hits as they come, at most ``queue_size`` pages are buffered.
+    """
+    results = Queue(queue_size)
+    stop = threading.Event()
+    threads = [
+        threading.Thread(
+            target=_scroll_slices,
+            args=(scroll_slice, slice_ids, results, stop),
+            name="parallel_scan-%d" % i,
+        )
+        for i in range(thread_count)
+    ]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+
+    finished = 0
+    try:
+        while finished < len(threads):
+            page = results.get()
+            if page is None:
+                finished += 1
+                continue
+            hits, error = page
+            if error is not None:
+                raise error
+            yield hits
+
+    finally:
+        # unblock the threads waiting for room in the queue so that they
+        # notice they should stop and clear their scroll
+        stop.set()
+        for thread in threads:
+            while thread.is_alive():
+                while not results.empty():
+                    results.get()
+                thread.join(0.01)
+
+
+def parallel_scan(
+    client,
+    query=None,
+    slices=4,
+    workers=None,
+    per_slice=False,
+    queue_size=4,
+    scroll="5m",
+    raise_on_error=True,
+    size=1000,
+    request_timeout=None,
+    clear_scroll=True,
+    scroll_kwargs=None,
+    hit_class=None,
+    **kwargs
+):
+    """
+    Parallel version of the scan helper, splitting the scroll into
+    ``slices`` independent slices (see `sliced scroll
+    <https://www.elastic.co/guide/en/elasticsearch/reference/current/paginate-search-results.html#slice-scroll>`_)
+    which are read from ``workers`` threads at the same time. The hits are
+    yielded in no particular order, a slice being scrolled only as fast as
+    they are consumed::
+
+        for hit in parallel_scan(es, index="orders-*", slices=8):
+            export(hit)
+
+    With ``per_slice`` a list of ``slices`` iterators is returned instead,
+    one per slice, to be consumed separately (for example from threads of
+    their own). Every slice is then scrolled by a thread of its own started
+    when its iterator is first used.
+
+    :arg client: instance of :class:`~elasticsearch.Elasticsearch` to use
+    :arg query: body for the :meth:`~elasticsearch.Elasticsearch.search` api
+    :arg slices: number of slices to split the scroll into (default: 4), a
+        multiple of the number of shards works best
+    :arg workers: number of threads scrolling the slices, one per slice by
+        default
+    :arg per_slice: return one iterator per slice instead of a single
+        iterator over all of them
+    :arg queue_size: number of pages of hits read ahead of the consumer
+        (default: 4), per slice with ``per_slice``
+    :arg scroll: Specify how long a consistent view of the index should be
+        maintained for scrolled search
+    :arg raise_on_error: raises an exception (``ScanError``) if an error is
+        encountered (some shards fail to execute). By default we raise.
+    :arg size: size (per shard) of the batch send at each iteration.
+    :arg request_timeout: explicit timeout for each call to ``scan``
+    :arg clear_scroll: explicitly calls delete on the scroll id of every
+        slice via the clear scroll API on completion or error, defaults to
+        true.
+    :arg scroll_kwargs: additional kwargs to be passed to
+        :meth:`~elasticsearch.Elasticsearch.scroll`
+    :arg hit_class: optional callable wrapping every hit before it's yielded
+
+    Any additional keyword arguments will be passed to the initial
+    :meth:`~elasticsearch.Elasticsearch.search` call of every slice.
+    """
+    scroll_kwargs = dict(scroll_kwargs or {})
+    _add_helper_meta_to_kwargs(scroll_kwargs, "s")
+    query = query.copy() if query else {}
+    query["sort"] = "_doc"
+
+    def scroll_slice(slice_id):
+        body = query
+        # a single slice is a plain scroll
+        if slices > 1:
+            body = dict(query, slice={"id": slice_id, "max": slices})
+        return _scroll_pages(
+            client,
+            body,
+            scroll,
+            raise_on_error,
+            size,
+            request_timeout,
+            clear_scroll,
+            scroll_kwargs,
+            **kwargs
+        )
+
+    if per_slice:
+        return [
+            _scan_in_threads(scroll_slice, deque([i]), 1, queue_size, hit_class)
+            for i in range(slices)
+        ]
+    return _scan_in_threads(
+        scroll_slice,
+        deque(range(slices)),
+        min(workers or slices, slices),
+        queue_size,
+        hit_class,
+    )
+
+
 def reindex(
     client,
     source_index,
@@ -32,14 +32,24 @@ from typing import (
 )
 
 from ..client import Elasticsearch
+from ..connection import ChunkedBody
 from ..serializer import Serializer
+from .adaptive import AdaptiveChunkSize
+from .coalesce import ActionCoalescer
 
 logger: logging.Logger
 
 def expand_action(data: Any) -> Tuple[Dict[str, Any], Optional[Any]]: ...
 def _chunk_actions(
-    actions: Any, chunk_size: int, max_chunk_bytes: int, serializer: Serializer
+    actions: Any,
+    chunk_size: int,
+    max_chunk_bytes: int,
+    serializer: Serializer,
+    keep_source: bool = ...,
 ) -> Generator[Any, None, None]: ...
+def _bulk_chunk_body(
+    bulk_actions: Union[bytes, ChunkedBody, List[str]],
+) -> Union[bytes, ChunkedBody, str]: ...
 def _process_bulk_chunk(
     client: Elasticsearch,
     bulk_actions: Any,
@@ -52,7 +62,7 @@ def _process_bulk_chunk(
 def streaming_bulk(
     client: Elasticsearch,
     actions: Union[Iterable[Any], AsyncIterable[Any]],
-    chunk_size: int = ...,
+    chunk_size: Union[int, AdaptiveChunkSize] = ...,
     max_chunk_bytes: int = ...,
     raise_on_error: bool = ...,
     expand_action_callback: Callable[[Any], Tuple[Dict[str, Any], Optional[Any]]] = ...,
@@ -62,6 +72,10 @@ def streaming_bulk(
     max_backoff: Union[float, int] = ...,
     yield_ok: bool = ...,
     ignore_status: Optional[Union[int, Collection[int]]] = ...,
+    stream_body: bool = ...,
+    lean: bool = ...,
+    coalesce: Optional[ActionCoalescer] = ...,
+    error_sink: Optional[Callable[[Dict[str, Any]], Any]] = ...,
     *args: Any,
     **kwargs: Any
 ) -> Generator[Tuple[bool, Any], None, None]: ...
@@ -77,11 +91,18 @@ def parallel_bulk(
     client: Elasticsearch,
     actions: Iterable[Any],
     thread_count: int = ...,
-    chunk_size: int = ...,
+    chunk_size: Union[int, AdaptiveChunkSize] = ...,
     max_chunk_bytes: int = ...,
     queue_size: int = ...,
     expand_action_callback: Callable[[Any], Tuple[Dict[str, Any], Optional[Any]]] = ...,
     ignore_status: Optional[Union[int, Collection[int]]] = ...,
+    max_retries: int = ...,
+    initial_backoff: Union[float, int] = ...,
+    max_backoff: Union[float, int] = ...,
+    lean: bool = ...,
+    process_count: int = ...,
+    ordered: bool = ...,
+    coalesce: Optional[ActionCoalescer] = ...,
     *args: Any,
     **kwargs: Any
 ) -> Generator[Tuple[bool, Any], None, None]: ...
@@ -95,8 +116,29 @@ def scan(
     request_timeout: Optional[Union[float, int]] = ...,
     clear_scroll: bool = ...,
     scroll_kwargs: Optional[Mapping[str, Any]] = ...,
+    as_frames: bool = ...,
+    frame_columns: Optional[Collection[str]] = ...,
+    frame_mapping: Optional[Mapping[str, Any]] = ...,
+    hit_class: Optional[Callable[[Any], Any]] = ...,
+    prefetch: int = ...,
     **kwargs: Any
 ) -> Generator[Any, None, None]: ...
+def parallel_scan(
+    client: Elasticsearch,
+    query: Optional[Any] = ...,
+    slices: int = ...,
+    workers: Optional[int] = ...,
+    per_slice: bool = ...,
+    queue_size: int = ...,
+    scroll: str = ...,
+    raise_on_error: bool = ...,
+    size: int = ...,
+    request_timeout: Optional[Union[float, int]] = ...,
+    clear_scroll: bool = ...,
+    scroll_kwargs: Optional[Mapping[str, Any]] = ...,
+    hit_class: Optional[Callable[[Any], Any]] = ...,
+    **kwargs: Any
+) -> Union[Generator[Any, None, None], List[Generator[Any, None, None]]]: ...
 def reindex(
     client: Elasticsearch,
     source_index: Union[str, Collection[str]],
@@ -0,0 +1,136 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import threading
+import time
+from collections import deque
+
+from ..exceptions import TransportError
+from .errors import BulkIndexError
+
+
+def _is_rejection(item):
+    """Whether a bulk response item was rejected by an overloaded node."""
+    for info in item.values():
+        error = info.get("error")
+        if info.get("status") == 429 or (
+            isinstance(error, dict)
+            and error.get("type") == "es_rejected_execution_exception"
+        ):
+            return True
+    return False
+
+
+class AdaptiveChunkSize(object):
+    """
+    Number of actions per bulk request adjusted to the load of the cluster,
+    to be passed as ``chunk_size`` to the bulk helpers. The size grows by
+    ``increase`` actions after every request answered within
+    ``target_latency`` and is multiplied by ``decrease`` as soon as a request
+    is slower than that or any of its actions gets rejected (``429``)::
+
+        chunk_size = AdaptiveChunkSize(initial=500, target_latency=2.0)
+        for ok, item in streaming_bulk(es, actions, chunk_size=chunk_size):
+            ...
+        print(chunk_size.size, chunk_size.history)
+
+    ``max_chunk_bytes`` still applies on top of the adaptive size.
+
+    :arg initial: number of actions of the first chunk (default: 500)
+    :arg min_size: the size never goes below this (default: 10)
+    :arg max_size: the size never goes above this (default: 10000)
+    :arg target_latency: number of seconds a bulk request should take at most
+        (default: 1)
+    :arg increase: number of actions added after a fast request (default: 50)
+    :arg decrease: factor applied after a slow or rejected request
+        (default: 0.5)
+    :arg history_size: number of adjustments kept in ``history`` (default: 100)
+    """
+
+    def __init__(
+        self,
+        initial=500,
+        min_size=10,
+        max_size=10000,
+        target_latency=1.0,
+        increase=50,
+        decrease=0.5,
+        history_size=100,
+    ):
+        if not 0 < decrease < 1:
+            raise ValueError("'decrease' must be between 0 and 1.")
+        if not 0 < min_size <= initial <= max_size:
+            raise ValueError("'initial' must be between 'min_size' and 'max_size'.")
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_latency = target_latency
+        self.increase = increase
+        self.decrease = decrease
+
+        self.size = initial
+        self.history = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+
+    def record(self, latency, rejected=False):
+        """
+        Adjust the size after a bulk request which took ``latency`` seconds
+        and had actions ``rejected`` or not.
+        """
+        with self._lock:
+            if rejected or latency > self.target_latency:
+                size = max(self.min_size, int(self.size * self.decrease))
+                reason = "rejected" if rejected else "latency"
+            else:
+                size = min(self.max_size, self.size + self.increase)
+                reason = "increase"
+
+            if size != self.size:
+                self.history.append((time.time(), self.size, size, reason))
+                self.size = size
+
+    def track(self, results):
+        """
+        Pass the ``(ok, item)`` results of a bulk request through, recording
+        its latency and whether actions were rejected once it's done.
+        """
+        start = time.time()
+        latency = None
+        rejected = False
+        try:
+            for ok, item in results:
+                if latency is None:
+                    latency = time.time() - start
+                if not ok and _is_rejection(item):
+                    rejected = True
+                yield ok, item
+        except TransportError as e:
+            rejected = e.status_code == 429
+            raise
+        except BulkIndexError as e:
+            rejected = rejected or any(map(_is_rejection, e.errors))
+            raise
+        finally:
+            if latency is None:
+                latency = time.time() - start
+            self.record(latency, rejected)
+
+
+def _current_chunk_size(chunk_size):
+    if isinstance(chunk_size, AdaptiveChunkSize):
+        return chunk_size.size
+    return chunk_size
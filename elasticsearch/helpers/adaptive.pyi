@@ -0,0 +1,54 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Generator,
+    Iterable,
+    Mapping,
+    Tuple,
+    Union,
+)
+
+def _is_rejection(item: Mapping[str, Mapping[str, Any]]) -> bool: ...
+
+class AdaptiveChunkSize(object):
+    min_size: int
+    max_size: int
+    target_latency: float
+    increase: int
+    decrease: float
+    size: int
+    history: Deque[Tuple[float, int, int, str]]
+    def __init__(
+        self,
+        initial: int = ...,
+        min_size: int = ...,
+        max_size: int = ...,
+        target_latency: float = ...,
+        increase: int = ...,
+        decrease: float = ...,
+        history_size: int = ...,
+    ) -> None: ...
+    def record(self, latency: float, rejected: bool = ...) -> None: ...
+    def track(
+        self, results: Iterable[Tuple[bool, Dict[str, Any]]]
+    ) -> Generator[Tuple[bool, Dict[str, Any]], None, None]: ...
+
+def _current_chunk_size(chunk_size: Union[int, AdaptiveChunkSize]) -> int: ...
@@ -0,0 +1,188 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import time
+from collections import OrderedDict
+
+from ..compat import Mapping
+
+# parameters of the actions relying on optimistic concurrency control, those
+# are never combined with other actions
+_CONDITIONAL_PARAMS = frozenset(
+    ("if_seq_no", "if_primary_term", "version", "version_type")
+)
+
+
+def _document_key(action):
+    """
+    ``(_index, _id, routing)`` of the document an action line applies to,
+    ``None`` when it has no ``_id``.
+    """
+    if not isinstance(action, Mapping) or len(action) != 1:
+        return None
+    params = next(iter(action.values()))
+    if params.get("_id") is None:
+        return None
+    return params.get("_index"), params["_id"], params.get("routing")
+
+
+def _partial_doc(data):
+    """
+    The body of an update action without the partial ``doc``, ``None`` if it
+    isn't a partial update (a script, an upsert...).
+    """
+    if not isinstance(data, Mapping) or not isinstance(data.get("doc"), Mapping):
+        return None
+    rest = dict(data)
+    del rest["doc"]
+    if set(rest) - {"doc_as_upsert"}:
+        return None
+    return rest
+
+
+def _merge_docs(doc, update):
+    """Merge a partial document into another, like elasticsearch does."""
+    merged = dict(doc)
+    for key, value in update.items():
+        if isinstance(value, Mapping) and isinstance(merged.get(key), Mapping):
+            value = _merge_docs(merged[key], value)
+        merged[key] = value
+    return merged
+
+
+def _combine(previous, action):
+    """
+    The expanded action doing what ``previous`` followed by ``action`` do to
+    the same document, ``None`` when they can't be combined.
+    """
+    ((previous_op, previous_params),) = previous[0].items()
+    ((op_type, params),) = action[0].items()
+    if _CONDITIONAL_PARAMS.intersection(set(previous_params) | set(params)):
+        return None
+
+    if op_type == "index":
+        return action
+    # a delete of a document created meanwhile would fail, not the create
+    if op_type == "delete" and previous_op != "create":
+        return action
+    if op_type == "update" and previous_op == "update" and previous_params == params:
+        previous_rest, rest = _partial_doc(previous[1]), _partial_doc(action[1])
+        if previous_rest is not None and previous_rest == rest:
+            rest["doc"] = _merge_docs(previous[1]["doc"], action[1]["doc"])
+            return action[0], rest
+    return None
+
+
+class ActionCoalescer(object):
+    """
+    Collapses the actions on the same document (same ``_index``, ``_id`` and
+    ``routing``) coming within a window of each other, to be passed as
+    ``coalesce`` to the bulk helpers::
+
+        coalescer = ActionCoalescer(max_actions=10000, max_delay=1.0)
+        for ok, item in streaming_bulk(es, changes, coalesce=coalescer):
+            ...
+        print(coalescer.saved)
+
+    The last action on up to ``max_actions`` documents is held back for at
+    most ``max_delay`` seconds after the first one came in. When another
+    action on the document comes in meanwhile:
+
+    * an ``index`` action replaces the pending one,
+    * a ``delete`` action replaces it as well, unless it's a ``create``,
+    * an ``update`` with a partial ``doc`` is merged into a pending update
+      with a partial ``doc``,
+
+    otherwise the pending action is sent and the new one held back instead.
+    Actions using optimistic concurrency control (``if_seq_no``,
+    ``version``...) aren't combined, actions without an ``_id`` are passed
+    through right away.
+
+    The bulk helpers yield one result per action sent, the result of a
+    collapsed action stands for the ones it replaced. The order of the
+    actions on a document is kept but actions on different documents may be
+    sent in a different order than they came in. The window is only checked
+    when actions come in, all the actions held back are sent once the input
+    is exhausted.
+
+    :arg max_actions: number of documents with an action held back
+        (default: 1000)
+    :arg max_delay: number of seconds an action is held back at most
+        (default: 1)
+    """
+
+    def __init__(self, max_actions=1000, max_delay=1.0):
+        self.max_actions = max_actions
+        self.max_delay = max_delay
+
+        #: number of actions received and sent
+        self.received = 0
+        self.sent = 0
+        # document key -> (time the first action came in, expanded action)
+        self._pending = OrderedDict()
+
+    @property
+    def saved(self):
+        """Number of actions collapsed into others, which weren't sent."""
+        return self.received - self.sent - len(self._pending)
+
+    def coalesce(self, actions):
+        """Yield the expanded ``actions`` with the repeated ones collapsed."""
+        for action in actions:
+            for ready in self._feed(action):
+                yield ready
+        for ready in self._drain():
+            yield ready
+
+    def _feed(self, action):
+        """Add an expanded action, return the actions to send now."""
+        self.received += 1
+        now = time.time()
+        ready = []
+        while self._pending:
+            key, (since, pending) = next(iter(self._pending.items()))
+            if since > now - self.max_delay:
+                break
+            del self._pending[key]
+            ready.append(pending)
+
+        key = _document_key(action[0])
+        if key is None:
+            ready.append(action)
+        elif key not in self._pending:
+            self._pending[key] = now, action
+            if len(self._pending) > self.max_actions:
+                ready.append(self._pending.popitem(last=False)[1][1])
+        else:
+            since, pending = self._pending[key]
+            combined = _combine(pending, action)
+            if combined is not None:
+                self._pending[key] = since, combined
+            else:
+                del self._pending[key]
+                ready.append(pending)
+                self._pending[key] = now, action
+
+        self.sent += len(ready)
+        return ready
+
+    def _drain(self):
+        """Return all the actions held back."""
+        ready = [action for _, action in self._pending.values()]
+        self._pending.clear()
+        self.sent += len(ready)
+        return ready
@@ -0,0 +1,50 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+_CONDITIONAL_PARAMS: Set[str]
+
+def _document_key(action: Any) -> Optional[Tuple[Any, Any, Any]]: ...
+def _partial_doc(data: Any) -> Optional[Dict[str, Any]]: ...
+def _merge_docs(doc: Dict[str, Any], update: Dict[str, Any]) -> Dict[str, Any]: ...
+def _combine(
+    previous: Tuple[Dict[str, Any], Any], action: Tuple[Dict[str, Any], Any]
+) -> Optional[Tuple[Dict[str, Any], Any]]: ...
+
+class ActionCoalescer(object):
+    max_actions: int
+    max_delay: float
+    received: int
+    sent: int
+    def __init__(self, max_actions: int = ..., max_delay: float = ...) -> None: ...
+    @property
+    def saved(self) -> int: ...
+    def coalesce(
+        self, actions: Iterable[Tuple[Any, Any]]
+    ) -> Generator[Tuple[Any, Any], None, None]: ...
+    def _feed(self, action: Tuple[Any, Any]) -> List[Tuple[Any, Any]]: ...
+    def _drain(self) -> List[Tuple[Any, Any]]: ...
@@ -0,0 +1,279 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import csv
+import functools
+import io
+import mmap
+
+from ..compat import to_bytes
+from ..exceptions import SerializationError
+from .actions import (
+    _needs_source,
+    _parallel_bulk,
+    _serialize_actions,
+    _serialize_in_processes,
+    _Serialized,
+    expand_action,
+)
+
+_FORMATS = ("ndjson", "csv")
+
+
+def _line_ranges(path, range_bytes, start=0):
+    """
+    Split a file, from ``start``, into ranges of about ``range_bytes`` bytes
+    ending on line boundaries, return them as ``(start, end)`` offsets.
+    """
+    ranges = []
+    with open(path, "rb") as f:
+        f.seek(0, 2)
+        size = f.tell()
+        if size <= start:
+            return ranges
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            while start < size:
+                end = mapped.find(b"\n", min(start + range_bytes, size) - 1) + 1
+                if end == 0:
+                    end = size
+                ranges.append((start, end))
+                start = end
+        finally:
+            mapped.close()
+    return ranges
+
+
+def _csv_header(path, encoding, csv_options):
+    """Return the column names and the offset of the first row of a CSV file."""
+    with open(path, "rb") as f:
+        header = f.readline()
+    fieldnames = next(
+        csv.reader([header.decode(encoding).rstrip("\r\n")], **csv_options)
+    )
+    return fieldnames, len(header)
+
+
+def _read_range(path, start, end):
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            return mapped[start:end]
+        finally:
+            mapped.close()
+
+
+def _line_source(line, serializer, encoding):
+    """
+    The document of an NDJSON line reported with its errors, the line itself
+    when it isn't valid JSON.
+    """
+    text = line.decode(encoding)
+    try:
+        return serializer.loads(text)
+    except SerializationError:
+        return text
+
+
+def _parse_range(
+    byte_range,
+    path,
+    format,
+    transform,
+    expand_action_callback,
+    serializer,
+    keep_source,
+    encoding,
+    fieldnames,
+    csv_options,
+):
+    """
+    Parse the lines of a file between the ``(start, end)`` offsets of
+    ``byte_range`` into ``_Serialized`` actions, run in the worker processes
+    of ``bulk_from_file``.
+    """
+    data = _read_range(path, *byte_range)
+
+    if format == "ndjson" and transform is None:
+        # the lines are the documents, sent as they are
+        action = {"index": {}}
+        action_line = to_bytes(serializer.dumps(action), "utf-8") + b"\n"
+        lines = [line.rstrip(b"\r") for line in data.split(b"\n") if line.strip()]
+        if not keep_source:
+            bulk_data = (action, None)
+            return [
+                _Serialized(bulk_data, action_line + line + b"\n") for line in lines
+            ]
+        return [
+            _Serialized(
+                (action, _line_source(line, serializer, encoding)),
+                action_line + line + b"\n",
+            )
+            for line in lines
+        ]
+
+    text = data.decode(encoding)
+    if format == "ndjson":
+        # str.splitlines() also splits on \x1c, \x85, \u2028... which JSON strings
+        # may contain unescaped
+        docs = (serializer.loads(line) for line in text.split("\n") if line.strip())
+    else:
+        docs = csv.DictReader(io.StringIO(text), fieldnames=fieldnames, **csv_options)
+    if transform is not None:
+        docs = (doc for doc in map(transform, docs) if doc is not None)
+    return _serialize_actions(docs, expand_action_callback, serializer, keep_source)
+
+
+def _parse_range_batch(batch, **kwargs):
+    """Parse a batch of ranges handed out by ``_serialize_in_processes``."""
+    serialized = []
+    for byte_range in batch:
+        serialized.extend(_parse_range(byte_range, **kwargs))
+    return serialized
+
+
+def bulk_from_file(
+    client,
+    path,
+    format="ndjson",
+    index=None,
+    workers=None,
+    transform=None,
+    range_bytes=16 * 1024 * 1024,
+    thread_count=4,
+    chunk_size=500,
+    max_chunk_bytes=100 * 1024 * 1024,
+    queue_size=4,
+    encoding="utf-8",
+    csv_options=None,
+    expand_action_callback=expand_action,
+    ignore_status=(),
+    max_retries=0,
+    initial_backoff=2,
+    max_backoff=600,
+    lean=False,
+    *args,
+    **kwargs
+):
+    """
+    Index the documents of a NDJSON or CSV file and yield the results like
+    :func:`~elasticsearch.helpers.parallel_bulk`. The file is split into
+    ranges of lines which are parsed by a pool of ``workers`` processes,
+    while the bulk requests are sent from ``thread_count`` threads::
+
+        def to_doc(row):
+            return {"_id": row["id"], "name": row["name"]}
+
+        for ok, item in bulk_from_file(
+            es, "restaurants.csv", format="csv", index="restaurants", transform=to_doc
+        ):
+            ...
+
+    Every line of a NDJSON file is a document. Without ``transform`` the
+    lines are indexed as they are, without being parsed, otherwise the
+    documents (or, for a CSV file, the rows as dicts keyed on the column
+    names of its first line) are passed to ``transform`` which returns the
+    action to send or ``None`` to skip it. ``transform`` and the serializer
+    of the client are sent to the worker processes, so they have to be
+    picklable. A CSV value can't contain a line break.
+
+    :arg client: instance of :class:`~elasticsearch.Elasticsearch` to use
+    :arg path: path of the file
+    :arg format: ``"ndjson"`` (default) or ``"csv"``
+    :arg index: index the documents go to when the actions don't name it
+    :arg workers: number of processes parsing the file, the number of CPUs by
+        default
+    :arg transform: callable turning a document into the action to send
+    :arg range_bytes: size of the ranges of the file parsed at a time
+        (default: 16MB)
+    :arg thread_count: size of the threadpool to use for the bulk requests
+    :arg chunk_size: number of docs in one chunk sent to es (default: 500), or
+        an :class:`~elasticsearch.helpers.AdaptiveChunkSize`
+    :arg max_chunk_bytes: the maximum size of the request in bytes (default: 100MB)
+    :arg queue_size: number of ranges parsed ahead and of chunks waiting for
+        a thread
+    :arg encoding: encoding of the file (default: ``"utf-8"``)
+    :arg csv_options: keyword arguments of :func:`csv.reader` describing the
+        CSV dialect
+    :arg expand_action_callback: callback executed on each action returned by
+        ``transform``, should return a tuple containing the action line and
+        the data line (`None` if data line should be omitted).
+    :arg ignore_status: list of HTTP status code that you want to ignore
+    :arg max_retries: maximum number of times a document will be retried when
+        ``429`` is received, set to 0 (default) for no retries on ``429``
+    :arg initial_backoff: number of seconds we should wait before the first
+        retry. Any subsequent retries will be powers of ``initial_backoff *
+        2**retry_number``
+    :arg max_backoff: maximum number of seconds a retry will wait
+    :arg lean: only have elasticsearch return the ``status``, ``_id`` and
+        ``error`` of the items
+
+    Any additional keyword arguments are handled like by
+    :func:`~elasticsearch.helpers.parallel_bulk`.
+    """
+    if format not in _FORMATS:
+        raise ValueError("'format' must be one of %s." % ", ".join(_FORMATS))
+    csv_options = csv_options or {}
+    if index is not None:
+        kwargs["index"] = index
+
+    fieldnames, start = None, 0
+    if format == "csv":
+        fieldnames, start = _csv_header(path, encoding, csv_options)
+
+    keep_source = _needs_source(
+        kwargs.get("raise_on_error", True),
+        kwargs.get("raise_on_exception", True),
+        ignore_status,
+    )
+    actions = _serialize_in_processes(
+        _line_ranges(path, range_bytes, start),
+        workers,
+        1,
+        queue_size,
+        functools.partial(
+            _parse_range_batch,
+            path=path,
+            format=format,
+            transform=transform,
+            expand_action_callback=expand_action_callback,
+            serializer=client.transport.serializer,
+            keep_source=keep_source,
+            encoding=encoding,
+            fieldnames=fieldnames,
+            csv_options=csv_options,
+        ),
+    )
+
+    for item in _parallel_bulk(
+        client,
+        actions,
+        thread_count,
+        chunk_size,
+        max_chunk_bytes,
+        queue_size,
+        keep_source,
+        ignore_status,
+        max_retries,
+        initial_backoff,
+        max_backoff,
+        lean,
+        False,
+        *args,
+        **kwargs
+    ):
+        yield item
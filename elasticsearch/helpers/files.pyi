@@ -0,0 +1,58 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from ..client import Elasticsearch
+from .adaptive import AdaptiveChunkSize
+
+def _line_ranges(
+    path: str, range_bytes: int, start: int = ...
+) -> List[Tuple[int, int]]: ...
+def bulk_from_file(
+    client: Elasticsearch,
+    path: str,
+    format: str = ...,
+    index: Optional[str] = ...,
+    workers: Optional[int] = ...,
+    transform: Optional[Callable[[Any], Any]] = ...,
+    range_bytes: int = ...,
+    thread_count: int = ...,
+    chunk_size: Union[int, AdaptiveChunkSize] = ...,
+    max_chunk_bytes: int = ...,
+    queue_size: int = ...,
+    encoding: str = ...,
+    csv_options: Optional[Dict[str, Any]] = ...,
+    expand_action_callback: Callable[[Any], Tuple[Dict[str, Any], Optional[Any]]] = ...,
+    ignore_status: Optional[Union[int, Collection[int]]] = ...,
+    max_retries: int = ...,
+    initial_backoff: Union[float, int] = ...,
+    max_backoff: Union[float, int] = ...,
+    lean: bool = ...,
+    *args: Any,
+    **kwargs: Any
+) -> Generator[Tuple[bool, Any], None, None]: ...
@@ -0,0 +1,259 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+from collections import OrderedDict
+from numbers import Integral, Real
+
+from ..compat import Mapping, string_types
+from ..exceptions import ImproperlyConfigured
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
+
+# metadata fields that can be requested as columns next to '_source' paths
+META_FIELDS = ("_id", "_index", "_type", "_score", "_routing")
+
+INTEGER_FIELD_TYPES = ("long", "integer", "short", "byte", "unsigned_long")
+FLOAT_FIELD_TYPES = ("double", "float", "half_float", "scaled_float")
+DATE_FIELD_TYPES = ("date", "date_nanos")
+
+
+def _require_numpy():
+    if np is None:
+        raise ImproperlyConfigured(
+            "Please install numpy to convert search hits into columns."
+        )
+
+
+def _require_pandas():
+    _require_numpy()
+    if pd is None:
+        raise ImproperlyConfigured(
+            "Please install pandas to convert search hits into DataFrames."
+        )
+
+
+def _mapping_field_types(mapping):
+    """
+    Flatten a mapping into a ``{"dotted.path": "field_type"}`` dictionary.
+    Accepts the response of :meth:`~elasticsearch.client.IndicesClient.get_mapping`
+    (fields present in multiple indices keep the first type seen), a single
+    ``{"mappings": ...}`` body or just ``{"properties": ...}``.
+    """
+    field_types = {}
+    if not mapping:
+        return field_types
+
+    if "properties" in mapping:
+        mappings = [mapping]
+    elif "mappings" in mapping:
+        mappings = [mapping["mappings"]]
+    else:
+        mappings = [m.get("mappings", {}) for m in mapping.values()]
+
+    def _walk(properties, prefix):
+        for name, definition in properties.items():
+            path = prefix + name
+            if "properties" in definition:
+                _walk(definition["properties"], path + ".")
+            else:
+                field_types.setdefault(path, definition.get("type", "object"))
+            # multi-fields, eg. a 'keyword' sub-field of a 'text' field
+            for sub_name, sub_definition in definition.get("fields", {}).items():
+                field_types.setdefault(
+                    path + "." + sub_name, sub_definition.get("type", "object")
+                )
+
+    for m in mappings:
+        _walk(m.get("properties", {}), "")
+    return field_types
+
+
+def _source_paths(source, prefix=""):
+    """Yield dotted paths to all the leaf values of a ``_source`` document."""
+    for key, value in source.items():
+        if isinstance(value, Mapping) and value:
+            for path in _source_paths(value, prefix + key + "."):
+                yield path
+        else:
+            yield prefix + key
+
+
+def _lookup(source, path):
+    if path in source:
+        return source[path]
+    value = source
+    for part in path.split("."):
+        if not isinstance(value, Mapping) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def _hit_value(hit, path):
+    if path in META_FIELDS:
+        return hit.get(path)
+
+    # values from 'fields' / 'docvalue_fields' are always returned as lists
+    fields = hit.get("fields")
+    if fields and path in fields:
+        value = fields[path]
+        return value[0] if len(value) == 1 else value
+
+    return _lookup(hit.get("_source") or {}, path)
+
+
+def _to_datetime64(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return np.datetime64(int(value), "ms")
+    if isinstance(value, string_types) and value.endswith("Z"):
+        value = value[:-1]
+    return np.datetime64(value)
+
+
+def _is_number(value, kind=Real):
+    # booleans are integers as far as python is concerned
+    return isinstance(value, kind) and not isinstance(value, bool)
+
+
+def _column_array(values, field_type=None):
+    """Turn a list of values into a numpy array typed after the field type."""
+    missing = any(v is None for v in values)
+    present = [v for v in values if v is not None]
+
+    if field_type is None and present:
+        # no mapping available, infer the type from the values themselves
+        if all(isinstance(v, bool) for v in present):
+            field_type = "boolean"
+        elif all(_is_number(v) for v in present):
+            field_type = "long"
+
+    # numpy would truncate floats and parse strings instead of failing,
+    # integer and float columns only take numbers
+    if field_type in INTEGER_FIELD_TYPES and not all(
+        _is_number(v, Integral) for v in present
+    ):
+        field_type = "double"
+    if field_type in FLOAT_FIELD_TYPES and not all(_is_number(v) for v in present):
+        field_type = None
+
+    try:
+        if field_type in INTEGER_FIELD_TYPES:
+            if missing:
+                return np.array(
+                    [np.nan if v is None else v for v in values], dtype="float64"
+                )
+            if field_type != "unsigned_long":
+                return np.array(values, dtype="int64")
+            # some numpy versions wrap negative values around
+            if min(values) >= 0:
+                return np.array(values, dtype="uint64")
+
+        elif field_type in FLOAT_FIELD_TYPES:
+            return np.array(
+                [np.nan if v is None else v for v in values], dtype="float64"
+            )
+
+        elif field_type == "boolean" and not missing:
+            return np.array(values, dtype="bool")
+
+        elif field_type in DATE_FIELD_TYPES:
+            return np.array(
+                [
+                    np.datetime64("NaT") if v is None else _to_datetime64(v)
+                    for v in values
+                ],
+                dtype="datetime64[ns]",
+            )
+    except (TypeError, ValueError, OverflowError):
+        # values don't fit the mapped type (eg. custom date formats, arrays
+        # or integers out of range), keep them as they are.
+        pass
+
+    column = np.empty(len(values), dtype="object")
+    column[:] = values
+    return column
+
+
+def hits_to_columns(hits, columns=None, mapping=None):
+    """
+    Convert search hits into a column-oriented ``OrderedDict`` of numpy arrays,
+    one entry per column.
+
+    :arg hits: iterable of hits as returned in ``resp["hits"]["hits"]`` or
+        yielded by :func:`~elasticsearch.helpers.scan`
+    :arg columns: list of dotted paths to extract from ``_source`` or
+        ``fields``, metadata fields like ``_id`` can be requested as well.
+        Defaults to all the leaf values found in ``_source``.
+    :arg mapping: optional mapping (as returned by
+        :meth:`~elasticsearch.client.IndicesClient.get_mapping`) used to pick
+        the type of the columns, without it the types are inferred from the
+        values.
+    """
+    _require_numpy()
+
+    hits = list(hits)
+    if columns is None:
+        columns = OrderedDict()
+        for hit in hits:
+            for path in _source_paths(hit.get("_source") or {}):
+                columns[path] = None
+        columns = list(columns)
+
+    field_types = _mapping_field_types(mapping)
+    return OrderedDict(
+        (
+            column,
+            _column_array(
+                [_hit_value(hit, column) for hit in hits], field_types.get(column)
+            ),
+        )
+        for column in columns
+    )
+
+
+def hits_to_dataframe(hits, columns=None, mapping=None):
+    """
+    Convert search hits into a :class:`pandas.DataFrame`. The columns are built
+    with :func:`~elasticsearch.helpers.hits_to_columns` and thus typed after
+    the ``mapping`` when provided::
+
+        mapping = es.indices.get_mapping(index="orders")
+        resp = es.search(index="orders", body={"query": {"match_all": {}}})
+        df = hits_to_dataframe(
+            resp["hits"]["hits"], columns=["_id", "price", "customer.name"], mapping=mapping
+        )
+
+    Use :meth:`pyarrow.Table.from_pandas` on the result to get an Arrow table.
+
+    :arg hits: iterable of hits as returned in ``resp["hits"]["hits"]`` or
+        yielded by :func:`~elasticsearch.helpers.scan`
+    :arg columns: list of dotted paths to extract from ``_source`` or
+        ``fields``, see :func:`~elasticsearch.helpers.hits_to_columns`
+    :arg mapping: optional mapping used to pick the type of the columns
+    """
+    _require_pandas()
+
+    data = hits_to_columns(hits, columns=columns, mapping=mapping)
+    return pd.DataFrame(data, columns=list(data))
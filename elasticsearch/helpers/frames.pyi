@@ -0,0 +1,37 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+from typing import Any, Collection, Dict, Iterable, Mapping, Optional, Tuple
+
+META_FIELDS: Tuple[str, ...]
+INTEGER_FIELD_TYPES: Tuple[str, ...]
+FLOAT_FIELD_TYPES: Tuple[str, ...]
+DATE_FIELD_TYPES: Tuple[str, ...]
+
+def _require_numpy() -> None: ...
+def _require_pandas() -> None: ...
+def _mapping_field_types(mapping: Optional[Mapping[str, Any]]) -> Dict[str, str]: ...
+def hits_to_columns(
+    hits: Iterable[Mapping[str, Any]],
+    columns: Optional[Collection[str]] = ...,
+    mapping: Optional[Mapping[str, Any]] = ...,
+) -> Dict[str, Any]: ...
+def hits_to_dataframe(
+    hits: Iterable[Mapping[str, Any]],
+    columns: Optional[Collection[str]] = ...,
+    mapping: Optional[Mapping[str, Any]] = ...,
+) -> Any: ...
@@ -0,0 +1,162 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+from ..compat import Mapping, string_types
+from ..serializer import JSONSerializer
+
+try:
+    from sys import intern
+except ImportError:  # Python 2, 'intern' is a builtin
+    pass
+
+
+# marks keys missing from the original hit, None is a valid value ('_score')
+_MISSING = object()
+
+# unicode strings interned by hand, intern() only takes str on Python 2
+_INTERNED = {}
+
+
+def _intern(value):
+    # index and type names repeat for every hit, keep only one copy of each
+    if isinstance(value, str):
+        return intern(value)
+    if isinstance(value, string_types) and not isinstance(value, bytes):
+        return _INTERNED.setdefault(value, value)
+    return value
+
+
+class CompactHit(object):
+    """
+    Read-only, memory efficient representation of a search hit which can be
+    used in place of the hit dictionary::
+
+        for hit in scan(es, index="logs-*", hit_class=CompactHit):
+            ...
+
+        hits = [CompactHit(hit) for hit in resp["hits"]["hits"]]
+
+    Index and type names are interned and ``_source`` is kept as serialized
+    JSON bytes, it's only decoded when accessed (on every access, the decoded
+    document isn't kept around). Keys other than the common metadata,
+    ``_source`` and ``sort`` are stored in a regular dictionary.
+    """
+
+    # registered as a Mapping rather than inheriting from it, the ABC has no
+    # __slots__ on Python 2 and would give every instance a __dict__
+    __slots__ = ("_index", "_type", "_id", "_score", "_raw_source", "_sort", "_extra")
+
+    serializer = JSONSerializer()
+
+    def __init__(self, hit):
+        hit = hit.copy()
+        self._index = _intern(hit.pop("_index", _MISSING))
+        self._type = _intern(hit.pop("_type", _MISSING))
+        self._id = hit.pop("_id", _MISSING)
+        self._score = hit.pop("_score", _MISSING)
+        self._sort = hit.pop("sort", _MISSING)
+
+        source = hit.pop("_source", _MISSING)
+        if source is not _MISSING and not isinstance(source, bytes):
+            source = self.serializer.dumps(source)
+            if isinstance(source, string_types) and not isinstance(source, bytes):
+                source = source.encode("utf-8")
+        self._raw_source = source
+        self._extra = hit or None
+
+    @property
+    def raw_source(self):
+        """``_source`` of the hit as serialized JSON bytes."""
+        if self._raw_source is _MISSING:
+            return None
+        return self._raw_source
+
+    def _get(self, key):
+        if key == "_source":
+            value = self._raw_source
+            if value is not _MISSING and value is not None:
+                value = self.serializer.loads(value.decode("utf-8"))
+        elif key == "sort":
+            value = self._sort
+        elif key in ("_index", "_type", "_id", "_score"):
+            value = getattr(self, key)
+        elif self._extra is not None:
+            value = self._extra.get(key, _MISSING)
+        else:
+            value = _MISSING
+        return value
+
+    def __getitem__(self, key):
+        value = self._get(key)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def _keys(self):
+        for key in ("_index", "_type", "_id", "_score"):
+            if getattr(self, key) is not _MISSING:
+                yield key
+        if self._raw_source is not _MISSING:
+            yield "_source"
+        if self._sort is not _MISSING:
+            yield "sort"
+        if self._extra:
+            for key in self._extra:
+                yield key
+
+    def __iter__(self):
+        return self._keys()
+
+    def __len__(self):
+        return sum(1 for _ in self._keys())
+
+    def __contains__(self, key):
+        return self._get(key) is not _MISSING
+
+    def get(self, key, default=None):
+        value = self._get(key)
+        return default if value is _MISSING else value
+
+    def keys(self):
+        return list(self._keys())
+
+    def values(self):
+        return [self[key] for key in self._keys()]
+
+    def items(self):
+        return [(key, self[key]) for key in self._keys()]
+
+    def __eq__(self, other):
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return dict(self.items()) == dict(other.items())
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "CompactHit(%r)" % (self.to_dict(),)
+
+    def to_dict(self):
+        """Return the hit as a regular dictionary."""
+        return dict((key, self[key]) for key in self)
+
+
+Mapping.register(CompactHit)
@@ -0,0 +1,430 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import logging
+import threading
+import time
+
+from ..compat import Mapping, Queue
+from .actions import (
+    _ActionChunker,
+    _describe_failure,
+    _process_bulk_chunk,
+    _RetryScheduler,
+    _serialize_actions,
+    _split_actions,
+    expand_action,
+)
+from .adaptive import AdaptiveChunkSize
+
+logger = logging.getLogger("elasticsearch.helpers")
+
+
+class _BaseBulkIndexer(object):
+    """
+    Buffering, statistics and result handling shared by
+    :class:`BulkIndexer` and its asyncio counterpart, which only differ in
+    how chunks get sent.
+    """
+
+    def __init__(
+        self,
+        client,
+        chunk_size,
+        flush_bytes,
+        flush_interval,
+        expand_action_callback,
+        on_success,
+        on_error,
+        max_retries,
+        initial_backoff,
+        max_backoff,
+        ignore_status,
+        kwargs,
+    ):
+        self.client = client
+        self.chunk_size = chunk_size
+        self.flush_interval = flush_interval
+        self.expand_action_callback = expand_action_callback
+        self.on_success = on_success
+        self.on_error = on_error
+        self.ignore_status = ignore_status
+        self.kwargs = kwargs
+
+        # the source of the documents is only needed to report failures
+        self._keep_source = on_error is not None
+        self._chunker = _ActionChunker(
+            chunk_size, flush_bytes, client.transport.serializer
+        )
+        # what is tracked for every action of the chunk being filled, for
+        # BulkIndexer the number of times it was retried
+        self._pending = []
+        self._buffered_since = None
+        self._lock = threading.Lock()
+        self._retries = None
+        if max_retries:
+            self._retries = _RetryScheduler(max_retries, initial_backoff, max_backoff)
+
+        self._closed = threading.Event()
+        self._started = time.time()
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "succeeded": 0,
+            "failed": 0,
+            "retried": 0,
+            "bytes": 0,
+            "requests": 0,
+            "in_flight": 0,
+        }
+
+    def stats(self):
+        """
+        Return the number of actions that succeeded, failed or were retried,
+        of the bytes and requests sent, of the requests in flight and of the
+        chunks waiting to be sent as well as the rate of documents and bytes
+        per second since the indexer was created.
+        """
+        elapsed = max(time.time() - self._started, 1e-9)
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["queued"] = self._queued()
+        stats["docs_per_sec"] = (stats["succeeded"] + stats["failed"]) / elapsed
+        stats["bytes_per_sec"] = stats["bytes"] / elapsed
+        return stats
+
+    def _queued(self):
+        raise NotImplementedError()
+
+    def _retries_buffered(self):
+        """Whether retried actions are waiting in the chunk being filled."""
+        with self._lock:
+            return any(self._attempts(pending) for pending in self._pending)
+
+    def _attempts(self, pending):
+        return pending
+
+    def _serialize(self, action):
+        if self._closed.is_set():
+            raise ValueError(
+                "Cannot add actions to a closed %s." % self.__class__.__name__
+            )
+        ((data, line),) = _serialize_actions(
+            [action],
+            self.expand_action_callback,
+            self.client.transport.serializer,
+            self._keep_source,
+        )
+        return data, line
+
+    def _buffer(self, data, line, pending):
+        """
+        Add a serialized action to the chunk being filled, return the chunk
+        that was full if any.
+        """
+        with self._lock:
+            ret = self._chunker.feed_serialized(data, line)
+            if ret:
+                ret += (self._pending,)
+                self._pending = []
+                self._buffered_since = None
+            self._pending.append(pending)
+            if self._buffered_since is None:
+                self._buffered_since = time.time()
+            return ret
+
+    def _take_buffer(self, older_than=None):
+        with self._lock:
+            if self._buffered_since is None or (
+                older_than is not None and self._buffered_since > older_than
+            ):
+                return None
+            ret = self._chunker.flush() + (self._pending,)
+            self._pending = []
+            self._buffered_since = None
+            return ret
+
+    def _sending(self):
+        with self._stats_lock:
+            self._stats["in_flight"] += 1
+
+    def _sent(self, bulk_actions):
+        with self._stats_lock:
+            self._stats["in_flight"] -= 1
+            self._stats["requests"] += 1
+            self._stats["bytes"] += len(bulk_actions)
+
+    def _handle_results(self, results, bulk_data, bulk_actions, pending):
+        lines = None
+        succeeded = failed = retried = 0
+        for i, ((ok, item), data) in enumerate(zip(results, bulk_data)):
+            if ok:
+                succeeded += 1
+                self._deliver(ok, item, pending[i])
+                continue
+
+            op_type, info = item.popitem()
+            if self._retries is not None and info.get("status") == 429:
+                if lines is None:
+                    lines = _split_actions(bulk_data, bulk_actions)
+                if self._schedule_retry(data, lines[i], pending[i]):
+                    retried += 1
+                    continue
+            if len(data) > 1 and data[1] is not None:
+                info["data"] = data[1]
+            failed += 1
+            self._deliver(ok, {op_type: info}, pending[i])
+
+        with self._stats_lock:
+            self._stats["succeeded"] += succeeded
+            self._stats["failed"] += failed
+            self._stats["retried"] += retried
+
+    def _handle_failure(self, error, bulk_data, pending):
+        """
+        Report the actions of a chunk whose request failed with an unexpected
+        error as failed.
+        """
+        for data, action_pending in zip(bulk_data, pending):
+            op_type = next(iter(data[0])) if isinstance(data[0], Mapping) else "index"
+            info = {"error": str(error), "exception": error}
+            _describe_failure(info, data)
+            self._deliver(False, {op_type: info}, action_pending)
+        with self._stats_lock:
+            self._stats["failed"] += len(bulk_data)
+
+    def _schedule_retry(self, data, line, attempts):
+        return self._retries.schedule(data, attempts, line)
+
+    def _deliver(self, ok, item, pending):
+        callback = self.on_success if ok else self.on_error
+        if callback is None:
+            return
+        try:
+            callback(item)
+        except Exception:
+            logger.exception("%s callback failed", self.__class__.__name__)
+
+
+class BulkIndexer(_BaseBulkIndexer):
+    """
+    Long-lived bulk indexer for actions coming one at a time, possibly from
+    several threads. Actions passed to :meth:`add` are buffered into a chunk
+    which is handed to ``workers`` threads sending the bulk requests once it
+    reaches ``chunk_size`` actions or ``flush_bytes`` bytes, or once its first
+    action has been waiting for ``flush_interval`` seconds::
+
+        with BulkIndexer(es, on_error=log_failure) as indexer:
+            for message in consumer:
+                indexer.add({"_index": "logs", "_source": message})
+
+    When ``queue_size`` chunks are already waiting to be sent :meth:`add`
+    blocks until a worker picks one up. The results are delivered to the
+    ``on_success`` and ``on_error`` callbacks from the worker threads, the
+    items passed to ``on_error`` include the original document as ``data``
+    like the errors of :class:`~elasticsearch.helpers.BulkIndexError`.
+
+    :arg client: instance of :class:`~elasticsearch.Elasticsearch` to use
+    :arg chunk_size: number of actions in one bulk request (default: 500), or
+        an :class:`~elasticsearch.helpers.AdaptiveChunkSize`
+    :arg flush_bytes: the maximum size of a bulk request in bytes
+        (default: 5MB)
+    :arg flush_interval: number of seconds after which actions are sent even
+        if their chunk isn't full (default: 1)
+    :arg workers: number of threads sending the bulk requests (default: 2)
+    :arg queue_size: number of full chunks waiting for a worker before
+        :meth:`add` blocks (default: 4)
+    :arg expand_action_callback: callback executed on each action passed in,
+        should return a tuple containing the action line and the data line
+        (`None` if data line should be omitted).
+    :arg on_success: called with the response item of every successful action
+    :arg on_error: called with the response item of every failed action
+    :arg max_retries: maximum number of times a document will be retried when
+        ``429`` is received, set to 0 (default) for no retries on ``429``
+    :arg initial_backoff: number of seconds we should wait before the first
+        retry. Any subsequent retries will be powers of ``initial_backoff *
+        2**retry_number``
+    :arg max_backoff: maximum number of seconds a retry will wait
+    :arg ignore_status: list of HTTP status code that you want to ignore
+
+    Any additional keyword arguments will be passed to
+    :meth:`~elasticsearch.Elasticsearch.bulk`.
+    """
+
+    def __init__(
+        self,
+        client,
+        chunk_size=500,
+        flush_bytes=5 * 1024 * 1024,
+        flush_interval=1.0,
+        workers=2,
+        queue_size=4,
+        expand_action_callback=expand_action,
+        on_success=None,
+        on_error=None,
+        max_retries=0,
+        initial_backoff=2,
+        max_backoff=600,
+        ignore_status=(),
+        **kwargs
+    ):
+        super(BulkIndexer, self).__init__(
+            client,
+            chunk_size,
+            flush_bytes,
+            flush_interval,
+            expand_action_callback,
+            on_success,
+            on_error,
+            max_retries,
+            initial_backoff,
+            max_backoff,
+            ignore_status,
+            kwargs,
+        )
+        # held while due retries are moved back into the chunk being filled
+        self._retry_lock = threading.Lock()
+        self._queue = Queue(queue_size)
+        # sequence numbers of the chunks queued and not processed yet, for
+        # flush() to only wait for the chunks queued before it was called
+        self._submitted = 0
+        self._unfinished = set()
+        self._finished = threading.Condition()
+        self._threads = [
+            threading.Thread(target=self._work, name="BulkIndexer-worker-%d" % i)
+            for i in range(workers)
+        ]
+        self._threads.append(
+            threading.Thread(target=self._flush_periodically, name="BulkIndexer-flush")
+        )
+        for thread in self._threads:
+            thread.daemon = True
+            thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def add(self, action):
+        """
+        Add an action to be sent, blocking while ``queue_size`` chunks are
+        waiting to be sent.
+        """
+        data, line = self._serialize(action)
+        self._put(self._buffer(data, line, 0))
+
+    def flush(self):
+        """
+        Send the actions added so far, wait until they were processed
+        (including retries) and their callbacks were called.
+        """
+        while True:
+            self._wait_for(self._put(self._take_buffer()))
+            with self._retry_lock:
+                delay = self._retries._next_delay() if self._retries else None
+                # actions added meanwhile are left for the next chunks, only
+                # the retries (which were attempted before) are waited for
+                if delay is None and not self._retries_buffered():
+                    return
+            if delay:
+                time.sleep(delay)
+            self._requeue_retries()
+
+    def close(self):
+        """
+        Flush the actions added so far and stop the threads, no actions can
+        be added anymore.
+        """
+        if self._closed.is_set():
+            return
+        self.flush()
+        self._closed.set()
+        for _ in range(len(self._threads) - 1):
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def _queued(self):
+        return self._queue.qsize()
+
+    def _put(self, chunk):
+        """
+        Queue a chunk to be sent, return the sequence number of the last
+        chunk queued.
+        """
+        with self._finished:
+            if chunk is None:
+                return self._submitted
+            self._submitted += 1
+            seq = self._submitted
+            self._unfinished.add(seq)
+        self._queue.put((seq, chunk))
+        return seq
+
+    def _wait_for(self, seq):
+        """Wait until the chunks up to the ``seq`` one were processed."""
+        with self._finished:
+            while self._unfinished and min(self._unfinished) <= seq:
+                self._finished.wait()
+
+    def _requeue_retries(self):
+        if self._retries is None:
+            return
+        with self._retry_lock:
+            for attempts, data, line in self._retries._pop_due():
+                self._put(self._buffer(data, line, attempts))
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval / 2.0):
+            self._requeue_retries()
+            self._put(self._take_buffer(time.time() - self.flush_interval))
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            seq, chunk = item
+            try:
+                self._send(*chunk)
+            except Exception as e:
+                logger.exception("Failed to process a bulk chunk")
+                self._handle_failure(e, chunk[0], chunk[2])
+            finally:
+                with self._finished:
+                    self._unfinished.discard(seq)
+                    self._finished.notify_all()
+
+    def _send(self, bulk_data, bulk_actions, pending):
+        self._sending()
+        try:
+            results = _process_bulk_chunk(
+                self.client,
+                bulk_actions,
+                bulk_data,
+                False,
+                False,
+                self.ignore_status,
+                **self.kwargs
+            )
+            if isinstance(self.chunk_size, AdaptiveChunkSize):
+                results = self.chunk_size.track(results)
+            results = list(results)
+        finally:
+            self._sent(bulk_actions)
+        self._handle_results(results, bulk_data, bulk_actions, pending)
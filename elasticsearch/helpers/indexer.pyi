@@ -0,0 +1,99 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import logging
+from typing import Any, Callable, Collection, Dict, List, Optional, Tuple, Union
+
+from ..client import Elasticsearch
+from .adaptive import AdaptiveChunkSize
+
+logger: logging.Logger
+
+class _BaseBulkIndexer(object):
+    client: Any
+    chunk_size: Union[int, AdaptiveChunkSize]
+    flush_interval: float
+    expand_action_callback: Callable[[Any], Tuple[Dict[str, Any], Optional[Any]]]
+    on_success: Optional[Callable[[Dict[str, Any]], Any]]
+    on_error: Optional[Callable[[Dict[str, Any]], Any]]
+    ignore_status: Optional[Union[int, Collection[int]]]
+    kwargs: Dict[str, Any]
+    def __init__(
+        self,
+        client: Any,
+        chunk_size: Union[int, AdaptiveChunkSize],
+        flush_bytes: int,
+        flush_interval: float,
+        expand_action_callback: Callable[[Any], Tuple[Dict[str, Any], Optional[Any]]],
+        on_success: Optional[Callable[[Dict[str, Any]], Any]],
+        on_error: Optional[Callable[[Dict[str, Any]], Any]],
+        max_retries: int,
+        initial_backoff: Union[float, int],
+        max_backoff: Union[float, int],
+        ignore_status: Optional[Union[int, Collection[int]]],
+        kwargs: Dict[str, Any],
+    ) -> None: ...
+    def stats(self) -> Dict[str, Union[int, float]]: ...
+    def _queued(self) -> int: ...
+    def _retries_buffered(self) -> bool: ...
+    def _attempts(self, pending: Any) -> int: ...
+    def _handle_failure(
+        self, error: Exception, bulk_data: List[Any], pending: List[Any]
+    ) -> None: ...
+    def _handle_results(
+        self,
+        results: List[Tuple[bool, Any]],
+        bulk_data: List[Any],
+        bulk_actions: bytes,
+        pending: List[Any],
+    ) -> None: ...
+    def _schedule_retry(
+        self, data: Any, line: Optional[bytes], pending: Any
+    ) -> bool: ...
+    def _deliver(self, ok: bool, item: Dict[str, Any], pending: Any) -> None: ...
+
+class BulkIndexer(_BaseBulkIndexer):
+    client: Elasticsearch
+    def __init__(
+        self,
+        client: Elasticsearch,
+        chunk_size: Union[int, AdaptiveChunkSize] = ...,
+        flush_bytes: int = ...,
+        flush_interval: float = ...,
+        workers: int = ...,
+        queue_size: int = ...,
+        expand_action_callback: Callable[
+            [Any], Tuple[Dict[str, Any], Optional[Any]]
+        ] = ...,
+        on_success: Optional[Callable[[Dict[str, Any]], Any]] = ...,
+        on_error: Optional[Callable[[Dict[str, Any]], Any]] = ...,
+        max_retries: int = ...,
+        initial_backoff: Union[float, int] = ...,
+        max_backoff: Union[float, int] = ...,
+        ignore_status: Optional[Union[int, Collection[int]]] = ...,
+        **kwargs: Any
+    ) -> None: ...
+    def __enter__(self) -> "BulkIndexer": ...
+    def __exit__(self, *_: Any) -> None: ...
+    def add(self, action: Any) -> None: ...
+    def flush(self) -> None: ...
+    def close(self) -> None: ...
+    def _work(self) -> None: ...
+    def _flush_periodically(self) -> None: ...
+    def _send(
+        self, bulk_data: List[Any], bulk_actions: bytes, pending: List[int]
+    ) -> None: ...
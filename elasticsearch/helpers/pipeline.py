@@ -0,0 +1,419 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from ..compat import Queue
+from ..serializer import JSONSerializer
+from .actions import streaming_bulk
+from .pit import _BasePitScan
+from .spool import _replace
+
+logger = logging.getLogger("elasticsearch.helpers")
+
+_STAGES = ("read", "transform", "write")
+
+
+class _SliceProgress(object):
+    """
+    Position of a slice up to which all the documents read were written,
+    the pages being written in no particular order.
+    """
+
+    def __init__(self, search_after=None, done=False):
+        self.search_after = search_after
+        self.done = done
+        # [search_after, written, last] of the pages not written yet, in
+        # the order they were read
+        self._pages = deque()
+
+    def read(self, search_after, last=False):
+        page = [search_after, False, last]
+        self._pages.append(page)
+        return page
+
+    def written(self, page):
+        page[1] = True
+        while self._pages and self._pages[0][1]:
+            self.search_after, _, last = self._pages.popleft()
+            self.done = self.done or last
+
+
+class _BaseReindexPipeline(object):
+    """
+    Checkpoints, page preparation and statistics shared by
+    :class:`ReindexPipeline` and its asyncio counterpart, which only differ
+    in how the stages run.
+    """
+
+    def __init__(
+        self,
+        client,
+        source_index,
+        target_index,
+        query=None,
+        target_client=None,
+        transform=None,
+        slices=4,
+        write_workers=4,
+        queue_size=8,
+        page_size=1000,
+        keep_alive="5m",
+        sort=None,
+        checkpoint=None,
+        checkpoint_interval=10.0,
+        chunk_size=500,
+        search_kwargs=None,
+        bulk_kwargs=None,
+    ):
+        self.client = client
+        self.source_index = source_index
+        self.target_index = target_index
+        self.query = query or {}
+        self.target_client = client if target_client is None else target_client
+        self.transform = transform
+        self.slices = slices
+        self.write_workers = write_workers
+        self.queue_size = queue_size
+        self.page_size = page_size
+        self.keep_alive = keep_alive
+        self.sort = sort or self.query.get("sort")
+        self.checkpoint = checkpoint
+        self.checkpoint_interval = checkpoint_interval
+        self.chunk_size = chunk_size
+        self.search_kwargs = search_kwargs or {}
+        self.bulk_kwargs = bulk_kwargs or {}
+
+        self.pit_id = None
+        self._progress = [_SliceProgress() for _ in range(slices)]
+        self._serializer = JSONSerializer()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._error = None
+        self._started = None
+        self._stats = dict((stage, [0, 0.0]) for stage in _STAGES)
+        self._failed = 0
+        self._readers = 0
+
+    def stats(self):
+        """
+        Return the number of documents and the rate of every stage: ``read``
+        from the source, ``transform`` and ``write`` to the target. For each
+        stage ``busy`` is the share of the time its workers were working
+        rather than waiting for the other stages, the stage busy close to
+        ``1.0`` being the bottleneck, and ``docs_per_sec`` the rate it
+        reaches while working.
+        """
+        elapsed = max(time.time() - (self._started or time.time()), 1e-9)
+        with self._lock:
+            stats = {"elapsed": elapsed, "queued": self._queued()}
+            for stage in _STAGES:
+                docs, seconds = self._stats[stage]
+                workers = self.write_workers if stage == "write" else self.slices
+                stats[stage] = {
+                    "docs": docs,
+                    "busy": min(seconds / (elapsed * workers), 1.0),
+                    "docs_per_sec": docs * workers / seconds if seconds else 0.0,
+                }
+            stats["write"]["failed"] = self._failed
+        stats["docs_per_sec"] = stats["write"]["docs"] / elapsed
+        return stats
+
+    def _queued(self):
+        raise NotImplementedError()
+
+    def _record(self, stage, docs, started, failed=0):
+        with self._lock:
+            self._stats[stage][0] += docs
+            self._stats[stage][1] += time.time() - started
+            self._failed += failed
+
+    def _fail(self, error):
+        with self._lock:
+            if self._error is None:
+                self._error = error
+        self._stop.set()
+
+    def _load_checkpoint(self):
+        """
+        Restore the position of every slice from the checkpoint file, return
+        whether a point in time has to be opened.
+        """
+        self._started = time.time()
+        if self.checkpoint is None or not os.path.exists(self.checkpoint):
+            return True
+
+        with open(self.checkpoint) as f:
+            state = self._serializer.loads(f.read())
+        if len(state["slices"]) != self.slices:
+            raise ValueError(
+                "Checkpoint %r was written with %d slices, not %d."
+                % (self.checkpoint, len(state["slices"]), self.slices)
+            )
+        self._progress = [
+            _SliceProgress(s["search_after"], s["done"]) for s in state["slices"]
+        ]
+        self.pit_id = state["pit_id"]
+        # positions in an explicit sort stay valid in another point in time,
+        # the ones in _shard_doc only in the point in time they come from
+        return bool(self.sort)
+
+    def _save_checkpoint(self):
+        with self._lock:
+            state = {
+                "pit_id": self.pit_id,
+                "slices": [
+                    {"search_after": p.search_after, "done": p.done}
+                    for p in self._progress
+                ],
+            }
+        if self.checkpoint is not None:
+            with open(self.checkpoint + ".tmp", "w") as f:
+                f.write(self._serializer.dumps(state))
+            _replace(self.checkpoint + ".tmp", self.checkpoint)
+        logger.info("Reindex progress: %r", self.stats())
+
+    def _remove_checkpoint(self):
+        if self.checkpoint is not None and os.path.exists(self.checkpoint):
+            os.remove(self.checkpoint)
+
+    def _pending_slices(self):
+        return [i for i, progress in enumerate(self._progress) if not progress.done]
+
+    def _slice_scan(self, slice_id):
+        query = self.query
+        # a single slice is a plain search
+        if self.slices > 1:
+            query = dict(query, slice={"id": slice_id, "max": self.slices})
+        return _BasePitScan(
+            self.client,
+            query=query,
+            page_size=self.page_size,
+            keep_alive=self.keep_alive,
+            sort=self.sort,
+            cursor={
+                "pit_id": self.pit_id,
+                "search_after": self._progress[slice_id].search_after,
+            },
+            **self.search_kwargs
+        )
+
+    def _page_read(self, slice_id, scan, hits):
+        """Register a page of hits read from a slice, in order."""
+        if hits:
+            scan.search_after = hits[-1]["sort"]
+        with self._lock:
+            self.pit_id = scan.pit_id
+            return self._progress[slice_id].read(scan.search_after, not hits)
+
+    def _page_written(self, slice_id, page):
+        with self._lock:
+            self._progress[slice_id].written(page)
+
+    def _prepare(self, hits):
+        """Point the hits at the target index and turn them into actions."""
+        actions = []
+        for hit in hits:
+            hit["_index"] = self.target_index
+            if "fields" in hit:
+                hit.update(hit.pop("fields"))
+            action = hit if self.transform is None else self.transform(hit)
+            if action is not None:
+                actions.append(action)
+        return actions
+
+
+class ReindexPipeline(_BaseReindexPipeline):
+    """
+    Parallel and resumable alternative to
+    :func:`~elasticsearch.helpers.reindex`. The source index is read in
+    ``slices`` slices of a `point in time
+    <https://www.elastic.co/guide/en/elasticsearch/reference/current/point-in-time-api.html>`_
+    by a thread each, the hits go through ``transform`` and are written to
+    the target by ``write_workers`` threads sending bulk requests::
+
+        pipeline = ReindexPipeline(
+            es, "logs-v1", "logs-v2", transform=upgrade, checkpoint="logs.ckpt"
+        )
+        stats = pipeline.run()
+
+    Every ``checkpoint_interval`` seconds the position up to which every
+    slice was written is saved to the ``checkpoint`` file, along with the id
+    of the point in time. When a run is interrupted, the next one with the
+    same file and slices resumes from there, the documents written after the
+    last checkpoint being written again. The point in time is kept open for
+    ``keep_alive`` after each page, the run has to be resumed within that
+    delay unless the hits are sorted on fields which identify them (given
+    as ``sort``), a new point in time being opened then. The file is removed
+    once all documents were written.
+
+    :meth:`stats` reports the rate of every stage, which tells whether the
+    reads or the writes are the bottleneck.
+
+    :arg client: instance of :class:`~elasticsearch.Elasticsearch` to read
+        from (and write to unless ``target_client`` is given)
+    :arg source_index: index (or list of indices) to read documents from
+    :arg target_index: name of the index to write the documents to
+    :arg query: body for the :meth:`~elasticsearch.Elasticsearch.search` api
+    :arg target_client: optional, is specified will be used for writing (thus
+        enabling reindex between clusters)
+    :arg transform: called with every hit, already pointed at
+        ``target_index``, returns the action to send or ``None`` to skip it
+    :arg slices: number of slices read in parallel (default: 4)
+    :arg write_workers: number of threads sending bulk requests (default: 4)
+    :arg queue_size: number of pages read ahead of the writers (default: 8)
+    :arg page_size: number of hits of every search request (default: 1000)
+    :arg keep_alive: how long the point in time should be kept open between
+        two pages (default: 5m)
+    :arg sort: sort of the hits, by ``_shard_doc`` unless given here or in
+        the ``query``
+    :arg checkpoint: path of the file the progress is saved to, the run
+        can't be resumed without one
+    :arg checkpoint_interval: number of seconds between two checkpoints
+        (default: 10)
+    :arg chunk_size: number of docs in one chunk sent to es (default: 500)
+    :arg search_kwargs: additional kwargs to be passed to
+        :meth:`~elasticsearch.Elasticsearch.search`
+    :arg bulk_kwargs: additional kwargs to be passed to
+        :func:`~elasticsearch.helpers.streaming_bulk`, with
+        ``raise_on_error=False`` failed documents are counted rather than
+        stopping the run
+    """
+
+    def __init__(self, client, source_index, target_index, **kwargs):
+        super(ReindexPipeline, self).__init__(
+            client, source_index, target_index, **kwargs
+        )
+        self._pages = Queue(self.queue_size)
+
+    def run(self):
+        """
+        Reindex all the documents left and return the :meth:`stats`. The
+        progress is saved before an error is raised.
+        """
+        if self._load_checkpoint():
+            if self.pit_id is not None:
+                # the checkpoint's point in time is replaced, don't leave it open
+                self.client.close_point_in_time(body={"id": self.pit_id}, ignore=(404,))
+            self.pit_id = self.client.open_point_in_time(
+                index=self.source_index, keep_alive=self.keep_alive
+            )["id"]
+
+        slice_ids = self._pending_slices()
+        self._readers = len(slice_ids)
+        threads = [
+            threading.Thread(
+                target=self._read, args=(i,), name="ReindexPipeline-read-%d" % i
+            )
+            for i in slice_ids
+        ]
+        if slice_ids:
+            threads.extend(
+                threading.Thread(
+                    target=self._write, name="ReindexPipeline-write-%d" % i
+                )
+                for i in range(self.write_workers)
+            )
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+
+        try:
+            checkpointed = time.time()
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(0.1)
+                    if time.time() - checkpointed >= self.checkpoint_interval:
+                        self._save_checkpoint()
+                        checkpointed = time.time()
+        finally:
+            # the writers drop the pages left once stopped
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+            self._save_checkpoint()
+
+        # the point in time is left open for the run to be resumed
+        if self._error is None or self.checkpoint is None:
+            self.client.close_point_in_time(body={"id": self.pit_id}, ignore=(404,))
+        if self._error is not None:
+            raise self._error
+        self._remove_checkpoint()
+        return self.stats()
+
+    def _queued(self):
+        return self._pages.qsize()
+
+    def _read(self, slice_id):
+        scan = self._slice_scan(slice_id)
+        try:
+            while not self._stop.is_set():
+                started = time.time()
+                hits = scan._hits(
+                    self.client.search(
+                        body=scan._search_body(),
+                        request_timeout=scan.request_timeout,
+                        **scan.kwargs
+                    )
+                )
+                self._record("read", len(hits), started)
+                page = self._page_read(slice_id, scan, hits)
+                if not hits:
+                    self._page_written(slice_id, page)
+                    break
+
+                started = time.time()
+                actions = self._prepare(hits)
+                self._record("transform", len(hits), started)
+                self._pages.put((slice_id, page, actions))
+        except Exception as e:
+            self._fail(e)
+        finally:
+            with self._lock:
+                self._readers -= 1
+                last = not self._readers
+            if last:
+                for _ in range(self.write_workers):
+                    self._pages.put(None)
+
+    def _write(self):
+        while True:
+            item = self._pages.get()
+            if item is None:
+                return
+            if self._stop.is_set():
+                continue
+
+            slice_id, page, actions = item
+            try:
+                started = time.time()
+                failed = 0
+                for ok, _ in streaming_bulk(
+                    self.target_client,
+                    actions,
+                    chunk_size=self.chunk_size,
+                    **self.bulk_kwargs
+                ):
+                    failed += not ok
+                self._record("write", len(actions) - failed, started, failed)
+                self._page_written(slice_id, page)
+            except Exception as e:
+                self._fail(e)
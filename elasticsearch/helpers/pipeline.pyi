@@ -0,0 +1,134 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import logging
+import threading
+from typing import Any, Callable, Deque, Dict, List, Mapping, Optional, Tuple, Union
+
+from ..client import Elasticsearch
+from ..compat import Queue
+from ..serializer import JSONSerializer
+from .pit import _BasePitScan
+
+logger: logging.Logger
+
+_STAGES: Tuple[str, ...]
+
+class _SliceProgress(object):
+    search_after: Optional[List[Any]]
+    done: bool
+    _pages: Deque[List[Any]]
+    def __init__(
+        self, search_after: Optional[List[Any]] = ..., done: bool = ...
+    ) -> None: ...
+    def read(
+        self, search_after: Optional[List[Any]], last: bool = ...
+    ) -> List[Any]: ...
+    def written(self, page: List[Any]) -> None: ...
+
+class _BaseReindexPipeline(object):
+    client: Any
+    source_index: Any
+    target_index: str
+    query: Mapping[str, Any]
+    target_client: Any
+    transform: Optional[Callable[[Dict[str, Any]], Optional[Any]]]
+    slices: int
+    write_workers: int
+    queue_size: int
+    page_size: int
+    keep_alive: str
+    sort: Optional[Any]
+    checkpoint: Optional[str]
+    checkpoint_interval: float
+    chunk_size: int
+    search_kwargs: Mapping[str, Any]
+    bulk_kwargs: Mapping[str, Any]
+    pit_id: Optional[str]
+    _progress: List[_SliceProgress]
+    _serializer: JSONSerializer
+    _lock: threading.Lock
+    _stop: threading.Event
+    _error: Optional[BaseException]
+    _started: Optional[float]
+    _stats: Dict[str, List[Union[int, float]]]
+    _failed: int
+    _readers: int
+    def __init__(
+        self,
+        client: Any,
+        source_index: Any,
+        target_index: str,
+        query: Optional[Mapping[str, Any]] = ...,
+        target_client: Optional[Any] = ...,
+        transform: Optional[Callable[[Dict[str, Any]], Optional[Any]]] = ...,
+        slices: int = ...,
+        write_workers: int = ...,
+        queue_size: int = ...,
+        page_size: int = ...,
+        keep_alive: str = ...,
+        sort: Optional[Any] = ...,
+        checkpoint: Optional[str] = ...,
+        checkpoint_interval: float = ...,
+        chunk_size: int = ...,
+        search_kwargs: Optional[Mapping[str, Any]] = ...,
+        bulk_kwargs: Optional[Mapping[str, Any]] = ...,
+    ) -> None: ...
+    def stats(self) -> Dict[str, Any]: ...
+    def _queued(self) -> int: ...
+    def _record(
+        self, stage: str, docs: int, started: float, failed: int = ...
+    ) -> None: ...
+    def _fail(self, error: BaseException) -> None: ...
+    def _load_checkpoint(self) -> bool: ...
+    def _save_checkpoint(self) -> None: ...
+    def _remove_checkpoint(self) -> None: ...
+    def _pending_slices(self) -> List[int]: ...
+    def _slice_scan(self, slice_id: int) -> _BasePitScan: ...
+    def _page_read(
+        self, slice_id: int, scan: _BasePitScan, hits: List[Any]
+    ) -> List[Any]: ...
+    def _page_written(self, slice_id: int, page: List[Any]) -> None: ...
+    def _prepare(self, hits: List[Any]) -> List[Any]: ...
+
+class ReindexPipeline(_BaseReindexPipeline):
+    client: Elasticsearch
+    target_client: Elasticsearch
+    _pages: Queue[Any]
+    def __init__(
+        self,
+        client: Elasticsearch,
+        source_index: Any,
+        target_index: str,
+        query: Optional[Mapping[str, Any]] = ...,
+        target_client: Optional[Elasticsearch] = ...,
+        transform: Optional[Callable[[Dict[str, Any]], Optional[Any]]] = ...,
+        slices: int = ...,
+        write_workers: int = ...,
+        queue_size: int = ...,
+        page_size: int = ...,
+        keep_alive: str = ...,
+        sort: Optional[Any] = ...,
+        checkpoint: Optional[str] = ...,
+        checkpoint_interval: float = ...,
+        chunk_size: int = ...,
+        search_kwargs: Optional[Mapping[str, Any]] = ...,
+        bulk_kwargs: Optional[Mapping[str, Any]] = ...,
+    ) -> None: ...
+    def run(self) -> Dict[str, Any]: ...
+    def _read(self, slice_id: int) -> None: ...
+    def _write(self) -> None: ...
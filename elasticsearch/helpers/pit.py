@@ -0,0 +1,170 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+from .actions import _check_shards
+
+# sort of a point in time search when none is given, the cheapest one
+_DEFAULT_SORT = ["_shard_doc"]
+
+
+class _BasePitScan(object):
+    """
+    Position and request building shared by :class:`PitScan` and its
+    asyncio counterpart, which only differ in how requests are sent.
+    """
+
+    def __init__(
+        self,
+        client,
+        index=None,
+        query=None,
+        page_size=1000,
+        keep_alive="5m",
+        sort=None,
+        cursor=None,
+        raise_on_error=True,
+        request_timeout=None,
+        hit_class=None,
+        **kwargs
+    ):
+        self.client = client
+        self.index = index
+        self.query = query or {}
+        self.page_size = page_size
+        self.keep_alive = keep_alive
+        self.sort = sort or self.query.get("sort") or _DEFAULT_SORT
+        self.raise_on_error = raise_on_error
+        self.request_timeout = request_timeout
+        self.hit_class = hit_class
+        self.kwargs = kwargs
+
+        self.pit_id = None
+        self.search_after = None
+        if cursor is not None:
+            self.pit_id = cursor["pit_id"]
+            self.search_after = cursor.get("search_after")
+
+    @property
+    def cursor(self):
+        """
+        Position after the last hit processed, which can be stored and passed
+        as ``cursor`` to resume the iteration as long as the point in time
+        hasn't expired.
+        """
+        return {"pit_id": self.pit_id, "search_after": self.search_after}
+
+    def _closed(self):
+        # the point in time is only opened before the first hit
+        return self.pit_id is None and self.search_after is not None
+
+    def _open_params(self):
+        return {"index": self.index, "keep_alive": self.keep_alive}
+
+    def _search_body(self):
+        body = dict(self.query)
+        body["pit"] = {"id": self.pit_id, "keep_alive": self.keep_alive}
+        body["size"] = self.page_size
+        body["sort"] = self.sort
+        body.setdefault("track_total_hits", False)
+        if self.search_after is not None:
+            body["search_after"] = self.search_after
+        return body
+
+    def _hits(self, resp):
+        """Return the hits of a page after checking for shard failures."""
+        # the id of a point in time may change with every search
+        self.pit_id = resp.get("pit_id", self.pit_id)
+        _check_shards(resp, self.pit_id, self.raise_on_error, "Search")
+        return resp["hits"]["hits"]
+
+
+class PitScan(_BasePitScan):
+    """
+    Iterator over all the hits matching a query, paging through a `point in
+    time <https://www.elastic.co/guide/en/elasticsearch/reference/current/point-in-time-api.html>`_
+    with ``search_after`` instead of a scroll. The point in time is opened on
+    the first iteration, kept alive for ``keep_alive`` by every page and
+    closed once all hits were read::
+
+        hits = pit_scan(es, index="orders-*", query={"query": {"match_all": {}}})
+        for hit in hits:
+            process(hit)
+            save_position(hits.cursor)
+
+        # after a restart
+        for hit in pit_scan(es, cursor=load_position()):
+            ...
+
+    When the iteration fails or is abandoned the point in time is left open
+    so that it can be resumed from :attr:`cursor`, call :meth:`close` when it
+    won't be. Hits are read again from the last one the iteration moved past,
+    a hit still being processed when its position was saved is read again.
+
+    :arg client: instance of :class:`~elasticsearch.Elasticsearch` to use
+    :arg index: the indices to search, ignored when resuming from a ``cursor``
+    :arg query: body for the :meth:`~elasticsearch.Elasticsearch.search` api
+    :arg page_size: number of hits of every search request (default: 1000)
+    :arg keep_alive: how long the point in time should be kept open between
+        two pages (default: 5m)
+    :arg sort: sort of the hits, by ``_shard_doc`` (the cheapest) unless
+        given here or in the ``query``
+    :arg cursor: position to resume from, see :attr:`cursor`
+    :arg raise_on_error: raises an exception (``ScanError``) if an error is
+        encountered (some shards fail to execute). By default we raise.
+    :arg request_timeout: explicit timeout for each search request
+    :arg hit_class: optional callable wrapping every hit before it's yielded
+
+    Any additional keyword arguments will be passed to the
+    :meth:`~elasticsearch.Elasticsearch.search` calls.
+    """
+
+    def __iter__(self):
+        if self.pit_id is None:
+            if self._closed():
+                return
+            self.pit_id = self.client.open_point_in_time(**self._open_params())["id"]
+
+        while True:
+            hits = self._hits(
+                self.client.search(
+                    body=self._search_body(),
+                    request_timeout=self.request_timeout,
+                    **self.kwargs
+                )
+            )
+            if not hits:
+                break
+            for hit in hits:
+                yield hit if self.hit_class is None else self.hit_class(hit)
+                self.search_after = hit["sort"]
+
+        self.close()
+
+    def close(self):
+        """Close the point in time, the iteration can't be resumed anymore."""
+        if self.pit_id is not None:
+            self.client.close_point_in_time(body={"id": self.pit_id}, ignore=(404,))
+            self.pit_id = None
+
+
+def pit_scan(client, index=None, query=None, **kwargs):
+    """
+    Iterate over all the hits matching ``query`` through a point in time,
+    returns a :class:`~elasticsearch.helpers.PitScan` which accepts the same
+    arguments.
+    """
+    return PitScan(client, index, query, **kwargs)
@@ -0,0 +1,68 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+from typing import Any, Callable, Dict, Generator, List, Mapping, Optional, Union
+
+from ..client import Elasticsearch
+
+_DEFAULT_SORT: List[str]
+
+class _BasePitScan(object):
+    client: Any
+    index: Optional[Any]
+    query: Mapping[str, Any]
+    page_size: int
+    keep_alive: str
+    sort: Any
+    raise_on_error: bool
+    request_timeout: Optional[Union[float, int]]
+    hit_class: Optional[Callable[[Any], Any]]
+    kwargs: Dict[str, Any]
+    pit_id: Optional[str]
+    search_after: Optional[List[Any]]
+    def __init__(
+        self,
+        client: Any,
+        index: Optional[Any] = ...,
+        query: Optional[Mapping[str, Any]] = ...,
+        page_size: int = ...,
+        keep_alive: str = ...,
+        sort: Optional[Any] = ...,
+        cursor: Optional[Mapping[str, Any]] = ...,
+        raise_on_error: bool = ...,
+        request_timeout: Optional[Union[float, int]] = ...,
+        hit_class: Optional[Callable[[Any], Any]] = ...,
+        **kwargs: Any
+    ) -> None: ...
+    @property
+    def cursor(self) -> Dict[str, Any]: ...
+    def _closed(self) -> bool: ...
+    def _open_params(self) -> Dict[str, Any]: ...
+    def _search_body(self) -> Dict[str, Any]: ...
+    def _hits(self, resp: Mapping[str, Any]) -> List[Any]: ...
+
+class PitScan(_BasePitScan):
+    client: Elasticsearch
+    def __iter__(self) -> Generator[Any, None, None]: ...
+    def close(self) -> None: ...
+
+def pit_scan(
+    client: Elasticsearch,
+    index: Optional[Any] = ...,
+    query: Optional[Mapping[str, Any]] = ...,
+    **kwargs: Any
+) -> PitScan: ...
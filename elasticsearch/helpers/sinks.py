@@ -0,0 +1,201 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import logging
+import os
+import threading
+
+from ..compat import to_bytes, to_str
+from ..serializer import JSONSerializer
+from .spool import _replace
+
+logger = logging.getLogger("elasticsearch.helpers")
+
+# keys of a failed item which are parameters of its action, the other ones
+# come from the response
+_ACTION_PARAMS = (
+    "_index",
+    "_id",
+    "if_seq_no",
+    "if_primary_term",
+    "parent",
+    "pipeline",
+    "retry_on_conflict",
+    "routing",
+    "version",
+    "version_type",
+)
+
+
+def _error_type(info):
+    """
+    The type of the error of a failed item, or the class of the exception
+    when the whole request failed.
+    """
+    error = info.get("error")
+    if isinstance(error, dict):
+        return error.get("type", "unknown")
+    if "exception" in info:
+        return info["exception"].__class__.__name__
+    return "status %s" % info.get("status")
+
+
+class ErrorSample(object):
+    """
+    Error sink keeping only the first ``size`` failed items, and the number
+    of all of them by the type of their error (the ``type`` reported by
+    elasticsearch or the class of the exception a failed request raised)::
+
+        sample = ErrorSample()
+        success, failed = bulk(es, actions, raise_on_error=False, error_sink=sample)
+        for error_type, count in sample.counts.items():
+            print(error_type, count)
+
+    :arg size: number of failed items to keep (default: 100)
+    """
+
+    def __init__(self, size=100):
+        self.size = size
+        self.items = []
+        self.counts = {}
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, item):
+        error_type = _error_type(next(iter(item.values())))
+        with self._lock:
+            self.total += 1
+            self.counts[error_type] = self.counts.get(error_type, 0) + 1
+            if len(self.items) < self.size:
+                self.items.append(item)
+
+
+class DeadLetterFile(object):
+    """
+    Error sink writing the failed actions to ``path``, one line of JSON per
+    action with its metadata, document, status and error, from which they
+    can be sent again with :func:`read_dead_letters` once the cause of their
+    failure is fixed::
+
+        with DeadLetterFile("failed.ndjson") as dead_letters:
+            bulk(es, actions, raise_on_error=False, error_sink=dead_letters)
+        ...
+        bulk(es, read_dead_letters("failed.ndjson"))
+
+    Once ``path`` reaches ``max_bytes`` it's renamed to ``path.1``, the
+    previous ``path.1`` to ``path.2`` and so on up to ``backup_count`` files
+    like :class:`logging.handlers.RotatingFileHandler` does, the oldest
+    failures are dropped.
+
+    :arg path: file the failed actions are appended to
+    :arg max_bytes: size in bytes after which the file is rotated, 0 to never
+        rotate it (default: 64MB)
+    :arg backup_count: number of rotated files to keep (default: 5)
+    :arg serializer: serializer of the actions, a
+        :class:`~elasticsearch.serializer.JSONSerializer` by default
+    """
+
+    def __init__(
+        self, path, max_bytes=64 * 1024 * 1024, backup_count=5, serializer=None
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.serializer = serializer or JSONSerializer()
+
+        self._lock = threading.Lock()
+        self._file = open(path, "ab")
+        self._size = self._file.tell()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __call__(self, item):
+        ((op_type, info),) = item.items()
+        record = {
+            "action": {
+                op_type: dict(
+                    (key, info[key])
+                    for key in _ACTION_PARAMS
+                    if info.get(key) is not None
+                )
+            },
+            "status": info.get("status"),
+            "error": info.get("error"),
+        }
+        if info.get("data") is not None:
+            record["data"] = info["data"]
+        line = to_bytes(self.serializer.dumps(record), "utf-8") + b"\n"
+
+        with self._lock:
+            if (
+                self.max_bytes
+                and self._size
+                and self._size + len(line) > self.max_bytes
+            ):
+                self._rotate()
+            self._file.write(line)
+            self._file.flush()
+            self._size += len(line)
+
+    def close(self):
+        """Close the file, no failed actions can be written anymore."""
+        with self._lock:
+            self._file.close()
+
+    def _rotate(self):
+        self._file.close()
+        if self.backup_count:
+            for i in range(self.backup_count - 1, 0, -1):
+                rotated = "%s.%d" % (self.path, i)
+                if os.path.exists(rotated):
+                    _replace(rotated, "%s.%d" % (self.path, i + 1))
+            _replace(self.path, self.path + ".1")
+        self._file = open(self.path, "wb")
+        self._size = 0
+
+
+def read_dead_letters(path, serializer=None):
+    """
+    Read the actions written to ``path`` (or to one of its rotated files) by
+    a :class:`DeadLetterFile` back, as actions for the bulk helpers. Actions
+    recorded without their document can't be sent again and are skipped.
+
+    :arg path: file written by a :class:`DeadLetterFile`
+    :arg serializer: serializer the :class:`DeadLetterFile` used, a
+        :class:`~elasticsearch.serializer.JSONSerializer` by default
+    """
+    serializer = serializer or JSONSerializer()
+    with open(path, "rb") as f:
+        for line in f:
+            # the last line may have been cut short by a crash
+            if not line.endswith(b"\n"):
+                break
+            record = serializer.loads(to_str(line, "utf-8"))
+            ((op_type, params),) = record["action"].items()
+            action = dict(params, _op_type=op_type)
+            if op_type != "delete":
+                if "data" not in record:
+                    logger.warning(
+                        "Skipping %s action without its document in %s", op_type, path
+                    )
+                    continue
+                action["_source"] = record["data"]
+            yield action
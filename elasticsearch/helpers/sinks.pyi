@@ -0,0 +1,62 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import logging
+import threading
+from typing import IO, Any, Dict, Generator, List, Optional, Tuple
+
+from ..serializer import Serializer
+
+logger: logging.Logger
+
+_ACTION_PARAMS: Tuple[str, ...]
+
+def _error_type(info: Dict[str, Any]) -> str: ...
+
+class ErrorSample(object):
+    size: int
+    items: List[Dict[str, Any]]
+    counts: Dict[str, int]
+    total: int
+    _lock: threading.Lock
+    def __init__(self, size: int = ...) -> None: ...
+    def __call__(self, item: Dict[str, Any]) -> None: ...
+
+class DeadLetterFile(object):
+    path: str
+    max_bytes: int
+    backup_count: int
+    serializer: Serializer
+    _lock: threading.Lock
+    _file: IO[bytes]
+    _size: int
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = ...,
+        backup_count: int = ...,
+        serializer: Optional[Serializer] = ...,
+    ) -> None: ...
+    def __enter__(self) -> "DeadLetterFile": ...
+    def __exit__(self, *_: Any) -> None: ...
+    def __call__(self, item: Dict[str, Any]) -> None: ...
+    def close(self) -> None: ...
+    def _rotate(self) -> None: ...
+
+def read_dead_letters(
+    path: str, serializer: Optional[Serializer] = ...
+) -> Generator[Dict[str, Any], None, None]: ...
@@ -0,0 +1,427 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import logging
+import mmap
+import os
+import threading
+import time
+
+from ..compat import to_str
+from ..serializer import JSONSerializer
+from .actions import (
+    _process_bulk_chunk,
+    _send_in_order,
+    _serialize_actions,
+    expand_action,
+)
+from .adaptive import AdaptiveChunkSize, _current_chunk_size
+from .errors import BulkIndexError
+
+logger = logging.getLogger("elasticsearch.helpers")
+
+# os.rename doesn't replace an existing file on Windows
+_replace = getattr(os, "replace", os.rename)
+
+_SEGMENT_SUFFIX = ".ndjson"
+_CHECKPOINT = "checkpoint"
+
+
+class BulkSpool(object):
+    """
+    Append-only spool of bulk actions on disk, sitting between the producers
+    of the actions and the bulk requests. Actions passed to :meth:`add` are
+    serialized once into the NDJSON lines of a bulk request and appended to
+    segment files of ``segment_bytes`` in ``path``, which never blocks on
+    elasticsearch. :meth:`send` reads the chunks of the bulk requests straight
+    from the memory-mapped segments::
+
+        spool = BulkSpool("/var/spool/events")
+        # in the producers
+        spool.add({"_index": "events", "_source": event})
+        # in the sender
+        for ok, item in spool.send(es, follow=True):
+            ...
+
+    The position of the actions processed by elasticsearch is recorded in a
+    checkpoint file after every chunk and the segments behind it are
+    deleted. A spool opened again in the same ``path`` sends the actions
+    which weren't processed yet, some actions may be sent twice after a
+    crash. A chunk which failed with a ``TransportError`` isn't processed,
+    one with failed actions is. A spool is only meant to be used by a single
+    process at a time.
+
+    :arg path: directory holding the segments, created if it doesn't exist
+    :arg segment_bytes: size in bytes after which a new segment is started
+        (default: 64MB)
+    :arg serializer: serializer of the actions, a
+        :class:`~elasticsearch.serializer.JSONSerializer` by default
+    :arg expand_action_callback: callback executed on each action passed in,
+        should return a tuple containing the action line and the data line
+        (`None` if data line should be omitted).
+    :arg fsync: have the segments and the checkpoint synced to disk, after
+        every call to :meth:`add` for the segments
+    """
+
+    def __init__(
+        self,
+        path,
+        segment_bytes=64 * 1024 * 1024,
+        serializer=None,
+        expand_action_callback=expand_action,
+        fsync=False,
+    ):
+        self.path = path
+        self.segment_bytes = segment_bytes
+        self.serializer = serializer or JSONSerializer()
+        self.expand_action_callback = expand_action_callback
+        self.fsync = fsync
+
+        if not os.path.isdir(path):
+            os.makedirs(path)
+
+        self._lock = threading.Lock()
+        # notified when actions are added or the spool is closed
+        self._cond = threading.Condition(self._lock)
+        self._closed = False
+
+        # sequence numbers of the segments and their sizes
+        self._segments = sorted(
+            int(name[: -len(_SEGMENT_SUFFIX)])
+            for name in os.listdir(path)
+            if name.endswith(_SEGMENT_SUFFIX)
+        )
+        self._sizes = dict(
+            (segment, os.path.getsize(self._segment_path(segment)))
+            for segment in self._segments
+        )
+        # the mapped segment being read, as (segment, file, mmap)
+        self._mapped = None
+        # position of the actions processed so far
+        self._acked = self._read_checkpoint()
+
+        # a new segment is started every time, the last one may end with an
+        # incomplete action
+        self._writer = None
+        self._start_segment()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    @property
+    def backlog(self):
+        """Number of bytes of actions not processed by elasticsearch yet."""
+        with self._lock:
+            segment, offset = self._acked
+            return sum(size for s, size in self._sizes.items() if s >= segment) - offset
+
+    def add(self, action):
+        """Append an action to the spool."""
+        self.extend([action])
+
+    def extend(self, actions):
+        """Append actions to the spool."""
+        lines = b"".join(
+            line
+            for _, line in _serialize_actions(
+                actions, self.expand_action_callback, self.serializer, False
+            )
+        )
+        with self._lock:
+            if self._closed:
+                raise ValueError("Cannot add actions to a closed BulkSpool.")
+            self._writer.write(lines)
+            self._writer.flush()
+            if self.fsync:
+                os.fsync(self._writer.fileno())
+            self._sizes[self._segments[-1]] += len(lines)
+            if self._sizes[self._segments[-1]] >= self.segment_bytes:
+                self._start_segment()
+            self._cond.notify_all()
+
+    def close(self):
+        """
+        Close the segment being written, no actions can be added anymore and
+        :meth:`send` stops following the spool.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._close_writer()
+            self._cond.notify_all()
+
+    def send(
+        self,
+        client,
+        chunk_size=500,
+        max_chunk_bytes=100 * 1024 * 1024,
+        follow=False,
+        poll_interval=1.0,
+        raise_on_error=True,
+        raise_on_exception=True,
+        max_retries=0,
+        initial_backoff=2,
+        max_backoff=600,
+        yield_ok=True,
+        ignore_status=(),
+        *args,
+        **kwargs
+    ):
+        """
+        Send the actions of the spool not processed yet and yield the results
+        like :func:`~elasticsearch.helpers.streaming_bulk`. Only one thread
+        may send the actions of a spool at a time.
+
+        Documents rejected with a ``429`` status code are retried, after
+        their backoff, before the next chunk is read so that the checkpoint
+        can move on. The failed actions are reported without their ``data``,
+        it's only kept on disk.
+
+        :arg client: instance of :class:`~elasticsearch.Elasticsearch` to use
+        :arg chunk_size: number of docs in one chunk sent to es (default: 500),
+            or an :class:`~elasticsearch.helpers.AdaptiveChunkSize`
+        :arg max_chunk_bytes: the maximum size of the request in bytes
+            (default: 100MB)
+        :arg follow: keep waiting for new actions until the spool is closed
+            instead of returning once all of them were sent
+        :arg poll_interval: number of seconds to wait for new actions at a
+            time when following the spool
+        :arg raise_on_error: raise ``BulkIndexError`` containing errors (as
+            `.errors`) from the execution of the last chunk when some occur.
+            By default we raise.
+        :arg raise_on_exception: if ``False`` then don't propagate exceptions
+            from call to ``bulk`` and just report the items that failed as
+            failed. The chunk isn't processed then, it's sent again after a
+            backoff computed like for the retries of ``429``.
+        :arg max_retries: maximum number of times a document will be retried
+            when ``429`` is received, set to 0 (default) for no retries on
+            ``429``
+        :arg initial_backoff: number of seconds we should wait before the first
+            retry. Any subsequent retries will be powers of
+            ``initial_backoff * 2**retry_number``
+        :arg max_backoff: maximum number of seconds a retry will wait
+        :arg yield_ok: if set to False will skip successful documents in the
+            output
+        :arg ignore_status: list of HTTP status code that you want to ignore
+
+        Any additional keyword arguments will be passed to
+        :meth:`~elasticsearch.Elasticsearch.bulk`.
+        """
+
+        def send(bulk_data, bulk_actions):
+            results = _process_bulk_chunk(
+                client,
+                bulk_actions,
+                bulk_data,
+                raise_on_exception,
+                raise_on_error,
+                ignore_status,
+                *args,
+                **kwargs
+            )
+            if isinstance(chunk_size, AdaptiveChunkSize):
+                results = chunk_size.track(results)
+            return list(results)
+
+        def backoff(attempt):
+            return min(max_backoff, initial_backoff * 2 ** (attempt - 1))
+
+        if not isinstance(ignore_status, (list, tuple)):
+            ignore_status = (ignore_status,)
+
+        def request_failed(items):
+            # the items of a chunk whose request failed carry the exception
+            return any(
+                "exception" in info and info.get("status") not in ignore_status
+                for info in (next(iter(item.values())) for item in items)
+            )
+
+        # number of times in a row the request of the chunk failed
+        failures = 0
+        try:
+            while True:
+                chunk = self._read_chunk(chunk_size, max_chunk_bytes)
+                if chunk is None:
+                    with self._lock:
+                        if not follow or self._closed:
+                            return
+                        self._cond.wait(poll_interval)
+                    continue
+
+                bulk_data, bulk_actions, position = chunk
+                try:
+                    results = _send_in_order(
+                        send, bulk_data, bulk_actions, max_retries, backoff
+                    )
+                except BulkIndexError as e:
+                    # unless the request failed the actions went through,
+                    # their errors are reported
+                    if not request_failed(e.errors):
+                        self._ack(position)
+                    raise
+                if request_failed(info for ok, info in results if not ok):
+                    failures += 1
+                else:
+                    failures = 0
+                    self._ack(position)
+
+                for ok, info in results:
+                    if ok and not yield_ok:
+                        continue
+                    yield ok, info
+                if failures:
+                    time.sleep(backoff(failures))
+        finally:
+            self._unmap()
+
+    def _segment_path(self, segment):
+        return os.path.join(self.path, "%020d%s" % (segment, _SEGMENT_SUFFIX))
+
+    def _read_checkpoint(self):
+        try:
+            with open(os.path.join(self.path, _CHECKPOINT)) as f:
+                segment, offset = map(int, f.read().split())
+        except (IOError, OSError, ValueError):
+            segment, offset = -1, 0
+
+        # the segments processed before are gone, or were never deleted
+        for s in [s for s in self._segments if s < segment]:
+            self._remove_segment(s)
+        if not self._segments or self._segments[0] != segment:
+            segment = self._segments[0] if self._segments else 0
+            offset = 0
+        return segment, offset
+
+    def _write_checkpoint(self):
+        path = os.path.join(self.path, _CHECKPOINT)
+        with open(path + ".tmp", "w") as f:
+            f.write("%d %d\n" % self._acked)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        _replace(path + ".tmp", path)
+
+    def _start_segment(self):
+        self._close_writer()
+        segment = self._segments[-1] + 1 if self._segments else 0
+        self._writer = open(self._segment_path(segment), "ab")
+        self._segments.append(segment)
+        self._sizes[segment] = 0
+
+    def _close_writer(self):
+        if self._writer is not None:
+            if self.fsync:
+                os.fsync(self._writer.fileno())
+            self._writer.close()
+            self._writer = None
+
+    def _remove_segment(self, segment):
+        if self._mapped is not None and self._mapped[0] == segment:
+            self._unmap()
+        os.remove(self._segment_path(segment))
+        self._segments.remove(segment)
+        del self._sizes[segment]
+
+    def _map(self, segment, size):
+        """The memory map of at least ``size`` bytes of a segment."""
+        if self._mapped is not None:
+            if self._mapped[0] == segment and len(self._mapped[2]) >= size:
+                return self._mapped[2]
+            self._unmap()
+        f = open(self._segment_path(segment), "rb")
+        try:
+            mapped = mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ)
+        except Exception:
+            f.close()
+            raise
+        self._mapped = segment, f, mapped
+        return mapped
+
+    def _unmap(self):
+        if self._mapped is not None:
+            _, f, mapped = self._mapped
+            self._mapped = None
+            mapped.close()
+            f.close()
+
+    def _read_chunk(self, chunk_size, max_chunk_bytes):
+        """
+        Return the next chunk to send as ``(bulk_data, bulk_actions,
+        position)``, position being where the chunk ends, or ``None`` when
+        there isn't any action to send for now.
+        """
+        while True:
+            with self._lock:
+                segment, offset = self._acked
+                size = self._sizes.get(segment, 0)
+                writing = self._writer is not None and segment == self._segments[-1]
+            if offset < size:
+                break
+            if writing or segment not in self._sizes:
+                return None
+            # a segment finished before the spool was opened again
+            self._ack((segment, offset))
+
+        mapped = self._map(segment, size)
+        limit = _current_chunk_size(chunk_size)
+        bulk_data = []
+        end = offset
+        while end < size and len(bulk_data) < limit:
+            eol = mapped.find(b"\n", end, size)
+            if eol == -1:
+                break
+            action = self.serializer.loads(to_str(mapped[end:eol], "utf-8"))
+            op_type = next(iter(action))
+            if op_type != "delete":
+                eol = mapped.find(b"\n", eol + 1, size)
+                if eol == -1:
+                    break
+            if bulk_data and eol + 1 - offset > max_chunk_bytes:
+                break
+            bulk_data.append((action,) if op_type == "delete" else (action, None))
+            end = eol + 1
+
+        if not bulk_data:
+            if writing:
+                return None
+            # a segment left behind by a crash may end with half an action
+            logger.warning(
+                "Skipping %d bytes of an incomplete action at the end of %s",
+                size - offset,
+                self._segment_path(segment),
+            )
+            self._ack((segment, size))
+            return self._read_chunk(chunk_size, max_chunk_bytes)
+        return bulk_data, mapped[offset:end], (segment, end)
+
+    def _ack(self, position):
+        """Record the actions up to ``position`` as processed."""
+        with self._lock:
+            segment, offset = self._acked = position
+            # the segments read completely aren't needed anymore
+            while offset >= self._sizes[segment] and (
+                self._writer is None or segment != self._segments[-1]
+            ):
+                self._remove_segment(segment)
+                if not self._segments:
+                    break
+                segment, offset = self._acked = self._segments[0], 0
+            self._write_checkpoint()
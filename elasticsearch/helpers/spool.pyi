@@ -0,0 +1,81 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+import logging
+from typing import (
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from ..client import Elasticsearch
+from ..serializer import Serializer
+from .adaptive import AdaptiveChunkSize
+
+logger: logging.Logger
+
+class BulkSpool(object):
+    path: str
+    segment_bytes: int
+    serializer: Serializer
+    expand_action_callback: Callable[[Any], Tuple[Dict[str, Any], Optional[Any]]]
+    fsync: bool
+    def __init__(
+        self,
+        path: str,
+        segment_bytes: int = ...,
+        serializer: Optional[Serializer] = ...,
+        expand_action_callback: Callable[
+            [Any], Tuple[Dict[str, Any], Optional[Any]]
+        ] = ...,
+        fsync: bool = ...,
+    ) -> None: ...
+    def __enter__(self) -> "BulkSpool": ...
+    def __exit__(self, *_: Any) -> None: ...
+    @property
+    def backlog(self) -> int: ...
+    def add(self, action: Any) -> None: ...
+    def extend(self, actions: Iterable[Any]) -> None: ...
+    def close(self) -> None: ...
+    def send(
+        self,
+        client: Elasticsearch,
+        chunk_size: Union[int, AdaptiveChunkSize] = ...,
+        max_chunk_bytes: int = ...,
+        follow: bool = ...,
+        poll_interval: float = ...,
+        raise_on_error: bool = ...,
+        raise_on_exception: bool = ...,
+        max_retries: int = ...,
+        initial_backoff: Union[float, int] = ...,
+        max_backoff: Union[float, int] = ...,
+        yield_ok: bool = ...,
+        ignore_status: Optional[Union[int, Collection[int]]] = ...,
+        *args: Any,
+        **kwargs: Any
+    ) -> Generator[Tuple[bool, Any], None, None]: ...
+    def _read_chunk(
+        self, chunk_size: Union[int, AdaptiveChunkSize], max_chunk_bytes: int
+    ) -> Optional[Tuple[List[Any], bytes, Tuple[int, int]]]: ...
+    def _ack(self, position: Tuple[int, int]) -> None: ...
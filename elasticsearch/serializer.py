@@ -20,12 +20,14 @@ try:
 except ImportError:
     import json
 
+import re
 import uuid
 from datetime import date, datetime
 from decimal import Decimal
 
-from .compat import string_types
+from .compat import Mapping, string_types
 from .exceptions import ImproperlyConfigured, SerializationError
+from .utils import _LRUCache
 
 INTEGER_TYPES = ()
 FLOAT_TYPES = (Decimal,)
@@ -126,6 +128,10 @@ class JSONSerializer(Serializer):
         if isinstance(data, string_types):
             return data
 
+        # pre-serialized bodies without any parameters
+        if isinstance(data, BodyTemplate):
+            return data.render()
+
         try:
             return json.dumps(
                 data, default=self.default, ensure_ascii=False, separators=(",", ":")
@@ -134,6 +140,118 @@ class JSONSerializer(Serializer):
             raise SerializationError(data, e)
 
 
+class Param(object):
+    """
+    Named slot inside of a :class:`BodyTemplate`, its value is provided to
+    :meth:`BodyTemplate.render`.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return "Param(%r)" % (self.name,)
+
+
+class BodyTemplate(object):
+    """
+    Request body serialized once up front, leaving :class:`Param` slots that
+    are filled in by :meth:`render`. Only the parameter values are serialized
+    for each request which makes sending the same query over and over again
+    with only a few values changed a lot cheaper::
+
+        template = BodyTemplate({"query": {"term": {"user": Param("user")}}})
+        es.search(index="tweets", body=template.render(user="kimchy"))
+
+    A template without any parameters is a frozen body and can be passed as
+    the ``body`` directly.
+
+    :arg body: the body to serialize, containing :class:`Param` instances
+    :arg serializer: :class:`JSONSerializer` instance used for the body and
+        the parameter values
+    :arg cache_size: number of rendered bodies, keyed by their parameters, to
+        keep in a bounded LRU cache. Disabled by default.
+    """
+
+    _PARAM_MARKER = "__es_body_template_param_%s_%s__"
+
+    def __init__(self, body, serializer=None, cache_size=0):
+        self.serializer = serializer or JSONSerializer()
+        self._cache = _LRUCache(cache_size) if cache_size else None
+
+        token = uuid.uuid4().hex
+        params = []
+
+        def _replace_params(value):
+            if isinstance(value, Param):
+                params.append(value.name)
+                return self._PARAM_MARKER % (token, len(params) - 1)
+            elif isinstance(value, Mapping):
+                return dict((k, _replace_params(v)) for k, v in value.items())
+            elif isinstance(value, (list, tuple)):
+                return [_replace_params(v) for v in value]
+            return value
+
+        serialized = self.serializer.dumps(_replace_params(body))
+
+        # split the serialized body on the (quoted) parameter markers, every
+        # odd item in 'parts' is now the index of a parameter.
+        parts = re.split(
+            '"%s"' % (self._PARAM_MARKER % (token, "([0-9]+)")), serialized
+        )
+        self._literals = parts[::2]
+        self._params = [params[int(i)] for i in parts[1::2]]
+
+    @property
+    def params(self):
+        """Names of the parameters in the order they appear in the body."""
+        return list(self._params)
+
+    def _dumps_value(self, value):
+        # unlike JSONSerializer.dumps() strings have to be encoded as well
+        try:
+            return json.dumps(
+                value,
+                default=getattr(self.serializer, "default", None),
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+        except (ValueError, TypeError) as e:
+            raise SerializationError(value, e)
+
+    def render(self, **params):
+        """
+        Return the serialized body with the parameters filled in.
+        """
+        key = None
+        if self._cache is not None:
+            try:
+                # True, 1 and 1.0 are equal but aren't serialized the same
+                key = tuple((k, type(v), v) for k, v in sorted(params.items()))
+                hash(key)
+            except TypeError:
+                # unhashable parameter values can't be cached
+                key = None
+            else:
+                body = self._cache.get(key)
+                if body is not None:
+                    return body
+
+        out = [self._literals[0]]
+        for name, literal in zip(self._params, self._literals[1:]):
+            try:
+                value = params[name]
+            except KeyError:
+                raise ValueError("Missing value for template parameter %r." % name)
+            out.append(self._dumps_value(value))
+            out.append(literal)
+        body = "".join(out)
+
+        if key is not None:
+            self._cache.set(key, body)
+        return body
+
+
 DEFAULT_SERIALIZERS = {
     JSONSerializer.mimetype: JSONSerializer(),
     TextSerializer.mimetype: TextSerializer(),
@@ -15,7 +15,7 @@
 #  specific language governing permissions and limitations
 #  under the License.
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 class Serializer(object):
     mimetype: str
@@ -33,6 +33,22 @@ class JSONSerializer(Serializer):
     def loads(self, s: str) -> Any: ...
     def dumps(self, data: Any) -> str: ...
 
+class Param(object):
+    name: str
+    def __init__(self, name: str) -> None: ...
+
+class BodyTemplate(object):
+    serializer: Serializer
+    def __init__(
+        self,
+        body: Any,
+        serializer: Optional[Serializer] = ...,
+        cache_size: int = ...,
+    ) -> None: ...
+    @property
+    def params(self) -> List[str]: ...
+    def render(self, **params: Any) -> str: ...
+
 DEFAULT_SERIALIZERS: Dict[str, Serializer]
 
 class Deserializer(object):
@@ -20,7 +20,7 @@ from itertools import chain
 from platform import python_version
 
 from ._version import __versionstr__
-from .connection import Urllib3HttpConnection
+from .connection import ChunkedBody, Urllib3HttpConnection
 from .connection_pool import ConnectionPool, DummyConnectionPool, EmptyConnectionPool
 from .exceptions import (
     ConnectionError,
@@ -435,7 +435,7 @@ class Transport(object):
 
     def _resolve_request_args(self, method, headers, params, body):
         """Resolves parameters for .perform_request()"""
-        if body is not None:
+        if body is not None and not isinstance(body, ChunkedBody):
             body = self.serializer.dumps(body)
 
             # some clients or environments don't support sending GET with body
@@ -16,6 +16,8 @@
 #  under the License.
 
 import re
+import threading
+from collections import OrderedDict
 
 
 def _client_meta_version(version):
@@ -29,3 +31,36 @@ def _client_meta_version(version):
     if version_pre:
         version += "p"
     return version
+
+
+class _LRUCache(object):
+    """Small thread-safe bounded mapping evicting the least recently used key."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                return default
+            # re-insert to mark the key as the most recently used one
+            self._data[key] = value
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = value
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
@@ -15,4 +15,16 @@
 #  specific language governing permissions and limitations
 #  under the License.
 
+from typing import Generic, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
 def _client_meta_version(version: str) -> str: ...
+
+class _LRUCache(Generic[T]):
+    maxsize: int
+    def __init__(self, maxsize: int) -> None: ...
+    def __len__(self) -> int: ...
+    def get(self, key: Hashable, default: Optional[T] = ...) -> Optional[T]: ...
+    def set(self, key: Hashable, value: T) -> None: ...
+    def clear(self) -> None: ...
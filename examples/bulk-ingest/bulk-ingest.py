@@ -5,12 +5,11 @@
 
 """Script that downloads a public dataset and streams it to an Elasticsearch cluster"""
 
-import csv
 from os.path import abspath, join, dirname, exists
 import tqdm
 import urllib3
 from elasticsearch import Elasticsearch
-from elasticsearch.helpers import streaming_bulk
+from elasticsearch.helpers import bulk_from_file
 
 
 NYC_RESTAURANTS = (
@@ -61,28 +60,24 @@ def create_index(client):
     )
 
 
-def generate_actions():
-    """Reads the file through csv.DictReader() and for each row
-    yields a single document. This function is passed into the bulk()
-    helper to create many documents in sequence.
+def row_to_doc(row):
+    """Turns a row of the .csv file, as a dict keyed on the column
+    names, into a single document. This function is passed into the
+    bulk_from_file() helper which calls it in several processes at once.
     """
-    with open(DATASET_PATH, mode="r") as f:
-        reader = csv.DictReader(f)
+    doc = {
+        "_id": row["CAMIS"],
+        "name": row["DBA"],
+        "borough": row["BORO"],
+        "cuisine": row["CUISINE DESCRIPTION"],
+        "grade": row["GRADE"] or None,
+    }
 
-        for row in reader:
-            doc = {
-                "_id": row["CAMIS"],
-                "name": row["DBA"],
-                "borough": row["BORO"],
-                "cuisine": row["CUISINE DESCRIPTION"],
-                "grade": row["GRADE"] or None,
-            }
-
-            lat = row["Latitude"]
-            lon = row["Longitude"]
-            if lat not in ("", "0") and lon not in ("", "0"):
-                doc["location"] = {"lat": float(lat), "lon": float(lon)}
-            yield doc
+    lat = row["Latitude"]
+    lon = row["Longitude"]
+    if lat not in ("", "0") and lon not in ("", "0"):
+        doc["location"] = {"lat": float(lat), "lon": float(lon)}
+    return doc
 
 
 def main():
@@ -98,8 +93,12 @@ def main():
     print("Indexing documents...")
     progress = tqdm.tqdm(unit="docs", total=number_of_docs)
     successes = 0
-    for ok, action in streaming_bulk(
-        client=client, index="nyc-restaurants", actions=generate_actions(),
+    for ok, action in bulk_from_file(
+        client,
+        DATASET_PATH,
+        format="csv",
+        index="nyc-restaurants",
+        transform=row_to_doc,
     ):
         progress.update(1)
         successes += ok
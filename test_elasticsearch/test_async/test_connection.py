@@ -20,6 +20,7 @@ import gzip
 import io
 import ssl
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from platform import python_version
 
 import aiohttp
@@ -28,6 +29,8 @@ from mock import patch
 from multidict import CIMultiDict
 
 from elasticsearch import AIOHttpConnection, __versionstr__
+from elasticsearch._async.offload import Offloader
+from elasticsearch.connection import ChunkedBody
 
 pytestmark = pytest.mark.asyncio
 
@@ -167,6 +170,44 @@ class TestAIOHttpConnection:
         assert kwargs["headers"]["accept-encoding"] == "gzip,deflate"
         assert "content-encoding" not in kwargs["headers"]
 
+    async def test_http_compression_offloaded(self):
+        executor = ThreadPoolExecutor(1)
+        offloader = Offloader(executor, threshold=100)
+        con = await self._get_mock_connection(
+            {"http_compress": True, "offloader": offloader}
+        )
+
+        await con.perform_request("POST", "/_bulk", body=b"{}\n" * 50)
+        _, kwargs = con.session.request.call_args
+        assert gzip_decompress(kwargs["data"]) == b"{}\n" * 50
+        assert kwargs["headers"]["content-encoding"] == "gzip"
+
+        await con.perform_request("POST", "/_bulk", body=b"{}\n")
+        _, kwargs = con.session.request.call_args
+        assert gzip_decompress(kwargs["data"]) == b"{}\n"
+
+        assert 1 == offloader.stats()["offloaded"]
+        assert 2 == con.compression_policy.stats()["requests"]
+        executor.shutdown()
+
+    async def test_chunked_body_is_streamed(self):
+        async def chunks():
+            yield b'{"index":{}}\n'
+            yield b'{"a":1}\n'
+
+        for body in (
+            ChunkedBody([b'{"index":{}}\n', b'{"a":1}\n']),
+            ChunkedBody(chunks),
+        ):
+            con = await self._get_mock_connection({"http_compress": True})
+            await con.perform_request("POST", "/_bulk", body=body)
+
+            _, kwargs = con.session.request.call_args
+            assert kwargs["headers"]["content-encoding"] == "gzip"
+            data = b"".join([chunk async for chunk in kwargs["data"]])
+            assert gzip_decompress(data) == b'{"index":{}}\n{"a":1}\n'
+            assert 1 == con.compression_policy.stats()["requests"]
+
     def test_cloud_id_http_compress_override(self):
         # 'http_compress' will be 'True' by default for connections with
         # 'cloud_id' set but should prioritize user-defined values.
@@ -22,6 +22,7 @@ from mock import MagicMock, patch
 
 from elasticsearch import TransportError, helpers
 from elasticsearch.helpers import ScanError
+from elasticsearch.serializer import JSONSerializer
 
 pytestmark = pytest.mark.asyncio
 
@@ -48,6 +49,20 @@ class FailingBulkClient(object):
         return await self.client.bulk(*args, **kwargs)
 
 
+class SlowBulkClient(object):
+    def __init__(self, fail_at=()):
+        self.transport = MagicMock(serializer=JSONSerializer())
+        self._called = 0
+        self._fail_at = fail_at
+
+    async def bulk(self, *args, **kwargs):
+        self._called += 1
+        if self._called in self._fail_at:
+            raise TransportError(599, "Error!", {})
+        await asyncio.sleep(0.01)
+        return {"errors": False, "items": [{"index": {"status": 201}}]}
+
+
 class TestStreamingBulk(object):
     async def test_actions_remain_unchanged(self, async_client):
         actions = [{"_id": 1}, {"_id": 2}]
@@ -255,6 +270,176 @@ class TestStreamingBulk(object):
             await streaming_bulk()
         assert 4 == failing_client._called
 
+    async def test_repeated_actions_are_coalesced(self, async_client):
+        coalescer = helpers.ActionCoalescer()
+        actions = [{"_id": 1, "v": v} for v in range(5)] + [
+            {"_op_type": "update", "_id": 2, "doc_as_upsert": True, "doc": {"f": f}}
+            for f in ("a", "b")
+        ]
+
+        results = [
+            x
+            async for x in helpers.async_streaming_bulk(
+                async_client,
+                actions,
+                index="test-index",
+                refresh=True,
+                coalesce=coalescer,
+            )
+        ]
+
+        assert 2 == len(results)
+        assert 5 == coalescer.saved
+        assert {"v": 4} == (await async_client.get(index="test-index", id=1))["_source"]
+        assert {"f": "b"} == (await async_client.get(index="test-index", id=2))[
+            "_source"
+        ]
+
+
+class TestParallelBulk(object):
+    async def test_all_documents_get_inserted(self, async_client):
+        docs = [{"answer": x, "_id": x} for x in range(100)]
+        results = [
+            x
+            async for x in helpers.async_parallel_bulk(
+                async_client, docs, index="test-index", refresh=True, chunk_size=10
+            )
+        ]
+
+        assert 100 == len(results)
+        assert all(ok for ok, _ in results)
+        assert 100 == (await async_client.count(index="test-index"))["count"]
+        assert {"answer": 42} == (await async_client.get(index="test-index", id=42))[
+            "_source"
+        ]
+
+    async def test_rejected_documents_are_retried(self, async_client):
+        failing_client = FailingBulkClient(
+            async_client, fail_with=TransportError(429, "Rejected!", {})
+        )
+        docs = [
+            {"_index": "i", "_id": 47, "f": "v"},
+            {"_index": "i", "_id": 45, "f": "v"},
+            {"_index": "i", "_id": 42, "f": "v"},
+        ]
+        results = [
+            x
+            async for x in helpers.async_parallel_bulk(
+                failing_client,
+                docs,
+                concurrency=2,
+                raise_on_exception=False,
+                raise_on_error=False,
+                chunk_size=1,
+                max_retries=1,
+                initial_backoff=0,
+            )
+        ]
+        assert 3 == len(results)
+        assert [True, True, True] == [r[0] for r in results]
+        await async_client.indices.refresh(index="i")
+        res = await async_client.search(index="i")
+        assert {"value": 3, "relation": "eq"} == res["hits"]["total"]
+        assert 4 == failing_client._called
+
+    async def test_errors_are_raised(self, async_client):
+        failing_client = FailingBulkClient(async_client)
+
+        with pytest.raises(TransportError):
+            async for _ in helpers.async_parallel_bulk(
+                failing_client, [{"a": 42}, {"a": 39}], index="i", chunk_size=1
+            ):
+                pass
+
+    async def test_generator_can_be_closed_early(self):
+        # more senders than chunks fitting in the queue
+        results = helpers.async_parallel_bulk(
+            SlowBulkClient(),
+            [{"a": x} for x in range(50)],
+            index="i",
+            chunk_size=1,
+            concurrency=8,
+            queue_size=2,
+        )
+
+        assert (await results.__anext__())[0]
+        await asyncio.wait_for(results.aclose(), 1)
+
+    async def test_errors_are_raised_with_more_senders_than_queued_chunks(self):
+        with pytest.raises(TransportError):
+            await asyncio.wait_for(
+                self._consume(
+                    helpers.async_parallel_bulk(
+                        SlowBulkClient(fail_at=(2,)),
+                        [{"a": x} for x in range(50)],
+                        index="i",
+                        chunk_size=1,
+                        concurrency=3,
+                        queue_size=1,
+                    )
+                ),
+                1,
+            )
+
+    async def _consume(self, results):
+        async for _ in results:
+            pass
+
+
+class TestAsyncBulkIndexer(object):
+    async def test_all_documents_get_inserted(self, async_client):
+        async with helpers.AsyncBulkIndexer(
+            async_client, chunk_size=10, concurrency=2, index="test-index"
+        ) as indexer:
+            futures = [await indexer.add({"answer": x, "_id": x}) for x in range(100)]
+
+        results = [await f for f in futures]
+        assert all(ok for ok, _ in results)
+        assert 100 == indexer.stats()["succeeded"]
+        await async_client.indices.refresh(index="test-index")
+        assert 100 == (await async_client.count(index="test-index"))["count"]
+
+    async def test_chunks_are_sent_after_flush_interval(self, async_client):
+        indexer = helpers.AsyncBulkIndexer(
+            async_client, flush_interval=0.1, index="test-index"
+        )
+        result = await indexer.add({"answer": 42, "_id": 42})
+
+        ok, item = await asyncio.wait_for(result, 5)
+        assert ok
+        assert "42" == item["index"]["_id"]
+        await indexer.aclose()
+
+    async def test_rejected_documents_are_retried(self, async_client):
+        failing_client = FailingBulkClient(
+            async_client, fail_with=TransportError(429, "Rejected!", {})
+        )
+        async with helpers.AsyncBulkIndexer(
+            failing_client, chunk_size=1, max_retries=1, initial_backoff=0
+        ) as indexer:
+            futures = [
+                await indexer.add({"_index": "i", "_id": x, "f": "v"})
+                for x in (47, 45, 42)
+            ]
+
+        assert [True, True, True] == [(await f)[0] for f in futures]
+        assert 1 == indexer.stats()["retried"]
+        assert 4 == failing_client._called
+
+    async def test_errors_are_reported(self, async_client):
+        errors = []
+        async with helpers.AsyncBulkIndexer(
+            async_client, on_error=errors.append
+        ) as indexer:
+            result = await indexer.add({"_index": "i", "_id": 1, "a": 1})
+            await indexer.add({"_index": "i", "_id": 1, "_op_type": "create", "a": 1})
+
+        assert (await result)[0]
+        assert 1 == len(errors)
+        assert {"a": 1} == errors[0]["create"]["data"]
+        with pytest.raises(ValueError):
+            await indexer.add({"a": 1})
+
 
 class TestBulk(object):
     async def test_bulk_works_with_single_item(self, async_client):
@@ -385,6 +570,29 @@ class TestBulk(object):
         assert 1 == success
         assert 1 == failed
 
+    async def test_errors_are_handed_to_the_sink(self, async_client):
+        await async_client.indices.create(
+            "i",
+            {
+                "mappings": {"properties": {"a": {"type": "integer"}}},
+                "settings": {"number_of_shards": 1, "number_of_replicas": 0},
+            },
+        )
+        await async_client.cluster.health(wait_for_status="yellow")
+        sample = helpers.ErrorSample()
+
+        success, failed = await helpers.async_bulk(
+            async_client,
+            [{"a": 42}, {"a": "c", "_id": 2}],
+            index="i",
+            raise_on_error=False,
+            error_sink=sample,
+        )
+        assert 1 == success
+        assert 1 == failed
+        assert {"mapper_parsing_exception": 1} == sample.counts
+        assert {"a": "c"} == sample.items[0]["index"]["data"]
+
 
 class MockScroll:
     def __init__(self):
@@ -460,6 +668,27 @@ class TestScan(object):
         assert set(map(str, range(100))) == set(d["_id"] for d in docs)
         assert set(range(100)) == set(d["_source"]["answer"] for d in docs)
 
+    async def test_pages_can_be_prefetched(self, async_client, scan_teardown):
+        bulk = []
+        for x in range(100):
+            bulk.append({"index": {"_index": "test_index", "_id": x}})
+            bulk.append({"answer": x})
+        await async_client.bulk(bulk, refresh=True)
+
+        with patch.object(
+            async_client, "clear_scroll", wraps=async_client.clear_scroll
+        ) as spy:
+            docs = [
+                x
+                async for x in helpers.async_scan(
+                    async_client, index="test_index", size=7, prefetch=2
+                )
+            ]
+            spy.assert_called_once()
+
+        assert 100 == len(docs)
+        assert set(map(str, range(100))) == set(d["_id"] for d in docs)
+
     async def test_scroll_error(self, async_client, scan_teardown):
         bulk = []
         for x in range(4):
@@ -642,6 +871,86 @@ class TestScan(object):
             spy.assert_not_called()
 
 
+class TestParallelScan(object):
+    async def test_all_documents_are_read(self, async_client, scan_teardown):
+        bulk = []
+        for x in range(100):
+            bulk.append({"index": {"_index": "test_index", "_id": x}})
+            bulk.append({"answer": x})
+        await async_client.bulk(bulk, refresh=True)
+
+        with patch.object(
+            async_client, "clear_scroll", wraps=async_client.clear_scroll
+        ) as spy:
+            docs = [
+                x
+                async for x in helpers.async_parallel_scan(
+                    async_client, index="test_index", slices=3, size=10
+                )
+            ]
+            assert 3 == spy.call_count
+
+        assert 100 == len(docs)
+        assert set(map(str, range(100))) == set(d["_id"] for d in docs)
+
+    async def test_scrolls_are_cleared_when_abandoned(
+        self, async_client, scan_teardown
+    ):
+        bulk = []
+        for x in range(100):
+            bulk.append({"index": {"_index": "test_index", "_id": x}})
+            bulk.append({"answer": x})
+        await async_client.bulk(bulk, refresh=True)
+
+        with patch.object(
+            async_client, "clear_scroll", wraps=async_client.clear_scroll
+        ) as spy:
+            docs = helpers.async_parallel_scan(
+                async_client, index="test_index", slices=2, size=2, queue_size=1
+            )
+            await docs.__anext__()
+            await docs.aclose()
+            assert 2 == spy.call_count
+
+    async def test_shard_failures_are_raised(self, async_client, scan_teardown):
+        bulk = []
+        for x in range(4):
+            bulk.append({"index": {"_index": "test_index"}})
+            bulk.append({"value": x})
+        await async_client.bulk(bulk, refresh=True)
+
+        with patch.object(async_client, "scroll", MockScroll()):
+            with pytest.raises(ScanError):
+                _ = [
+                    x
+                    async for x in helpers.async_parallel_scan(
+                        async_client, index="test_index", slices=1, size=2
+                    )
+                ]
+
+
+class TestPitScan(object):
+    async def test_all_documents_are_read_and_resumed(self, async_client):
+        bulk = []
+        for x in range(10):
+            bulk.append({"index": {"_index": "test_index", "_id": x}})
+            bulk.append({"answer": x})
+        await async_client.bulk(bulk, refresh=True)
+
+        hits = helpers.async_pit_scan(
+            async_client, "test_index", page_size=3, sort=[{"answer": "asc"}]
+        )
+        docs = []
+        async for hit in hits:
+            docs.append(hit["_source"]["answer"])
+            if len(docs) == 4:
+                break
+        async for hit in helpers.async_pit_scan(async_client, cursor=hits.cursor):
+            docs.append(hit["_source"]["answer"])
+
+        assert list(range(10)) == docs
+
+
 @pytest.fixture(scope="function")
 async def reindex_setup(async_client):
     bulk = []
@@ -719,6 +1028,32 @@ class TestReindex(object):
             await async_client.get(index="prod_index", id=42)
         )["_source"]
 
+    async def test_pipeline_moves_and_transforms_documents(
+        self, async_client, reindex_setup
+    ):
+        def transform(hit):
+            if hit["_source"]["type"] == "answers":
+                hit["_source"]["reviewed"] = True
+                return hit
+
+        stats = await helpers.AsyncReindexPipeline(
+            async_client,
+            "test_index",
+            "prod_index",
+            transform=transform,
+            slices=2,
+            write_workers=2,
+            page_size=10,
+        ).run()
+        await async_client.indices.refresh()
+
+        assert 100 == stats["read"]["docs"]
+        assert 50 == stats["write"]["docs"]
+        assert 50 == (await async_client.count(index="prod_index"))["count"]
+        assert {"answer": 42, "correct": True, "type": "answers", "reviewed": True} == (
+            await async_client.get(index="prod_index", id=42)
+        )["_source"]
+
 
 @pytest.fixture(scope="function")
 async def parent_reindex_setup(async_client):
@@ -21,6 +21,7 @@ from __future__ import unicode_literals
 import asyncio
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 from mock import patch
@@ -251,6 +252,62 @@ class TestTransport:
             b"\xe4\xbd\xa0\xe5\xa5\xbd\xed\xa9\xaa",
         ) == t.get_connection().calls[0][0]
 
+    async def test_large_payloads_offloaded_to_executor(self):
+        executor = ThreadPoolExecutor(1)
+        t = AsyncTransport(
+            [{"data": '{"answer": 42}'}],
+            connection_class=DummyConnection,
+            offload_executor=executor,
+            offload_threshold=10,
+        )
+
+        await t.perform_request("GET", "/", body="small")
+        assert {"answer": 42} == await t.perform_request(
+            "GET", "/", body={"query": {"match_all": {}}}
+        )
+        assert (
+            "GET",
+            "/",
+            None,
+            b'{"query":{"match_all":{}}}',
+        ) == t.get_connection().calls[1][0]
+
+        stats = t.offloader.stats()
+        # the small body is encoded inline, the dict body and both responses aren't
+        assert 1 == stats["inline"]
+        assert 3 == stats["offloaded"]
+        executor.shutdown()
+
+    async def test_small_dict_bodies_serialized_inline(self):
+        executor = ThreadPoolExecutor(1)
+        t = AsyncTransport(
+            [{}],
+            connection_class=DummyConnection,
+            offload_executor=executor,
+            offload_threshold=100,
+        )
+
+        await t.perform_request("GET", "/", body={"query": {"match_all": {}}})
+        await t.perform_request("POST", "/", body={"ids": list(range(50))})
+
+        stats = t.offloader.stats()
+        # the small body and both responses are processed inline
+        assert 3 == stats["inline"]
+        assert 1 == stats["offloaded"]
+        assert t.kwargs["offloader"] is t.offloader
+        executor.shutdown()
+
+    async def test_payloads_processed_inline_without_executor(self):
+        t = AsyncTransport([{}], connection_class=DummyConnection)
+
+        await t.perform_request("GET", "/", body={"query": {"match_all": {}}})
+
+        stats = t.offloader.stats()
+        assert 2 == stats["inline"]
+        assert 0 == stats["offloaded"]
+        assert stats["max_inline_duration"] <= stats["inline_duration"]
+        assert "offloader" not in t.kwargs
+
     async def test_kwargs_passed_on_to_connections(self):
         t = AsyncTransport([{"host": "google.com"}], port=123)
         await t._async_call()
@@ -18,7 +18,13 @@
 
 from __future__ import unicode_literals
 
-from elasticsearch.client.utils import _bulk_body, _escape, _make_path, query_params
+from elasticsearch.client.utils import (
+    _PATH_CACHE,
+    _bulk_body,
+    _escape,
+    _make_path,
+    query_params,
+)
 from elasticsearch.compat import PY2
 
 from ..test_cases import SkipTest, TestCase
@@ -120,6 +126,16 @@ class TestQueryParams(TestCase):
 
 
 class TestMakePath(TestCase):
+    def test_string_paths_are_cached(self):
+        self.assertEqual("/index/_doc/1", _make_path("index", "_doc", "1"))
+        self.assertIn(("index", "_doc", "1"), _PATH_CACHE._data)
+        self.assertEqual("/index/_doc/1", _make_path("index", "_doc", "1"))
+
+    def test_non_string_parts_are_not_cached(self):
+        self.assertEqual("/a,b/_search", _make_path(["a", "b"], "_search"))
+        self.assertEqual("/true/_search", _make_path(True, "_search"))
+        self.assertEqual("/1/_search", _make_path(1, "_search"))
+
     def test_handles_unicode(self):
         id = "中文"
         self.assertEqual(
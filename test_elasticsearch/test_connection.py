@@ -32,6 +32,8 @@ from urllib3._collections import HTTPHeaderDict
 
 from elasticsearch import __versionstr__
 from elasticsearch.connection import (
+    ChunkedBody,
+    CompressionPolicy,
     Connection,
     RequestsHttpConnection,
     Urllib3HttpConnection,
@@ -318,6 +320,38 @@ class TestUrllib3Connection(TestCase):
         self.assertEqual(kwargs["headers"]["accept-encoding"], "gzip,deflate")
         self.assertNotIn("content-encoding", kwargs["headers"])
 
+    def test_http_compression_policy(self):
+        policy = CompressionPolicy(min_size=10, level=1, paths=("_bulk",))
+        con = self._get_mock_connection({"http_compress": policy})
+        self.assertIs(True, con.http_compress)
+        self.assertIs(policy, con.compression_policy)
+
+        body = b'{"index":{}}\n{"a":1}\n'
+        con.perform_request("POST", "/index/_bulk", body=body)
+        (_, _, req_body), kwargs = con.pool.urlopen.call_args
+        self.assertEqual(gzip_decompress(req_body), body)
+        self.assertEqual(kwargs["headers"]["content-encoding"], "gzip")
+
+        # too small
+        con.perform_request("POST", "/index/_bulk", body=b"{}")
+        (_, _, req_body), kwargs = con.pool.urlopen.call_args
+        self.assertEqual(req_body, b"{}")
+        self.assertNotIn("content-encoding", kwargs["headers"])
+
+        # not a compressed endpoint
+        con.perform_request("POST", "/index/_search", body=body)
+        (_, _, req_body), kwargs = con.pool.urlopen.call_args
+        self.assertEqual(req_body, body)
+        self.assertNotIn("content-encoding", kwargs["headers"])
+
+        stats = policy.stats()
+        self.assertEqual(1, stats["requests"])
+        self.assertEqual(2, stats["skipped"])
+        self.assertEqual(len(body), stats["bytes_in"])
+        self.assertEqual(
+            float(stats["bytes_out"]) / stats["bytes_in"], stats["ratio"]
+        )
+
     def test_cloud_id_http_compress_override(self):
         # 'http_compress' will be 'True' by default for connections with
         # 'cloud_id' set but should prioritize user-defined values.
@@ -465,6 +499,41 @@ class TestUrllib3Connection(TestCase):
         status, headers, data = con.perform_request("GET", "/")
         self.assertEqual(u"你好\uda6a", data)
 
+    def test_chunked_body_is_streamed(self):
+        con = self._get_mock_connection({"http_compress": True})
+        body = ChunkedBody(lambda: iter([b'{"index":{}}\n', b'{"a":1}\n']))
+
+        con.perform_request("POST", "/_bulk", body=body)
+        (_, _, req_body), kwargs = con.pool.urlopen.call_args
+        self.assertTrue(kwargs["chunked"])
+        self.assertEqual(kwargs["headers"]["content-encoding"], "gzip")
+        # can be sent again, for retries
+        for _ in range(2):
+            self.assertEqual(
+                gzip_decompress(b"".join(req_body)), b'{"index":{}}\n{"a":1}\n'
+            )
+
+        con.perform_request("POST", "/_bulk", body=b"{}")
+        _, kwargs = con.pool.urlopen.call_args
+        self.assertNotIn("chunked", kwargs)
+
+
+class TestCompressionPolicy(TestCase):
+    def test_compress_iter_matches_compress(self):
+        policy = CompressionPolicy(level=5)
+        chunks = [b"abc" * 1000, b"", b"def" * 1000]
+        streamed = b"".join(policy.compress_iter(iter(chunks)))
+        self.assertEqual(gzip_decompress(streamed), b"".join(chunks))
+        self.assertEqual(
+            gzip_decompress(policy.compress(b"".join(chunks))), b"".join(chunks)
+        )
+        self.assertEqual(2, policy.stats()["requests"])
+        self.assertEqual(12000, policy.stats()["bytes_in"])
+
+    def test_level_is_validated(self):
+        self.assertRaises(ValueError, CompressionPolicy, level=0)
+        self.assertRaises(ValueError, CompressionPolicy, level=10)
+
 
 class TestRequestsConnection(TestCase):
     def _get_mock_connection(
@@ -600,6 +669,17 @@ class TestRequestsConnection(TestCase):
         self.assertNotIn("content-encoding", req.headers)
         self.assertEqual(req.headers["accept-encoding"], "gzip,deflate")
 
+    def test_chunked_body_is_streamed(self):
+        con = self._get_mock_connection()
+        body = ChunkedBody([b'{"index":{}}\n', b'{"a":1}\n'])
+
+        con.perform_request("POST", "/_bulk", body=body)
+
+        req = con.session.send.call_args[0][0]
+        self.assertEqual("chunked", req.headers["transfer-encoding"])
+        self.assertNotIn("content-length", req.headers)
+        self.assertEqual(b'{"index":{}}\n{"a":1}\n', b"".join(req.body))
+
     def test_cloud_id_http_compress_override(self):
         # 'http_compress' will be 'True' by default for connections with
         # 'cloud_id' set but should prioritize user-defined values.
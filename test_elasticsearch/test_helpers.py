@@ -16,14 +16,22 @@
 #  specific language governing permissions and limitations
 #  under the License.
 
+import json
+import os
+import shutil
+import tempfile
 import threading
 import time
+from collections import OrderedDict
 
 import mock
 import pytest
 
 from elasticsearch import Elasticsearch, helpers
-from elasticsearch.helpers import actions
+from elasticsearch.compat import Mapping
+from elasticsearch.connection import ChunkedBody
+from elasticsearch.exceptions import TransportError
+from elasticsearch.helpers import actions, pipeline
 from elasticsearch.serializer import JSONSerializer
 
 from .test_cases import TestCase
@@ -74,6 +82,348 @@ class TestParallelBulk(TestCase):
         )
         self.assertTrue(len(set([r[1] for r in results])) > 1)
 
+    @mock.patch.object(Elasticsearch, "bulk")
+    def test_rejected_documents_are_retried(self, bulk):
+        rejected = set()
+
+        def _bulk(body, *args, **kwargs):
+            items = []
+            for line in body.splitlines()[1::2]:
+                n = json.loads(line)["n"]
+                if n % 10 == 0 and n not in rejected:
+                    rejected.add(n)
+                    items.append({"index": {"status": 429, "error": "rejected"}})
+                else:
+                    items.append({"index": {"status": 201, "n": n}})
+            return {"items": items}
+
+        bulk.side_effect = _bulk
+        results = list(
+            helpers.parallel_bulk(
+                Elasticsearch(),
+                ({"n": n} for n in range(100)),
+                chunk_size=7,
+                max_retries=1,
+                initial_backoff=0.01,
+                raise_on_error=False,
+            )
+        )
+
+        self.assertEqual(10, len(rejected))
+        self.assertTrue(all(ok for ok, _ in results))
+        self.assertEqual(
+            list(range(100)), sorted(info["index"]["n"] for _, info in results)
+        )
+
+    @mock.patch.object(Elasticsearch, "bulk")
+    def test_ordered_actions_are_applied_in_order_despite_retries(self, bulk):
+        applied = {}
+        rejected = set()
+
+        def _bulk(body, *args, **kwargs):
+            lines = body.splitlines()
+            docs = [
+                (json.loads(action)["index"]["_id"], json.loads(doc)["v"])
+                for action, doc in zip(lines[::2], lines[1::2])
+            ]
+            # like a shard's write queue being full, all the actions on a
+            # rejected document are rejected
+            full = set(
+                _id for _id, v in docs if v % 3 == 0 and (_id, v) not in rejected
+            )
+            items = []
+            for _id, version in docs:
+                # make the lanes race each other
+                time.sleep(0.001 * (_id % 3))
+                if _id in full:
+                    rejected.add((_id, version))
+                    items.append({"index": {"status": 429, "error": "rejected"}})
+                    continue
+                with lock_side_effect:
+                    applied.setdefault(_id, []).append(version)
+                items.append({"index": {"status": 200, "_id": str(_id)}})
+            return {"errors": True, "items": items}
+
+        bulk.side_effect = _bulk
+        results = list(
+            helpers.parallel_bulk(
+                Elasticsearch(),
+                ({"_id": i, "v": v} for v in range(10) for i in range(20)),
+                thread_count=4,
+                chunk_size=7,
+                ordered=True,
+                max_retries=3,
+                initial_backoff=0.001,
+                raise_on_error=False,
+            )
+        )
+
+        self.assertEqual(200, len(results))
+        self.assertTrue(all(ok for ok, _ in results))
+        self.assertTrue(rejected)
+        self.assertEqual({i: list(range(10)) for i in range(20)}, applied)
+
+    @mock.patch.object(Elasticsearch, "bulk")
+    def test_ordered_lanes_stop_on_errors(self, bulk):
+        bulk.side_effect = TransportError(500, "Error!", {})
+
+        with pytest.raises(TransportError):
+            list(
+                helpers.parallel_bulk(
+                    Elasticsearch(),
+                    ({"_id": i} for i in range(100)),
+                    chunk_size=2,
+                    ordered=True,
+                )
+            )
+
+    @mock.patch.object(Elasticsearch, "bulk")
+    def test_ordered_string_actions_are_spread_over_the_lanes(self, bulk):
+        bulk.side_effect = lambda body, *args, **kwargs: {
+            "items": [{"index": {"status": 201}} for _ in body.splitlines()[::2]]
+        }
+
+        results = list(
+            helpers.parallel_bulk(
+                Elasticsearch(),
+                ('{"n":%d}' % i for i in range(10)),
+                thread_count=2,
+                chunk_size=2,
+                ordered=True,
+            )
+        )
+
+        self.assertEqual(10, len(results))
+        self.assertTrue(all(ok for ok, _ in results))
+
+    @mock.patch.object(Elasticsearch, "bulk")
+    def test_successes_left_out_of_responses_with_errors(self, bulk):
+        bulk.side_effect = lambda body, *args, **kwargs: {
+            "errors": True,
+            "items": [
+                {"index": {"status": 400 if json.loads(doc)["n"] % 2 else 201}}
+                for doc in body.splitlines()[1::2]
+            ],
+        }
+
+        for ordered in (False, True):
+            results = list(
+                helpers.parallel_bulk(
+                    Elasticsearch(),
+                    ({"_id": i, "n": i} for i in range(10)),
+                    chunk_size=2,
+                    ordered=ordered,
+                    yield_ok=False,
+                    raise_on_error=False,
+                )
+            )
+
+            self.assertEqual([False] * 5, [ok for ok, _ in results])
+
+    def test_lane_key(self):
+        self.assertEqual("1", actions._lane_key(({"index": {"_id": 1}}, {})))
+        self.assertEqual(
+            "r", actions._lane_key(({"update": {"routing": "r"}}, {"doc": {}}))
+        )
+        self.assertIsNone(actions._lane_key(({"index": {}}, {})))
+        self.assertIsNone(actions._lane_key(('{"index":{}}', '{"n":1}')))
+        self.assertEqual(
+            "2",
+            actions._lane_key(actions._Serialized(({"delete": {"_id": 2}},), b"{}\n")),
+        )
+
+    @mock.patch.object(Elasticsearch, "bulk")
+    def test_actions_serialized_in_processes(self, bulk):
+        def _bulk(body, *args, **kwargs):
+            docs = [json.loads(line)["n"] for line in body.splitlines()[1::2]]
+            return {
+                "items": [
+                    {"index": {"status": 400 if n == 42 else 201, "n": n}} for n in docs
+                ]
+            }
+
+        bulk.side_effect = _bulk
+        results = list(
+            helpers.parallel_bulk(
+                Elasticsearch(),
+                ({"_id": n, "n": n} for n in range(100)),
+                chunk_size=10,
+                process_count=2,
+                raise_on_error=False,
+                raise_on_exception=False,
+            )
+        )
+
+        self.assertEqual(
+            list(range(100)), sorted(info["index"]["n"] for _, info in results)
+        )
+        self.assertEqual(
+            [{"index": {"status": 400, "n": 42}}], [i for ok, i in results if not ok]
+        )
+
+    @mock.patch.object(Elasticsearch, "bulk")
+    def test_errors_keep_the_documents_serialized_in_processes(self, bulk):
+        bulk.return_value = {"items": [{"index": {"status": 400}}]}
+
+        with pytest.raises(helpers.BulkIndexError) as e:
+            list(
+                helpers.parallel_bulk(
+                    Elasticsearch(), [{"_id": 1, "f": "v"}], process_count=1
+                )
+            )
+        self.assertEqual(
+            [{"index": {"status": 400, "data": {"f": "v"}}}], e.value.errors
+        )
+
+    def test_serialize_actions(self):
+        serialized = actions._serialize_actions(
+            [{"_id": 1, "f": "v"}, {"_op_type": "delete", "_id": 2}],
+            actions.expand_action,
+            JSONSerializer(),
+            keep_source=False,
+        )
+
+        self.assertEqual(
+            [
+                (
+                    ({"index": {"_id": 1}}, None),
+                    b'{"index":{"_id":1}}\n{"f":"v"}\n',
+                ),
+                (({"delete": {"_id": 2}},), b'{"delete":{"_id":2}}\n'),
+            ],
+            serialized,
+        )
+
+
+def row_to_action(row):
+    # skips the odd rows, module level to be sent to the worker processes
+    if int(row["n"]) % 2:
+        return None
+    return {"_id": row["n"], "name": row["name"].upper()}
+
+
+class TestBulkFromFile(TestCase):
+    def setup_method(self, _):
+        self.path = tempfile.mkdtemp()
+
+    def teardown_method(self, _):
+        shutil.rmtree(self.path)
+
+    def write(self, name, content):
+        path = os.path.join(self.path, name)
+        with open(path, "wb") as f:
+            f.write(content)
+        return path
+
+    def test_ranges_end_on_line_boundaries(self):
+        path = self.write("docs.ndjson", b"".join(b"%03d\n" % i for i in range(10)))
+
+        self.assertEqual(
+            [(0, 12), (12, 24), (24, 36), (36, 40)],
+            helpers.files._line_ranges(path, 10),
+        )
+        self.assertEqual([(36, 40)], helpers.files._line_ranges(path, 100, 36))
+        self.assertEqual([], helpers.files._line_ranges(path, 10, 40))
+
+    @mock.patch.object(Elasticsearch, "bulk")
+    def test_ndjson_lines_are_sent_as_they_are(self, bulk):
+        bulk.side_effect = lambda body, **kwargs: {
+            "items": [{"index": {"status": 201}} for _ in body.splitlines()[::2]]
+        }
+        lines = [b'{"n": %d, "f":  "spaced"}' % i for i in range(100)]
+        path = self.write("docs.ndjson", b"\n".join(lines) + b"\n")
+
+        results = list(
+            helpers.bulk_from_file(
+                Elasticsearch(),
+                path,
+                index="i",
+                workers=2,
+                range_bytes=500,
+                chunk_size=30,
+            )
+        )
+
+        self.assertEqual(100, len(results))
+        sent = b"".join(c[0][0] for c in bulk.call_args_list).splitlines()
+        self.assertEqual([b'{"index":{}}'] * 100, sent[::2])
+        self.assertEqual(sorted(lines), sorted(sent[1::2]))
+        self.assertEqual("i", bulk.call_args[1]["index"])
+
+    def test_transformed_ndjson_lines_only_end_on_newlines(self):
+        serializer = JSONSerializer()
+        docs = [{"name": u"a\u2028b\x85c\x1cd"}, {"name": u"e"}]
+        content = "".join(serializer.dumps(doc) + "\n" for doc in docs)
+        path = self.write("docs.ndjson", content.encode("utf-8"))
+
+        serialized = helpers.files._parse_range(
+            (0, os.path.getsize(path)),
+            path=path,
+            format="ndjson",
+            transform=lambda doc: doc,
+            expand_action_callback=actions.expand_action,
+            serializer=serializer,
+            keep_source=True,
+            encoding="utf-8",
+            fieldnames=None,
+            csv_options={},
+        )
+
+        self.assertEqual(docs, [data[1] for data, _ in serialized])
+
+    @mock.patch.object(Elasticsearch, "bulk")
+    def test_failed_ndjson_lines_keep_their_document(self, bulk):
+        bulk.side_effect = lambda body, **kwargs: {
+            "errors": True,
+            "items": [
+                {"index": {"status": 400 if b"bad" in doc else 201}}
+                for doc in body.splitlines()[1::2]
+            ],
+        }
+        path = self.write("docs.ndjson", b'{"n": 1}\n{"n": "bad"}\n{bad\n')
+
+        with pytest.raises(helpers.BulkIndexError) as e:
+            list(helpers.bulk_from_file(Elasticsearch(), path, index="i", workers=1))
+
+        self.assertEqual(
+            [{"n": "bad"}, "{bad"], [err["index"]["data"] for err in e.value.errors]
+        )
+
+    @mock.patch.object(Elasticsearch, "bulk")
+    def test_csv_rows_are_transformed(self, bulk):
+        bulk.side_effect = lambda body, **kwargs: {
+            "items": [{"index": {"status": 201}}]
+        }
+        path = self.write(
+            "docs.csv",
+            b"n,name\r\n" + b"".join(b'%d,"n, %d"\r\n' % (i, i) for i in range(6)),
+        )
+
+        results = list(
+            helpers.bulk_from_file(
+                Elasticsearch(),
+                path,
+                format="csv",
+                transform=row_to_action,
+                workers=2,
+                range_bytes=10,
+                chunk_size=1,
+            )
+        )
+
+        self.assertEqual(3, len(results))
+        self.assertEqual(
+            [
+                b'{"index":{"_id":"%d"}}\n{"name":"N, %d"}\n' % (i, i)
+                for i in range(0, 6, 2)
+            ],
+            sorted(c[0][0] for c in bulk.call_args_list),
+        )
+
+    def test_unknown_formats_are_rejected(self):
+        with pytest.raises(ValueError):
+            list(helpers.bulk_from_file(Elasticsearch(), "docs.xml", format="xml"))
+
 
 class TestChunkActions(TestCase):
     def setup_method(self, _):
@@ -203,9 +553,222 @@ class TestChunkActions(TestCase):
         )
         self.assertEqual(25, len(chunks))
         for chunk_data, chunk_actions in chunks:
-            chunk = u"".join(chunk_actions)
-            chunk = chunk if isinstance(chunk, str) else chunk.encode("utf-8")
-            self.assertLessEqual(len(chunk), max_byte_size)
+            self.assertIsInstance(chunk_actions, bytes)
+            self.assertLessEqual(len(chunk_actions), max_byte_size)
+
+    def test_chunks_are_encoded_once_into_bulk_body(self):
+        docs = [({"index": {}}, {"name": u"你好"}), ({"delete": {"_id": 1}}, None)]
+        chunks = list(helpers._chunk_actions(docs, 10, 99999999, JSONSerializer()))
+
+        self.assertEqual(1, len(chunks))
+        chunk_data, chunk_actions = chunks[0]
+        self.assertEqual(
+            u'{"index":{}}\n{"name":"你好"}\n{"delete":{"_id":1}}\n'.encode("utf-8"),
+            chunk_actions,
+        )
+        self.assertEqual(
+            [({"index": {}}, {"name": u"你好"}), ({"delete": {"_id": 1}},)], chunk_data
+        )
+        self.assertIs(chunk_actions, actions._bulk_chunk_body(chunk_actions))
+        self.assertEqual('{"delete":{}}\n', actions._bulk_chunk_body(['{"delete":{}}']))
+
+    def test_streamed_chunks_match_serialized_chunks(self):
+        serializer = JSONSerializer()
+        for chunk_size, max_chunk_bytes in ((100000, 170), (10, 99999999)):
+            expected = list(
+                helpers._chunk_actions(
+                    self.actions, chunk_size, max_chunk_bytes, serializer
+                )
+            )
+            streamed = []
+            for chunk in actions._stream_chunks(
+                self.actions, chunk_size, max_chunk_bytes, serializer
+            ):
+                # bulk_data is filled in while the body is consumed
+                body = b"".join(chunk)
+                streamed.append((chunk.bulk_data, body))
+                # a retry sends the same body again
+                self.assertEqual(body, b"".join(chunk))
+            self.assertEqual(expected, streamed)
+
+    def test_streamed_chunk_not_sent_keeps_its_actions(self):
+        chunks = actions._stream_chunks(self.actions, 50, 99999999, JSONSerializer())
+        # never sent, its first action is passed on to the next chunk
+        self.assertEqual([], next(chunks).bulk_data)
+
+        sent = []
+        for chunk in chunks:
+            list(chunk)
+            sent.append(chunk.bulk_data)
+        self.assertEqual([50, 50], [len(bulk_data) for bulk_data in sent])
+        self.assertEqual(self.actions[0], sent[0][0])
+
+    @mock.patch.object(Elasticsearch, "bulk")
+    def test_streaming_bulk_streams_body(self, bulk):
+        def _bulk(body, *args, **kwargs):
+            self.assertIsInstance(body, ChunkedBody)
+            lines = b"".join(body).splitlines()
+            return {"items": [{"index": {"status": 201}} for _ in lines[::2]]}
+
+        bulk.side_effect = _bulk
+        results = list(
+            helpers.streaming_bulk(
+                Elasticsearch(),
+                ({"_index": "i", "n": n} for n in range(100)),
+                chunk_size=30,
+                stream_body=True,
+            )
+        )
+
+        self.assertEqual(100, len(results))
+        self.assertTrue(all(ok for ok, _ in results))
+        self.assertEqual(4, bulk.call_count)
+
+    @mock.patch.object(Elasticsearch, "bulk")
+    def test_rejected_documents_are_merged_into_later_chunks(self, bulk):
+        bodies = []
+
+        def _bulk(body, *args, **kwargs):
+            docs = [json.loads(line)["n"] for line in body.splitlines()[1::2]]
+            bodies.append(docs)
+            return {
+                "items": [{"index": {"status": 429 if n == 0 else 201}} for n in docs]
+            }
+
+        bulk.side_effect = _bulk
+        results = list(
+            helpers.streaming_bulk(
+                Elasticsearch(),
+                ({"n": n} for n in range(30)),
+                chunk_size=10,
+                max_retries=2,
+                initial_backoff=0,
+                raise_on_error=False,
+            )
+        )
+
+        # the rejected document rides along with the next chunks instead of
+        # holding them up
+        self.assertEqual(4, len(bodies))
+        self.assertEqual([1, 1, 1, 0], [docs.count(0) for docs in bodies])
+        self.assertEqual(29, len([ok for ok, _ in results if ok]))
+        self.assertEqual(
+            [(False, {"index": {"status": 429}})],
+            [(ok, info) for ok, info in results if not ok],
+        )
+
+    def test_chunks_can_drop_the_source(self):
+        chunks = list(
+            helpers._chunk_actions(
+                self.actions[:2], 10, 99999999, JSONSerializer(), keep_source=False
+            )
+        )
+
+        self.assertEqual(1, len(chunks))
+        bulk_data, bulk_actions = chunks[0]
+        self.assertEqual([({"index": {}}, None), ({"index": {}}, None)], bulk_data)
+        self.assertIn(b'"i":1', bulk_actions)
+
+    def test_split_actions_into_their_lines(self):
+        docs = [({"delete": {"_id": 1}}, None), ({"index": {}}, {"f": "a\nb"})]
+        ((bulk_data, bulk_actions),) = helpers._chunk_actions(
+            docs, 10, 99999999, JSONSerializer()
+        )
+
+        self.assertEqual(
+            [b'{"delete":{"_id":1}}\n', b'{"index":{}}\n{"f":"a\\nb"}\n'],
+            actions._split_actions(bulk_data, bulk_actions),
+        )
+        self.assertEqual(
+            [None, None], actions._split_actions(bulk_data, ChunkedBody([]))
+        )
+
+    @mock.patch.object(Elasticsearch, "bulk")
+    def test_rejected_documents_are_not_serialized_again(self, bulk):
+        bodies = []
+
+        def _bulk(body, *args, **kwargs):
+            bodies.append(body)
+            status = 429 if len(bodies) == 1 else 201
+            return {"items": [{"index": {"status": status}}]}
+
+        bulk.side_effect = _bulk
+        client = Elasticsearch()
+        serializer = client.transport.serializer
+        with mock.patch.object(serializer, "dumps", wraps=serializer.dumps) as dumps:
+            results = list(
+                helpers.streaming_bulk(
+                    client,
+                    [{"_id": 1, "f": "v"}],
+                    max_retries=1,
+                    initial_backoff=0,
+                    raise_on_error=False,
+                )
+            )
+
+        self.assertEqual([True], [ok for ok, _ in results])
+        self.assertEqual(2, dumps.call_count)
+        self.assertEqual(bodies[0], bodies[1])
+
+    @mock.patch.object(Elasticsearch, "bulk")
+    def test_rejected_requests_are_retried(self, bulk):
+        bulk.side_effect = [
+            TransportError(429, "rejected"),
+            {"items": [{"index": {"status": 201}} for _ in range(5)]},
+        ]
+        results = list(
+            helpers.streaming_bulk(
+                Elasticsearch(),
+                ({"n": n} for n in range(5)),
+                max_retries=1,
+                initial_backoff=0,
+            )
+        )
+
+        self.assertEqual(2, bulk.call_count)
+        self.assertEqual(5, len(results))
+
+    def test_error_free_response_items_are_skipped(self):
+        bulk_data = [({"index": {}}, {"i": 1})]
+        resp = {"errors": False, "items": [{"index": {"status": 201}}]}
+
+        self.assertEqual(
+            [],
+            list(
+                actions._process_bulk_chunk_success(resp, bulk_data, (), yield_ok=False)
+            ),
+        )
+        self.assertEqual(
+            [(True, {"index": {"status": 201}})],
+            list(actions._process_bulk_chunk_success(resp, bulk_data, ())),
+        )
+
+    @mock.patch.object(Elasticsearch, "bulk")
+    def test_lean_bulk_counts_successes_without_items(self, bulk):
+        def _bulk(body, *args, **kwargs):
+            docs = [json.loads(line)["n"] for line in body.splitlines()[1::2]]
+            if 3 not in docs:
+                return {"errors": False}
+            return {
+                "errors": True,
+                "items": [
+                    {"index": {"status": 400 if n == 3 else 201, "_id": str(n)}}
+                    for n in docs
+                ],
+            }
+
+        bulk.side_effect = _bulk
+        success, errors = helpers.bulk(
+            Elasticsearch(),
+            ({"n": n} for n in range(10)),
+            chunk_size=4,
+            lean=True,
+            raise_on_error=False,
+        )
+
+        self.assertEqual(9, success)
+        self.assertEqual([{"index": {"status": 400, "_id": "3"}}], errors)
+        self.assertEqual(actions._LEAN_FILTER_PATH, bulk.call_args[1]["filter_path"])
 
     def test_add_helper_meta_to_kwargs(self):
         self.assertEqual(
@@ -222,8 +785,1171 @@ class TestChunkActions(TestCase):
         )
 
 
+class TestAdaptiveChunkSize(TestCase):
+    def test_additive_increase_multiplicative_decrease(self):
+        chunk_size = helpers.AdaptiveChunkSize(
+            initial=100, max_size=160, target_latency=1.0, increase=50
+        )
+        chunk_size.record(0.5)
+        self.assertEqual(150, chunk_size.size)
+        chunk_size.record(0.5)
+        self.assertEqual(160, chunk_size.size)
+        chunk_size.record(0.5)
+        chunk_size.record(2.0)
+        self.assertEqual(80, chunk_size.size)
+        chunk_size.record(0.1, rejected=True)
+        self.assertEqual(40, chunk_size.size)
+
+        self.assertEqual(
+            [
+                (100, 150, "increase"),
+                (150, 160, "increase"),
+                (160, 80, "latency"),
+                (80, 40, "rejected"),
+            ],
+            [adjustment[1:] for adjustment in chunk_size.history],
+        )
+
+    def test_parameters_are_validated(self):
+        self.assertRaises(ValueError, helpers.AdaptiveChunkSize, decrease=1)
+        self.assertRaises(ValueError, helpers.AdaptiveChunkSize, initial=5)
+
+    def test_chunker_follows_size(self):
+        chunk_size = helpers.AdaptiveChunkSize(initial=10, min_size=5)
+        chunker = actions._ActionChunker(chunk_size, 99999999, JSONSerializer())
+        chunks = [chunker.feed({"index": {}}, {"i": i}) for i in range(11)]
+        self.assertEqual(10, len(chunks[-1][0]))
+
+        chunk_size.record(0, rejected=True)
+        chunks = [chunker.feed({"index": {}}, {"i": i}) for i in range(5)]
+        self.assertEqual(5, len(chunks[-1][0]))
+
+    @mock.patch.object(Elasticsearch, "bulk")
+    def test_rejections_shrink_streaming_bulk_chunks(self, bulk):
+        def _bulk(body, *args, **kwargs):
+            lines = body.splitlines()[::2]
+            items = [{"index": {"status": 201}} for _ in lines]
+            items[-1] = {
+                "index": {
+                    "status": 429,
+                    "error": {"type": "es_rejected_execution_exception"},
+                }
+            }
+            return {"items": items}
+
+        bulk.side_effect = _bulk
+        chunk_size = helpers.AdaptiveChunkSize(initial=40, min_size=10)
+        results = list(
+            helpers.streaming_bulk(
+                Elasticsearch(),
+                ({"n": n} for n in range(100)),
+                chunk_size=chunk_size,
+                raise_on_error=False,
+            )
+        )
+
+        self.assertEqual(100, len(results))
+        self.assertEqual(
+            [40, 20, 10, 10, 10, 10],
+            [len(call[0][0].splitlines()) // 2 for call in bulk.call_args_list],
+        )
+        self.assertEqual(10, chunk_size.size)
+        self.assertEqual(["rejected", "rejected"], [a[3] for a in chunk_size.history])
+
+
+class TestActionCoalescer(TestCase):
+    def coalesce(self, docs, **kwargs):
+        coalescer = helpers.ActionCoalescer(**kwargs)
+        expanded = list(coalescer.coalesce(map(helpers.expand_action, docs)))
+        return coalescer, expanded
+
+    def test_repeated_index_actions_keep_the_last_one(self):
+        coalescer, expanded = self.coalesce(
+            [{"_id": 1, "v": 1}, {"_id": 2, "v": 1}, {"_id": 1, "v": 2}]
+        )
+
+        self.assertEqual(
+            [({"index": {"_id": 1}}, {"v": 2}), ({"index": {"_id": 2}}, {"v": 1})],
+            expanded,
+        )
+        self.assertEqual(1, coalescer.saved)
+
+    def test_partial_updates_are_merged(self):
+        coalescer, expanded = self.coalesce(
+            [
+                {"_op_type": "update", "_id": 1, "doc": {"a": 1, "o": {"x": 1}}},
+                {"_op_type": "update", "_id": 1, "doc": {"b": 2, "o": {"y": 2}}},
+                {"_op_type": "update", "_id": 1, "doc": {"a": 3}},
+            ]
+        )
+
+        self.assertEqual(
+            [
+                (
+                    {"update": {"_id": 1}},
+                    {"doc": {"a": 3, "b": 2, "o": {"x": 1, "y": 2}}},
+                )
+            ],
+            expanded,
+        )
+        self.assertEqual(2, coalescer.saved)
+
+    def test_delete_after_index_collapses_to_a_delete(self):
+        coalescer, expanded = self.coalesce(
+            [
+                {"_id": 1, "v": 1},
+                {"_id": 1, "v": 2},
+                {"_op_type": "delete", "_id": 1},
+            ]
+        )
+
+        self.assertEqual([({"delete": {"_id": 1}}, None)], expanded)
+        self.assertEqual(2, coalescer.saved)
+
+    def test_actions_that_cannot_be_combined_keep_their_order(self):
+        docs = [
+            {"_op_type": "delete", "_id": 1},
+            {"_op_type": "update", "_id": 1, "doc": {"v": 1}},
+            {"_op_type": "update", "_id": 1, "script": "ctx._source.v++"},
+            {"_id": 1, "v": 3, "if_seq_no": 1, "if_primary_term": 1},
+            {"_op_type": "create", "_id": 2, "v": 1},
+            {"_op_type": "delete", "_id": 2},
+            {"v": 1},
+        ]
+        coalescer, expanded = self.coalesce(docs)
+
+        self.assertEqual(
+            [
+                ({"delete": {"_id": 1}}, None),
+                ({"update": {"_id": 1}}, {"doc": {"v": 1}}),
+                ({"update": {"_id": 1}}, {"script": "ctx._source.v++"}),
+                ({"create": {"_id": 2}}, {"v": 1}),
+                ({"index": {}}, {"v": 1}),
+                ({"index": {"_id": 1, "if_seq_no": 1, "if_primary_term": 1}}, {"v": 3}),
+                ({"delete": {"_id": 2}}, None),
+            ],
+            expanded,
+        )
+        self.assertEqual(0, coalescer.saved)
+
+    def test_documents_are_keyed_on_index_and_routing(self):
+        coalescer, expanded = self.coalesce(
+            [
+                {"_index": "a", "_id": 1},
+                {"_index": "b", "_id": 1},
+                {"_index": "a", "_id": 1, "routing": "r"},
+            ]
+        )
+
+        self.assertEqual(3, len(expanded))
+        self.assertEqual(0, coalescer.saved)
+
+    def test_window_is_limited_by_size_and_time(self):
+        coalescer = helpers.ActionCoalescer(max_actions=2, max_delay=0.05)
+        sent = []
+        for i in range(3):
+            sent += coalescer._feed(helpers.expand_action({"_id": i}))
+        self.assertEqual([({"index": {"_id": 0}}, {})], sent)
+
+        time.sleep(0.06)
+        sent = coalescer._feed(helpers.expand_action({"_id": 1, "v": 1}))
+        self.assertEqual(
+            [({"index": {"_id": 1}}, {}), ({"index": {"_id": 2}}, {})], sent
+        )
+        self.assertEqual([({"index": {"_id": 1}}, {"v": 1})], coalescer._drain())
+
+    @mock.patch.object(Elasticsearch, "bulk")
+    def test_streaming_bulk_sends_coalesced_actions(self, bulk):
+        bulk.return_value = {"items": [{"index": {"status": 200}}]}
+        coalescer = helpers.ActionCoalescer()
+
+        results = list(
+            helpers.streaming_bulk(
+                Elasticsearch(),
+                ({"_id": 1, "v": v} for v in range(10)),
+                coalesce=coalescer,
+            )
+        )
+
+        self.assertEqual(1, len(results))
+        self.assertEqual(9, coalescer.saved)
+        self.assertEqual(b'{"index":{"_id":1}}\n{"v":9}\n', bulk.call_args[0][0])
+
+
+class TestBulkIndexer(TestCase):
+    def setup_method(self, _):
+        self.bodies = []
+        self.rejected = set()
+
+    def _bulk(self, body, *args, **kwargs):
+        self.bodies.append(body)
+        items = []
+        for line in body.splitlines()[1::2]:
+            n = json.loads(line)["n"]
+            if n == 3 and n not in self.rejected:
+                self.rejected.add(n)
+                items.append({"index": {"status": 429}})
+            elif n == 5:
+                items.append({"index": {"status": 400, "error": "bad"}})
+            else:
+                items.append({"index": {"status": 201, "n": n}})
+        return {"items": items}
+
+    @mock.patch.object(Elasticsearch, "bulk")
+    def test_actions_added_from_threads_are_sent(self, bulk):
+        bulk.side_effect = self._bulk
+        succeeded = []
+        indexer = helpers.BulkIndexer(
+            Elasticsearch(), chunk_size=10, on_success=succeeded.append
+        )
+
+        def add(start):
+            for n in range(start, start + 25):
+                indexer.add({"n": n + 10})
+
+        threads = [threading.Thread(target=add, args=(i * 25,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        indexer.close()
+
+        self.assertEqual(
+            list(range(10, 110)), sorted(item["index"]["n"] for item in succeeded)
+        )
+        self.assertEqual(10, len(self.bodies))
+        stats = indexer.stats()
+        self.assertEqual(100, stats["succeeded"])
+        self.assertEqual(10, stats["requests"])
+        self.assertEqual(0, stats["in_flight"])
+        with pytest.raises(ValueError):
+            indexer.add({"n": 1})
+
+    @mock.patch.object(Elasticsearch, "bulk")
+    def test_actions_are_sent_after_flush_interval(self, bulk):
+        bulk.side_effect = self._bulk
+        with helpers.BulkIndexer(Elasticsearch(), flush_interval=0.05) as indexer:
+            indexer.add({"n": 1})
+            for _ in range(100):
+                if self.bodies:
+                    break
+                time.sleep(0.01)
+            self.assertEqual(1, len(self.bodies))
+
+    @mock.patch.object(Elasticsearch, "bulk")
+    def test_rejected_actions_are_retried_and_failures_reported(self, bulk):
+        bulk.side_effect = self._bulk
+        failed = []
+        with helpers.BulkIndexer(
+            Elasticsearch(), on_error=failed.append, max_retries=1, initial_backoff=0
+        ) as indexer:
+            for n in range(10):
+                indexer.add({"_id": n, "n": n})
+            indexer.flush()
+            self.assertEqual(2, len(self.bodies))
+            self.assertEqual([3], [json.loads(self.bodies[1].splitlines()[1])["n"]])
+
+        self.assertEqual(
+            [{"index": {"status": 400, "error": "bad", "data": {"n": 5}}}], failed
+        )
+        self.assertEqual(1, indexer.stats()["retried"])
+
+    @mock.patch.object(Elasticsearch, "bulk")
+    def test_flush_does_not_wait_for_actions_added_afterwards(self, bulk):
+        def _bulk(body, *args, **kwargs):
+            time.sleep(0.01)
+            return self._bulk(body)
+
+        bulk.side_effect = _bulk
+        indexer = helpers.BulkIndexer(Elasticsearch(), chunk_size=2, workers=1)
+        stop = threading.Event()
+
+        def add():
+            n = 10
+            while not stop.is_set():
+                indexer.add({"n": n})
+                n += 1
+
+        adder = threading.Thread(target=add)
+        adder.start()
+        try:
+            time.sleep(0.05)
+            flusher = threading.Thread(target=indexer.flush)
+            flusher.start()
+            flusher.join(5)
+            self.assertFalse(flusher.is_alive())
+        finally:
+            stop.set()
+            adder.join()
+            indexer.close()
+
+    @mock.patch.object(Elasticsearch, "bulk")
+    def test_unexpected_errors_are_reported(self, bulk):
+        bulk.side_effect = ValueError("boom")
+        failed = []
+        with helpers.BulkIndexer(Elasticsearch(), on_error=failed.append) as indexer:
+            indexer.add({"_id": 1, "n": 1})
+            indexer.add({"_op_type": "delete", "_id": 2})
+
+        self.assertEqual(
+            [("index", 1, {"n": 1}, "boom"), ("delete", 2, None, "boom")],
+            [
+                (op_type, info["_id"], info.get("data"), info["error"])
+                for op_type, info in (item.popitem() for item in failed)
+            ],
+        )
+        self.assertEqual(2, indexer.stats()["failed"])
+
+
+def spooled_bulk(body, *args, **kwargs):
+    actions = [json.loads(line) for line in body.splitlines()]
+    return {
+        "items": [
+            {op_type: {"status": 200, "_id": params.get("_id")}}
+            for action in actions
+            for op_type, params in action.items()
+            if op_type in ("index", "delete")
+        ]
+    }
+
+
+class TestBulkSpool(TestCase):
+    def setup_method(self, _):
+        self.path = tempfile.mkdtemp()
+
+    def teardown_method(self, _):
+        shutil.rmtree(self.path)
+
+    def segments(self):
+        return sorted(f for f in os.listdir(self.path) if f.endswith(".ndjson"))
+
+    @mock.patch.object(Elasticsearch, "bulk", side_effect=spooled_bulk)
+    def test_spooled_actions_are_sent_and_deleted(self, bulk):
+        spool = helpers.BulkSpool(self.path, segment_bytes=100)
+        spool.extend({"_id": i, "f": "v"} for i in range(10))
+        spool.add({"_op_type": "delete", "_id": 3})
+        self.assertTrue(len(self.segments()) > 1)
+
+        results = list(spool.send(Elasticsearch(), chunk_size=4))
+
+        self.assertEqual(11, len(results))
+        self.assertEqual({"_id": 3, "status": 200}, results[-1][1]["delete"])
+        self.assertTrue(
+            bulk.call_args_list[0][0][0].startswith(
+                b'{"index":{"_id":0}}\n{"f":"v"}\n{"index":{"_id":1}}\n'
+            )
+        )
+        self.assertEqual(0, spool.backlog)
+        # only the segment being written is left
+        self.assertEqual(1, len(self.segments()))
+        spool.close()
+
+    @mock.patch.object(Elasticsearch, "bulk", side_effect=spooled_bulk)
+    def test_actions_not_processed_are_sent_after_a_restart(self, bulk):
+        spool = helpers.BulkSpool(self.path)
+        spool.extend({"_id": i} for i in range(5))
+        results = spool.send(Elasticsearch(), chunk_size=2)
+        next(results)
+        next(results)
+        results.close()
+        spool.close()
+
+        spool = helpers.BulkSpool(self.path)
+        results = list(spool.send(Elasticsearch()))
+
+        self.assertEqual([2, 3, 4], [item["index"]["_id"] for _, item in results])
+        spool.close()
+
+    @mock.patch.object(Elasticsearch, "bulk")
+    def test_failed_requests_are_not_acknowledged(self, bulk):
+        bulk.side_effect = [TransportError(503, "Unavailable", {}), spooled_bulk]
+        spool = helpers.BulkSpool(self.path)
+        spool.add({"_id": 1})
+        backlog = spool.backlog
+
+        with pytest.raises(TransportError):
+            list(spool.send(Elasticsearch()))
+        self.assertEqual(backlog, spool.backlog)
+
+        bulk.side_effect = spooled_bulk
+        self.assertEqual(1, len(list(spool.send(Elasticsearch()))))
+        self.assertEqual(0, spool.backlog)
+        spool.close()
+
+    @mock.patch.object(Elasticsearch, "bulk")
+    def test_failed_requests_are_sent_again_without_raising(self, bulk):
+        bulk.side_effect = [TransportError(503, "Unavailable", {}), spooled_bulk]
+        spool = helpers.BulkSpool(self.path)
+        spool.add({"_id": 1})
+
+        results = spool.send(
+            Elasticsearch(),
+            raise_on_exception=False,
+            raise_on_error=False,
+            initial_backoff=0,
+        )
+        ok, item = next(results)
+        self.assertFalse(ok)
+        self.assertEqual(503, item["index"]["status"])
+        self.assertNotEqual(0, spool.backlog)
+
+        bulk.side_effect = spooled_bulk
+        self.assertEqual([(True, {"index": {"status": 200, "_id": 1}})], list(results))
+        self.assertEqual(0, spool.backlog)
+        spool.close()
+
+    @mock.patch.object(Elasticsearch, "bulk", side_effect=spooled_bulk)
+    def test_incomplete_actions_left_by_a_crash_are_skipped(self, bulk):
+        spool = helpers.BulkSpool(self.path)
+        spool.add({"_id": 1})
+        spool.close()
+        with open(os.path.join(self.path, self.segments()[0]), "ab") as f:
+            f.write(b'{"index":{"_id":2}}\n{"f":')
+
+        spool = helpers.BulkSpool(self.path)
+        results = list(spool.send(Elasticsearch()))
+
+        self.assertEqual([1], [item["index"]["_id"] for _, item in results])
+        spool.close()
+
+    @mock.patch.object(Elasticsearch, "bulk", side_effect=spooled_bulk)
+    def test_follow_sends_actions_until_closed(self, bulk):
+        spool = helpers.BulkSpool(self.path)
+        results = []
+        sender = threading.Thread(
+            target=lambda: results.extend(
+                spool.send(Elasticsearch(), follow=True, poll_interval=0.01)
+            )
+        )
+        sender.start()
+        for i in range(3):
+            spool.add({"_id": i})
+            time.sleep(0.02)
+        spool.close()
+        sender.join()
+
+        self.assertEqual([0, 1, 2], [item["index"]["_id"] for _, item in results])
+
+
+def failing_bulk(body, **kwargs):
+    """Reject the documents with an odd ``_id``."""
+    lines = body.splitlines()
+    items = []
+    for action, source in zip(lines[::2], lines[1::2]):
+        _id = json.loads(action)["index"]["_id"]
+        if _id % 2:
+            error = {"type": "mapper_parsing_exception", "reason": "failed to parse"}
+            items.append({"index": {"_id": _id, "status": 400, "error": error}})
+        else:
+            items.append({"index": {"_id": _id, "status": 201}})
+    return {"errors": True, "items": items}
+
+
+class TestErrorSinks(TestCase):
+    def setup_method(self, _):
+        self.path = tempfile.mkdtemp()
+        self.actions = [
+            {"_index": "i", "_id": i, "routing": "r", "_source": {"n": i}}
+            for i in range(6)
+        ]
+
+    def teardown_method(self, _):
+        shutil.rmtree(self.path)
+
+    @mock.patch.object(Elasticsearch, "bulk", side_effect=failing_bulk)
+    def test_failures_go_to_the_sink_instead_of_the_result(self, _):
+        sample = helpers.ErrorSample(size=2)
+
+        success, failed = helpers.bulk(
+            Elasticsearch(),
+            self.actions,
+            chunk_size=2,
+            raise_on_error=False,
+            error_sink=sample,
+        )
+
+        self.assertEqual((3, 3), (success, failed))
+        self.assertEqual(3, sample.total)
+        self.assertEqual({"mapper_parsing_exception": 3}, sample.counts)
+        self.assertEqual(
+            [
+                {
+                    "_index": "i",
+                    "_id": 1,
+                    "routing": "r",
+                    "status": 400,
+                    "error": {
+                        "type": "mapper_parsing_exception",
+                        "reason": "failed to parse",
+                    },
+                    "data": {"n": 1},
+                },
+                3,
+            ],
+            [sample.items[0]["index"], sample.items[1]["index"]["_id"]],
+        )
+
+    @mock.patch.object(Elasticsearch, "bulk")
+    def test_failed_requests_go_to_the_sink(self, bulk):
+        bulk.side_effect = TransportError(503, "Unavailable", {})
+        sample = helpers.ErrorSample()
+
+        results = list(
+            helpers.streaming_bulk(
+                Elasticsearch(),
+                self.actions[:2],
+                raise_on_error=False,
+                raise_on_exception=False,
+                error_sink=sample,
+            )
+        )
+
+        self.assertEqual(2, len(results))
+        self.assertEqual({"TransportError": 2}, sample.counts)
+        self.assertEqual({"n": 0}, sample.items[0]["index"]["data"])
+
+    @mock.patch.object(Elasticsearch, "bulk", side_effect=failing_bulk)
+    def test_dead_letters_can_be_sent_again(self, bulk):
+        path = os.path.join(self.path, "failed.ndjson")
+        with helpers.DeadLetterFile(path) as dead_letters:
+            helpers.bulk(
+                Elasticsearch(),
+                self.actions,
+                raise_on_error=False,
+                error_sink=dead_letters,
+            )
+
+        actions = list(helpers.read_dead_letters(path))
+
+        self.assertEqual(
+            [
+                {
+                    "_op_type": "index",
+                    "_index": "i",
+                    "_id": i,
+                    "routing": "r",
+                    "_source": {"n": i},
+                }
+                for i in (1, 3, 5)
+            ],
+            actions,
+        )
+        bulk.reset_mock()
+        helpers.bulk(Elasticsearch(), actions, raise_on_error=False)
+        lines = bulk.call_args[0][0].decode("utf-8").splitlines()
+        self.assertEqual(
+            [{"index": {"_id": 1, "_index": "i", "routing": "r"}}, {"n": 1}],
+            [json.loads(line) for line in lines[:2]],
+        )
+
+    def test_dead_letter_file_is_rotated(self):
+        path = os.path.join(self.path, "failed.ndjson")
+        dead_letters = helpers.DeadLetterFile(path, max_bytes=200, backup_count=2)
+        for i in range(10):
+            dead_letters({"delete": {"_id": i, "status": 404, "error": "missing"}})
+        dead_letters.close()
+
+        self.assertEqual(
+            ["failed.ndjson", "failed.ndjson.1", "failed.ndjson.2"],
+            sorted(os.listdir(self.path)),
+        )
+        ids = [
+            action["_id"]
+            for name in (path + ".2", path + ".1", path)
+            for action in helpers.read_dead_letters(name)
+        ]
+        self.assertEqual(list(range(10 - len(ids), 10)), ids)
+        self.assertTrue(len(ids) < 10)
+
+
 class TestExpandActions(TestCase):
     def test_string_actions_are_marked_as_simple_inserts(self):
         self.assertEqual(
             ('{"index":{}}', "whatever"), helpers.expand_action("whatever")
         )
+
+
+class TestHitsToColumns(TestCase):
+    hits = [
+        {
+            "_id": "1",
+            "_index": "orders",
+            "_source": {"price": 10, "customer": {"name": "a"}, "paid": True},
+        },
+        {
+            "_id": "2",
+            "_index": "orders",
+            "_source": {"price": 2.5, "customer": {"name": "b"}, "paid": False},
+        },
+        {"_id": "3", "_index": "orders", "_source": {"customer": {"name": "c"}}},
+    ]
+    mapping = {
+        "orders": {
+            "mappings": {
+                "properties": {
+                    "price": {"type": "long"},
+                    "created": {"type": "date"},
+                    "customer": {
+                        "properties": {
+                            "name": {
+                                "type": "text",
+                                "fields": {"raw": {"type": "keyword"}},
+                            }
+                        }
+                    },
+                }
+            }
+        }
+    }
+
+    def test_columns_default_to_source_paths(self):
+        # in the order they are first seen, which dicts only keep on py3.7+
+        hits = [
+            {"_source": OrderedDict([("price", 10), ("customer", {"name": "a"})])},
+            {"_source": OrderedDict([("paid", True), ("customer", {"name": "b"})])},
+        ]
+        columns = helpers.hits_to_columns(hits)
+        self.assertEqual(["price", "customer.name", "paid"], list(columns))
+        self.assertEqual(["a", "b"], list(columns["customer.name"]))
+
+    def test_integers_out_of_range_are_kept_as_objects(self):
+        hits = [{"_source": {"n": 18446744073709551615}}, {"_source": {"n": 1}}]
+        columns = helpers.hits_to_columns(hits, columns=["n"])
+        self.assertEqual("object", columns["n"].dtype.name)
+        self.assertEqual([18446744073709551615, 1], list(columns["n"]))
+
+        mapping = {"i": {"mappings": {"properties": {"n": {"type": "unsigned_long"}}}}}
+        columns = helpers.hits_to_columns(hits, columns=["n"], mapping=mapping)
+        self.assertEqual("uint64", columns["n"].dtype.name)
+        self.assertEqual([18446744073709551615, 1], [int(v) for v in columns["n"]])
+
+        hits.append({"_source": {"n": -1}})
+        columns = helpers.hits_to_columns(hits, columns=["n"], mapping=mapping)
+        self.assertEqual("object", columns["n"].dtype.name)
+
+    def test_mapped_integers_only_take_integral_numbers(self):
+        mapping = {"i": {"mappings": {"properties": {"n": {"type": "long"}}}}}
+
+        hits = [{"_source": {"n": 1.5}}, {"_source": {"n": 2}}]
+        columns = helpers.hits_to_columns(hits, columns=["n"], mapping=mapping)
+        self.assertEqual("float64", columns["n"].dtype.name)
+        self.assertEqual([1.5, 2.0], list(columns["n"]))
+
+        hits = [{"_source": {"n": "1"}}, {"_source": {"n": True}}]
+        columns = helpers.hits_to_columns(hits, columns=["n"], mapping=mapping)
+        self.assertEqual("object", columns["n"].dtype.name)
+        self.assertEqual(["1", True], list(columns["n"]))
+
+    def test_columns_are_typed_from_values(self):
+        columns = helpers.hits_to_columns(self.hits[:2], columns=["price", "paid"])
+        self.assertEqual("float64", columns["price"].dtype.name)
+        self.assertEqual("bool", columns["paid"].dtype.name)
+
+    def test_columns_are_typed_from_mapping(self):
+        hits = [
+            {"_id": "1", "_source": {"price": 1, "created": "2021-01-01T00:00:00Z"}},
+            {"_id": "2", "_source": {"price": 2, "created": 1609545600000}},
+        ]
+        columns = helpers.hits_to_columns(
+            hits, columns=["_id", "price", "created"], mapping=self.mapping
+        )
+        self.assertEqual(["1", "2"], list(columns["_id"]))
+        self.assertEqual("int64", columns["price"].dtype.name)
+        self.assertEqual("datetime64[ns]", columns["created"].dtype.name)
+        self.assertEqual(
+            ["2021-01-01T00:00:00.000000000", "2021-01-02T00:00:00.000000000"],
+            [str(v) for v in columns["created"]],
+        )
+
+    def test_missing_integers_become_nan(self):
+        columns = helpers.hits_to_columns(
+            self.hits, columns=["price"], mapping=self.mapping
+        )
+        self.assertEqual("float64", columns["price"].dtype.name)
+        self.assertEqual([10.0, 2.5], list(columns["price"][:2]))
+
+    def test_fields_are_used_before_source(self):
+        hits = [{"_id": "1", "_source": {}, "fields": {"customer.name.raw": ["x"]}}]
+        columns = helpers.hits_to_columns(hits, columns=["customer.name.raw"])
+        self.assertEqual(["x"], list(columns["customer.name.raw"]))
+
+    def test_hits_to_dataframe(self):
+        df = helpers.hits_to_dataframe(
+            self.hits, columns=["_id", "customer.name"], mapping=self.mapping
+        )
+        self.assertEqual(["_id", "customer.name"], list(df.columns))
+        self.assertEqual(3, len(df))
+
+
+class TestScanAsFrames(TestCase):
+    def test_one_frame_per_page(self):
+        client = mock.Mock()
+        client.search.return_value = {
+            "_scroll_id": "scroll-id",
+            "_shards": {"successful": 1, "total": 1},
+            "hits": {"hits": [{"_id": "1", "_source": {"x": 1}}]},
+        }
+        client.scroll.side_effect = [
+            {
+                "_scroll_id": "scroll-id",
+                "_shards": {"successful": 1, "total": 1},
+                "hits": {"hits": [{"_id": "2", "_source": {"x": 2}}]},
+            },
+            {
+                "_scroll_id": "scroll-id",
+                "_shards": {"successful": 1, "total": 1},
+                "hits": {"hits": []},
+            },
+        ]
+
+        frames = list(
+            helpers.scan(client, index="i", as_frames=True, frame_columns=["_id", "x"])
+        )
+
+        self.assertEqual(2, len(frames))
+        self.assertEqual([["1", 1], ["2", 2]], [f.values.tolist()[0] for f in frames])
+        client.clear_scroll.assert_called_once()
+
+
+def sliced_page(slice_id, page, failed_shards=0):
+    """Page ``page`` of a slice having two pages of two hits."""
+    hits = []
+    if page < 2:
+        hits = [{"_id": "%d-%d-%d" % (slice_id, page, i)} for i in range(2)]
+    return {
+        "_scroll_id": "%d-%d" % (slice_id, page),
+        "_shards": {"successful": 2 - failed_shards, "total": 2},
+        "hits": {"hits": hits},
+    }
+
+
+class TestParallelScan(TestCase):
+    def setup_method(self, _):
+        self.client = mock.Mock()
+        self.client.search.side_effect = lambda body, **kwargs: sliced_page(
+            body["slice"]["id"], 0
+        )
+        self.client.scroll.side_effect = self.scroll
+
+    def scroll(self, body, **kwargs):
+        slice_id, page = map(int, body["scroll_id"].split("-"))
+        return sliced_page(slice_id, page + 1)
+
+    def cleared(self):
+        return sorted(
+            c[1]["body"]["scroll_id"][0]
+            for c in self.client.clear_scroll.call_args_list
+        )
+
+    def test_hits_of_all_slices_are_yielded(self):
+        hits = list(helpers.parallel_scan(self.client, index="i", slices=3, workers=2))
+
+        self.assertEqual(
+            sorted(
+                "%d-%d-%d" % (s, p, i)
+                for s in range(3)
+                for p in range(2)
+                for i in range(2)
+            ),
+            sorted(hit["_id"] for hit in hits),
+        )
+        self.assertEqual(
+            [{"sort": "_doc", "slice": {"id": i, "max": 3}} for i in range(3)],
+            sorted(
+                (c[1]["body"] for c in self.client.search.call_args_list),
+                key=lambda body: body["slice"]["id"],
+            ),
+        )
+        self.assertEqual(["0-2", "1-2", "2-2"], self.cleared())
+
+    def test_one_iterator_per_slice(self):
+        slices = helpers.parallel_scan(self.client, index="i", slices=2, per_slice=True)
+
+        self.assertEqual(2, len(slices))
+        self.assertEqual(
+            ["1-0-0", "1-0-1", "1-1-0", "1-1-1"], [hit["_id"] for hit in slices[1]]
+        )
+        # slices are only scrolled once they're iterated
+        self.assertEqual(1, self.client.search.call_count)
+        self.assertEqual(4, len(list(slices[0])))
+
+    def test_shard_failures_are_raised_and_scrolls_cleared(self):
+        def scroll(body, **kwargs):
+            slice_id, page = map(int, body["scroll_id"].split("-"))
+            return sliced_page(slice_id, page + 1, failed_shards=slice_id)
+
+        self.client.scroll.side_effect = scroll
+
+        with pytest.raises(helpers.ScanError):
+            list(helpers.parallel_scan(self.client, index="i", slices=2))
+        # the other slice may have been stopped at any page
+        self.assertEqual(2, len(self.cleared()))
+        self.assertIn("1-1", self.cleared())
+
+    def test_scrolls_are_cleared_when_abandoned(self):
+        hits = helpers.parallel_scan(self.client, index="i", slices=4, queue_size=1)
+        next(hits)
+        hits.close()
+
+        self.assertEqual(self.client.search.call_count, len(self.cleared()))
+
+
+class TestScanPrefetch(TestCase):
+    def setup_method(self, _):
+        self.scrolled = threading.Event()
+        self.client = mock.Mock()
+        self.client.search.return_value = sliced_page(0, 0)
+        self.client.scroll.side_effect = self.scroll
+
+    def scroll(self, body, **kwargs):
+        self.scrolled.set()
+        _, page = map(int, body["scroll_id"].split("-"))
+        return sliced_page(0, page + 1)
+
+    def test_next_page_is_fetched_while_consuming(self):
+        hits = helpers.scan(self.client, index="i", prefetch=1)
+
+        self.assertEqual("0-0-0", next(hits)["_id"])
+        self.assertTrue(self.scrolled.wait(5))
+        self.assertEqual(["0-0-1", "0-1-0", "0-1-1"], [hit["_id"] for hit in hits])
+        self.client.clear_scroll.assert_called_once_with(
+            body={"scroll_id": ["0-2"]},
+            ignore=(404,),
+            params={"__elastic_client_meta": (("h", "s"),)},
+        )
+
+    def test_scroll_is_cleared_when_abandoned(self):
+        hits = helpers.scan(self.client, index="i", prefetch=1)
+        next(hits)
+        hits.close()
+
+        self.client.clear_scroll.assert_called_once()
+
+
+class TestPitScan(TestCase):
+    def setup_method(self, _):
+        self.client = mock.Mock()
+        self.client.open_point_in_time.return_value = {"id": "pit-0"}
+        self.client.search.side_effect = self.search
+
+    def search(self, body, **kwargs):
+        """Three pages of two hits sorted by a counter, a new pit id each."""
+        start = body.get("search_after", [-1])[0] + 1
+        hits = [{"_id": str(i), "sort": [i]} for i in range(start, min(start + 2, 6))]
+        return {
+            "pit_id": "pit-%d" % (start // 2 + 1),
+            "_shards": {"successful": 1, "total": 1},
+            "hits": {"hits": hits},
+        }
+
+    def test_all_hits_are_read_and_the_pit_closed(self):
+        hits = list(
+            helpers.pit_scan(
+                self.client,
+                "i",
+                {"query": {"match_all": {}}},
+                page_size=2,
+                keep_alive="1m",
+            )
+        )
+
+        self.assertEqual([str(i) for i in range(6)], [hit["_id"] for hit in hits])
+        self.client.open_point_in_time.assert_called_once_with(
+            index="i", keep_alive="1m"
+        )
+        self.assertEqual(
+            {
+                "query": {"match_all": {}},
+                "pit": {"id": "pit-1", "keep_alive": "1m"},
+                "size": 2,
+                "sort": ["_shard_doc"],
+                "track_total_hits": False,
+                "search_after": [1],
+            },
+            self.client.search.call_args_list[1][1]["body"],
+        )
+        self.client.close_point_in_time.assert_called_once_with(
+            body={"id": "pit-4"}, ignore=(404,)
+        )
+
+    def test_iteration_resumes_from_the_cursor(self):
+        hits = helpers.pit_scan(self.client, "i", page_size=2)
+        for hit in hits:
+            if hit["_id"] == "2":
+                break
+        cursor = hits.cursor
+        self.assertEqual({"pit_id": "pit-2", "search_after": [1]}, cursor)
+        self.client.close_point_in_time.assert_not_called()
+
+        resumed = helpers.pit_scan(self.client, cursor=cursor)
+        self.assertEqual(["2", "3", "4", "5"], [hit["_id"] for hit in resumed])
+        self.client.open_point_in_time.assert_called_once()
+        self.assertEqual([], list(resumed))
+
+    def test_shard_failures_are_raised(self):
+        self.client.search.side_effect = None
+        self.client.search.return_value = {
+            "pit_id": "pit-1",
+            "_shards": {"successful": 1, "total": 2},
+            "hits": {"hits": [{"_id": "0", "sort": [0]}]},
+        }
+
+        hits = helpers.pit_scan(self.client, "i")
+        with pytest.raises(helpers.ScanError) as e:
+            list(hits)
+        self.assertEqual("pit-1", e.value.scroll_id)
+        # the page which failed is read again when resuming
+        self.assertEqual({"pit_id": "pit-1", "search_after": None}, hits.cursor)
+
+
+def sliced_search(body, **kwargs):
+    """Documents 0 to 11 split into slices by their number, sorted by it."""
+    slice_ = body.get("slice", {"id": 0, "max": 1})
+    after = body.get("search_after", [-1])[0]
+    numbers = [n for n in range(12) if n % slice_["max"] == slice_["id"] and n > after]
+    hits = [
+        {"_index": "source", "_id": str(n), "_source": {"n": n}, "sort": [n]}
+        for n in numbers[: body["size"]]
+    ]
+    return {
+        "pit_id": body["pit"]["id"],
+        "_shards": {"successful": 1, "total": 1},
+        "hits": {"hits": hits},
+    }
+
+
+class TestReindexPipeline(TestCase):
+    def setup_method(self, _):
+        self.path = tempfile.mkdtemp()
+        self.checkpoint = os.path.join(self.path, "reindex.ckpt")
+        self.client = mock.Mock()
+        self.client.open_point_in_time.return_value = {"id": "pit-0"}
+        self.client.search.side_effect = sliced_search
+        self.written = []
+        self.failing = set()
+
+    def teardown_method(self, _):
+        shutil.rmtree(self.path)
+
+    def bulk(self, client, actions, **kwargs):
+        for action in actions:
+            if action["_id"] in self.failing:
+                self.failing.remove(action["_id"])
+                raise TransportError(500, "boom")
+            self.written.append(action)
+            yield True, {"index": {}}
+
+    def test_slice_progress_only_moves_past_written_pages(self):
+        progress = pipeline._SliceProgress()
+        first, second = progress.read([1]), progress.read([3])
+        last = progress.read([3], last=True)
+
+        progress.written(second)
+        self.assertEqual(None, progress.search_after)
+        progress.written(first)
+        self.assertEqual([3], progress.search_after)
+        self.assertFalse(progress.done)
+        progress.written(last)
+        self.assertTrue(progress.done)
+
+    def test_all_documents_are_transformed_and_written(self):
+        def transform(hit):
+            if hit["_id"] != "3":
+                hit["_source"]["upgraded"] = True
+                return hit
+
+        target = mock.Mock()
+        with mock.patch.object(pipeline, "streaming_bulk", side_effect=self.bulk):
+            stats = helpers.ReindexPipeline(
+                self.client,
+                "source",
+                "target",
+                target_client=target,
+                transform=transform,
+                slices=2,
+                page_size=2,
+                checkpoint=self.checkpoint,
+            ).run()
+
+        self.assertEqual(
+            [str(n) for n in range(12) if n != 3],
+            sorted((a["_id"] for a in self.written), key=int),
+        )
+        self.assertEqual({"target"}, set(a["_index"] for a in self.written))
+        self.assertTrue(all(a["_source"]["upgraded"] for a in self.written))
+        self.client.open_point_in_time.assert_called_once_with(
+            index="source", keep_alive="5m"
+        )
+        self.client.close_point_in_time.assert_called_once_with(
+            body={"id": "pit-0"}, ignore=(404,)
+        )
+        self.assertEqual(
+            set([(0, 2), (1, 2)]),
+            set(
+                (c[1]["body"]["slice"]["id"], c[1]["body"]["slice"]["max"])
+                for c in self.client.search.call_args_list
+            ),
+        )
+        self.assertEqual(12, stats["read"]["docs"])
+        self.assertEqual(12, stats["transform"]["docs"])
+        self.assertEqual(11, stats["write"]["docs"])
+        self.assertEqual(0, stats["write"]["failed"])
+        # nothing left to resume
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_interrupted_run_resumes_from_the_checkpoint(self):
+        def run():
+            with mock.patch.object(pipeline, "streaming_bulk", side_effect=self.bulk):
+                return helpers.ReindexPipeline(
+                    self.client,
+                    "source",
+                    "target",
+                    slices=2,
+                    page_size=2,
+                    write_workers=1,
+                    checkpoint=self.checkpoint,
+                ).run()
+
+        self.failing.add("7")
+        with pytest.raises(TransportError):
+            run()
+        with open(self.checkpoint) as f:
+            state = json.load(f)
+        self.assertEqual("pit-0", state["pit_id"])
+        # the page of document 7 wasn't written
+        self.assertEqual({"search_after": [3], "done": False}, state["slices"][1])
+        self.client.close_point_in_time.assert_not_called()
+
+        self.client.search.reset_mock()
+        run()
+        self.assertTrue(
+            all(
+                c[1]["body"]["search_after"][0] >= 3
+                for c in self.client.search.call_args_list
+                if c[1]["body"]["slice"]["id"] == 1
+            )
+        )
+        self.assertEqual(
+            [str(n) for n in range(12)],
+            sorted(set(a["_id"] for a in self.written), key=int),
+        )
+        # the point in time of the first run is used again
+        self.client.open_point_in_time.assert_called_once()
+        self.client.close_point_in_time.assert_called_once_with(
+            body={"id": "pit-0"}, ignore=(404,)
+        )
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_point_in_time_of_the_checkpoint_is_closed_when_replaced(self):
+        with open(self.checkpoint, "w") as f:
+            json.dump(
+                {"pit_id": "pit-0", "slices": [{"search_after": [5], "done": False}]},
+                f,
+            )
+        self.client.open_point_in_time.return_value = {"id": "pit-1"}
+
+        with mock.patch.object(pipeline, "streaming_bulk", side_effect=self.bulk):
+            helpers.ReindexPipeline(
+                self.client,
+                "source",
+                "target",
+                slices=1,
+                sort=[{"n": "asc"}],
+                checkpoint=self.checkpoint,
+            ).run()
+
+        self.assertEqual(
+            [str(n) for n in range(6, 12)], [a["_id"] for a in self.written]
+        )
+        self.assertEqual(
+            [
+                mock.call(body={"id": "pit-0"}, ignore=(404,)),
+                mock.call(body={"id": "pit-1"}, ignore=(404,)),
+            ],
+            self.client.close_point_in_time.call_args_list,
+        )
+
+    def test_checkpoint_of_another_slice_count_is_rejected(self):
+        with open(self.checkpoint, "w") as f:
+            json.dump(
+                {"pit_id": "pit-0", "slices": [{"search_after": None, "done": False}]},
+                f,
+            )
+
+        with pytest.raises(ValueError):
+            helpers.ReindexPipeline(
+                self.client, "source", "target", checkpoint=self.checkpoint
+            ).run()
+        self.client.search.assert_not_called()
+
+
+class TestCompactHit(TestCase):
+    hit = {
+        "_index": "orders",
+        "_id": "1",
+        "_score": None,
+        "_source": {"name": u"datá"},
+        "sort": [1],
+        "highlight": {"name": ["<em>x</em>"]},
+    }
+
+    def test_behaves_like_the_hit_dict(self):
+        hit = helpers.CompactHit(self.hit)
+        self.assertEqual(self.hit, hit)
+        self.assertEqual(self.hit, hit.to_dict())
+        self.assertEqual(6, len(hit))
+        self.assertIsNone(hit["_score"])
+        self.assertNotIn("_type", hit)
+        self.assertRaises(KeyError, lambda: hit["_type"])
+
+    def test_source_is_kept_serialized(self):
+        hit = helpers.CompactHit(self.hit)
+        self.assertEqual(u'{"name":"datá"}'.encode("utf-8"), hit.raw_source)
+        self.assertEqual({"name": u"datá"}, hit["_source"])
+        self.assertFalse(hasattr(hit, "__dict__"))
+
+    def test_index_names_are_interned(self):
+        hits = [
+            helpers.CompactHit({"_index": "".join(["ord", "ers"]), "_id": str(i)})
+            for i in range(2)
+        ]
+        self.assertIs(hits[0]["_index"], hits[1]["_index"])
+
+    def test_decoded_index_names_are_interned(self):
+        # decoding gives unicode strings on Python 2, intern() doesn't take those
+        hits = [
+            helpers.CompactHit({"_index": b"orders".decode("utf-8"), "_id": str(i)})
+            for i in range(2)
+        ]
+        self.assertIs(hits[0]["_index"], hits[1]["_index"])
+
+    def test_is_a_mapping(self):
+        hit = helpers.CompactHit(self.hit)
+        self.assertIsInstance(hit, Mapping)
+        self.assertEqual(hit, self.hit)
+        self.assertFalse(hit != self.hit)
+        self.assertEqual(hit.get("sort"), self.hit["sort"])
+        self.assertIsNone(hit.get("missing"))
+        self.assertIn("_source", hit)
+        self.assertNotIn("missing", hit)
+        self.assertEqual(sorted(hit.keys()), sorted(self.hit.keys()))
+        self.assertEqual(dict(hit.items()), self.hit)
+
+    def test_scan_hit_class(self):
+        client = mock.Mock()
+        client.search.return_value = {
+            "_scroll_id": "scroll-id",
+            "_shards": {"successful": 1, "total": 1},
+            "hits": {"hits": [self.hit]},
+        }
+        client.scroll.return_value = {
+            "_scroll_id": "scroll-id",
+            "_shards": {"successful": 1, "total": 1},
+            "hits": {"hits": []},
+        }
+
+        hits = list(helpers.scan(client, index="i", hit_class=helpers.CompactHit))
+
+        self.assertEqual(1, len(hits))
+        self.assertIsInstance(hits[0], helpers.CompactHit)
+        self.assertEqual(self.hit, hits[0])
@@ -27,8 +27,10 @@ import pandas as pd
 from elasticsearch.exceptions import ImproperlyConfigured, SerializationError
 from elasticsearch.serializer import (
     DEFAULT_SERIALIZERS,
+    BodyTemplate,
     Deserializer,
     JSONSerializer,
+    Param,
     TextSerializer,
 )
 
@@ -161,6 +163,54 @@ class TestJSONSerializer(TestCase):
         self.assertEqual("你好", JSONSerializer().dumps("你好"))
 
 
+class TestBodyTemplate(TestCase):
+    def test_params_are_serialized_in_place(self):
+        template = BodyTemplate(
+            {"query": {"terms": {"user": [Param("user"), "other"]}}, "size": Param("n")}
+        )
+        self.assertEqual(["user", "n"], template.params)
+        self.assertEqual(
+            '{"query":{"terms":{"user":["ki\\"mchy","other"]}},"size":10}',
+            template.render(user='ki"mchy', n=10),
+        )
+        self.assertEqual(
+            '{"query":{"terms":{"user":[{"a":1},"other"]}},"size":null}',
+            template.render(user={"a": 1}, n=None),
+        )
+
+    def test_param_values_use_serializer_defaults(self):
+        template = BodyTemplate({"d": Param("d")})
+        self.assertEqual(
+            '{"d":"2010-10-01T02:30:00"}',
+            template.render(d=datetime(2010, 10, 1, 2, 30)),
+        )
+
+    def test_missing_param_raises_value_error(self):
+        template = BodyTemplate({"size": Param("n")})
+        self.assertRaises(ValueError, template.render)
+
+    def test_frozen_body_is_passed_to_serializer(self):
+        self.assertEqual(
+            '{"a":[1,2]}', JSONSerializer().dumps(BodyTemplate({"a": [1, 2]}))
+        )
+
+    def test_rendered_bodies_are_cached(self):
+        template = BodyTemplate({"user": Param("user")}, cache_size=1)
+        body = template.render(user="a")
+        self.assertIs(body, template.render(user="a"))
+        template.render(user="b")
+        self.assertIsNot(body, template.render(user="a"))
+        # unhashable values are rendered without being cached
+        self.assertEqual('{"user":["a"]}', template.render(user=["a"]))
+
+    def test_equal_values_of_other_types_are_cached_apart(self):
+        template = BodyTemplate({"a": Param("x")}, cache_size=4)
+        self.assertEqual('{"a":true}', template.render(x=True))
+        self.assertEqual('{"a":1}', template.render(x=1))
+        self.assertEqual('{"a":1.0}', template.render(x=1.0))
+        self.assertEqual('{"a":true}', template.render(x=True))
+
+
 class TestTextSerializer(TestCase):
     def test_strings_are_left_untouched(self):
         self.assertEqual("你好", TextSerializer().dumps("你好"))
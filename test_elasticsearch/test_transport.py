@@ -24,7 +24,7 @@ import time
 import pytest
 from mock import patch
 
-from elasticsearch.connection import Connection
+from elasticsearch.connection import ChunkedBody, Connection
 from elasticsearch.connection_pool import DummyConnectionPool
 from elasticsearch.exceptions import ConnectionError, TransportError
 from elasticsearch.transport import Transport, get_host_info
@@ -240,6 +240,13 @@ class TestTransport(TestCase):
         self.assertEqual(1, len(t.get_connection().calls))
         self.assertEqual(("GET", "/", None, body), t.get_connection().calls[0][0])
 
+    def test_chunked_body_gets_passed_untouched(self):
+        t = Transport([{}], connection_class=DummyConnection)
+
+        body = ChunkedBody([b"{}\n"])
+        t.perform_request("POST", "/_bulk", body=body)
+        self.assertEqual(("POST", "/_bulk", None, body), t.get_connection().calls[0][0])
+
     def test_body_surrogates_replaced_encoded_into_bytes(self):
         t = Transport([{}], connection_class=DummyConnection)
 
@@ -17,7 +17,7 @@
 
 import pytest
 
-from elasticsearch.utils import _client_meta_version
+from elasticsearch.utils import _client_meta_version, _LRUCache
 
 
 @pytest.mark.parametrize(
@@ -26,3 +26,16 @@ from elasticsearch.utils import _client_meta_version
 )
 def test_client_meta_version(version, meta_version):
     assert _client_meta_version(version) == meta_version
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = _LRUCache(2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
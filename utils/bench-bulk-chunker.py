@@ -0,0 +1,128 @@
+#  Licensed to Elasticsearch B.V. under one or more contributor
+#  license agreements. See the NOTICE file distributed with
+#  this work for additional information regarding copyright
+#  ownership. Elasticsearch B.V. licenses this file to you under
+#  the Apache License, Version 2.0 (the "License"); you may
+#  not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+# 	http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing,
+#  software distributed under the License is distributed on an
+#  "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+#  KIND, either express or implied.  See the License for the
+#  specific language governing permissions and limitations
+#  under the License.
+
+"""Script comparing the CPU time and memory allocations of serializing bulk
+chunks into a single bytes body against the former approach of joining
+serialized strings and encoding the result.
+
+    $ python utils/bench-bulk-chunker.py --docs 1000000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from elasticsearch.helpers.actions import (
+    _bulk_chunk_body,
+    _chunk_actions,
+    expand_action,
+)
+from elasticsearch.serializer import JSONSerializer
+
+
+def legacy_chunk_bodies(actions, chunk_size, max_chunk_bytes, serializer):
+    """The chunker as it was: serialized strings, encoded once to measure them
+    and once more for the whole body when it's sent.
+    """
+    size, bulk_actions, bulk_data = 0, [], []
+    for action, data in actions:
+        lines = [serializer.dumps(action)]
+        if data is not None:
+            lines.append(serializer.dumps(data))
+        cur_size = sum(len(line.encode("utf-8")) + 1 for line in lines)
+        if bulk_actions and (
+            size + cur_size > max_chunk_bytes or len(bulk_data) == chunk_size
+        ):
+            yield ("\n".join(bulk_actions) + "\n").encode("utf-8")
+            size, bulk_actions, bulk_data = 0, [], []
+        bulk_actions.extend(lines)
+        bulk_data.append((action, data))
+        size += cur_size
+    if bulk_actions:
+        yield ("\n".join(bulk_actions) + "\n").encode("utf-8")
+
+
+def chunk_bodies(actions, chunk_size, max_chunk_bytes, serializer):
+    for _, bulk_actions in _chunk_actions(
+        actions, chunk_size, max_chunk_bytes, serializer
+    ):
+        yield _bulk_chunk_body(bulk_actions)
+
+
+def generate_actions(count):
+    for i in range(count):
+        yield expand_action(
+            {
+                "_index": "bench",
+                "_id": i,
+                "title": "Document number %d – ünïcödé" % i,
+                "tags": ["a", "b", "c"],
+                "count": i,
+            }
+        )
+
+
+def consume(func, actions, args):
+    chunks = total = 0
+    for body in func(
+        iter(actions),
+        args.chunk_size,
+        args.max_chunk_bytes,
+        JSONSerializer(),
+    ):
+        chunks += 1
+        total += len(body)
+    return chunks, total
+
+
+def run(name, func, actions, args):
+    # time and trace allocations in separate passes, tracing slows things down
+    start = time.process_time()
+    chunks, total = consume(func, actions, args)
+    duration = time.process_time() - start
+
+    tracemalloc.start()
+    consume(func, actions, args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        "%-8s %8.2fs CPU/1M docs %10.1fMB peak %6d chunks %12d bytes"
+        % (
+            name,
+            duration * 1000000.0 / args.docs,
+            peak / 1024.0 / 1024,
+            chunks,
+            total,
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=200000)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--max-chunk-bytes", type=int, default=100 * 1024 * 1024)
+    args = parser.parse_args()
+
+    actions = list(generate_actions(args.docs))
+    run("legacy", legacy_chunk_bodies, actions, args)
+    run("bytes", chunk_bodies, actions, args)
+
+
+if __name__ == "__main__":
+    main()